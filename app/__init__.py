@@ -1,6 +1,10 @@
 from flask import Flask, redirect, url_for
 from app.config import Config
 from app.services.db import init_db
+from app.services.auth_context import init_auth
+from app.services.templating import init_templates
+from app.services.export_jobs import init_export_jobs
+from app.services.fragment_cache import FragmentCacheExtension
 from app.routes import auth, dashboard, admin, members
 from datetime import datetime
 import os
@@ -20,6 +24,7 @@ def create_app(config_class=Config):
     app.jinja_env.loader = jinja2_loader
     app.jinja_env.add_extension('jinja2.ext.do')
     app.jinja_env.add_extension('jinja2.ext.loopcontrols')
+    app.jinja_env.add_extension(FragmentCacheExtension)
 
     # Jinja2 filter'ları ekle
     @app.template_filter('datetime')
@@ -32,6 +37,9 @@ def create_app(config_class=Config):
         except:
             return timestamp
 
+    # Tüm blueprint'ler için tek yetkilendirme adımı
+    init_auth(app)
+
     # Blueprint'leri kaydet
     app.register_blueprint(auth.bp)
     app.register_blueprint(dashboard.bp)
@@ -47,5 +55,10 @@ def create_app(config_class=Config):
     # Uygulama context'i içinde veritabanını başlat
     with app.app_context():
         init_db()
+        # Önceki çalıştırmadan yarıda kalan dışa aktarım işleri ve eski dosyalar
+        init_export_jobs()
+
+    # Şablonları bytecode önbelleğinden yükle/derle; ilk istek derleme beklemesin
+    init_templates(app)
 
     return app
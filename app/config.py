@@ -5,9 +5,31 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     DATABASE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db', 'dernekkapi.db')
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
+    # Arka planda hazırlanan dışa aktarım dosyaları
+    EXPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'exports')
+    # Önbelleğe alınan dernek dışa aktarımları ve hazırlanan federasyon dosyaları için (ayrı ayrı) disk bütçesi (byte)
+    EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    # Hazırlanan federasyon dışa aktarım dosyalarının saklanma süresi (saniye)
+    EXPORT_JOB_MAX_AGE = 7 * 24 * 60 * 60
+    # Derlenmiş Jinja şablonları (worker yeniden başlayınca şablonlar yeniden derlenmez)
+    JINJA_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'jinja')
+    # Başlangıçta tüm şablonları derle
+    PRECOMPILE_TEMPLATES = True
+    # None: şablon değişiklikleri yalnızca debug modunda (run.py) otomatik yüklenir, production'da kapalı
+    TEMPLATES_AUTO_RELOAD = None
+    # {% cache %} ile saklanan şablon parçaları için bellek bütçesi (byte)
+    FRAGMENT_CACHE_MAX_BYTES = 16 * 1024 * 1024
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
 
+    # Doğrulanmış token önbelleğinin en fazla kayıt sayısı
+    TOKEN_CACHE_SIZE = 1024
+    # Admin kullanıcı (rol) önbelleğinin geçerlilik süresi (saniye)
+    ADMIN_USER_CACHE_TTL = 30
+
     # Dosya yükleme izinleri
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+    # Yazılırken ön sorgu başlatılacak kimlik numarası uzunlukları
+    PREFETCH_IDENTITY_LENGTHS = (11,)
@@ -1,15 +1,26 @@
 import uuid
 import json
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
+
+def _hydrate(cls, row: Sequence[Any]):
+    """Veritabanı satırını sütun sırasına göre nesneye aktar (varsayılan değer üretmeden)"""
+    obj = cls.__new__(cls)
+    for name, value in zip(cls.COLUMNS, row):
+        setattr(obj, name, value)
+    return obj
 
 class User:
+    # Veritabanı sütunları - from_row bu sırayla eşler
+    COLUMNS = ("id", "username", "password", "role", "lastLoginDate")
+    __slots__ = COLUMNS
+
     def __init__(self, username: str, password: str, role: str = "admin"):
         self.id = str(uuid.uuid4())
         self.username = username
         self.password = password  # Plain text, production'da hash'lenmeli
         self.role = role
-        self.lastLoginDate = str(int(datetime.now().timestamp()))
+        self.lastLoginDate = int(datetime.now().timestamp())
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -27,7 +38,16 @@ class User:
         user.lastLoginDate = data["lastLoginDate"]
         return user
 
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'User':
+        """COLUMNS sırasıyla seçilmiş satırdan nesne oluştur"""
+        return _hydrate(cls, row)
+
 class AdminUser:
+    COLUMNS = ("id", "username", "password", "full_name", "role", "email",
+               "is_active", "created_at", "last_login")
+    __slots__ = COLUMNS
+
     def __init__(self, username: str, password: str, full_name: str, role: str = "Yönetici", email: str = ""):
         self.id = str(uuid.uuid4())
         self.username = username
@@ -36,8 +56,8 @@ class AdminUser:
         self.role = role  # "Yönetici" veya "Moderatör"
         self.email = email
         self.is_active = True
-        self.created_at = str(int(datetime.now().timestamp()))
-        self.last_login = str(int(datetime.now().timestamp()))
+        self.created_at = int(datetime.now().timestamp())
+        self.last_login = int(datetime.now().timestamp())
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -63,22 +83,32 @@ class AdminUser:
         )
         admin_user.id = data["id"]
         admin_user.is_active = data.get("is_active", True)
-        admin_user.created_at = data.get("created_at", str(int(datetime.now().timestamp())))
-        admin_user.last_login = data.get("last_login", str(int(datetime.now().timestamp())))
+        admin_user.created_at = data.get("created_at", int(datetime.now().timestamp()))
+        admin_user.last_login = data.get("last_login", int(datetime.now().timestamp()))
         return admin_user
 
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'AdminUser':
+        """COLUMNS sırasıyla seçilmiş satırdan nesne oluştur"""
+        return _hydrate(cls, row)
+
     def can_create_users(self) -> bool:
         """Sadece Yönetici rolündeki kullanıcılar yeni kullanıcı oluşturabilir"""
         return self.role == "Yönetici"
 
 class Association:
+    COLUMNS = ("id", "governmentId", "name", "username", "password", "last_login",
+               "typeCode", "typeCodeDescription", "subTypeCode", "subTypeCodeDescription",
+               "oldLegalEntityNumber", "newLegalEntityNumber")
+    __slots__ = COLUMNS
+
     def __init__(self, government_id: str, name: str, username: str, password: str):
         self.id = str(uuid.uuid4())
         self.governmentId = government_id
         self.name = name
         self.username = username
         self.password = password  # Plain text, production'da hash'lenmeli
-        self.last_login = str(int(datetime.now().timestamp()))
+        self.last_login = int(datetime.now().timestamp())
         self.typeCode = ""
         self.typeCodeDescription = ""
         self.subTypeCode = ""
@@ -115,7 +145,20 @@ class Association:
         assoc.newLegalEntityNumber = data.get("newLegalEntityNumber", "")
         return assoc
 
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Association':
+        """COLUMNS sırasıyla seçilmiş satırdan nesne oluştur"""
+        return _hydrate(cls, row)
+
 class Member:
+    COLUMNS = ("id", "identityNumber", "nationality", "firstName", "lastName", "middleName",
+               "birthSurname", "gender", "birthPlace", "motherName", "birthDate", "fatherName",
+               "district", "neighborhood", "street", "buildingNameOrNumber", "doorNumber",
+               "apartmentNumber", "phoneNumber", "gsmCountryCode", "gsmOperatorCode", "gsmNumber",
+               "association", "membershipYear", "status",
+               "created_at", "updated_at", "approved_by", "approved_at", "rejection_reason")
+    __slots__ = COLUMNS
+
     def __init__(self, identity_number: str, first_name: str, last_name: str, association_id: str):
         self.id = str(uuid.uuid4())
         self.identityNumber = identity_number
@@ -144,10 +187,10 @@ class Member:
         self.association = association_id
         self.membershipYear = str(datetime.now().year)
         self.status = "pending"  # "pending", "receipt_pending", "approved", "rejected"
-        self.created_at = str(int(datetime.now().timestamp()))
-        self.updated_at = str(int(datetime.now().timestamp()))
+        self.created_at = int(datetime.now().timestamp())
+        self.updated_at = int(datetime.now().timestamp())
         self.approved_by = ""
-        self.approved_at = ""
+        self.approved_at = None
         self.rejection_reason = ""
 
     def to_dict(self) -> Dict[str, Any]:
@@ -204,20 +247,43 @@ class Member:
         member.gsm = data.get("gsm", {"countryCode": "+90", "operatorCode": "533", "number": "0000000"})
         member.membershipYear = data.get("membershipYear", str(datetime.now().year))
         member.status = data.get("status", "pending")
-        member.created_at = data.get("created_at", str(int(datetime.now().timestamp())))
-        member.updated_at = data.get("updated_at", str(int(datetime.now().timestamp())))
+        member.created_at = data.get("created_at", int(datetime.now().timestamp()))
+        member.updated_at = data.get("updated_at", int(datetime.now().timestamp()))
         member.approved_by = data.get("approved_by", "")
-        member.approved_at = data.get("approved_at", "")
+        member.approved_at = data.get("approved_at")
         member.rejection_reason = data.get("rejection_reason", "")
         return member
 
+    @property
+    def gsm(self) -> Dict[str, str]:
+        """GSM sütunlarının sözlük görünümü"""
+        return {
+            "countryCode": self.gsmCountryCode,
+            "operatorCode": self.gsmOperatorCode,
+            "number": self.gsmNumber
+        }
+
+    @gsm.setter
+    def gsm(self, value: Dict[str, str]):
+        self.gsmCountryCode = value.get("countryCode", "+90")
+        self.gsmOperatorCode = value.get("operatorCode", "533")
+        self.gsmNumber = value.get("number", "0000000")
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Member':
+        """COLUMNS sırasıyla seçilmiş satırdan nesne oluştur"""
+        return _hydrate(cls, row)
+
 class Receipt:
+    COLUMNS = ("id", "memberId", "associationId", "uploadPath", "uploadDate")
+    __slots__ = COLUMNS
+
     def __init__(self, member_id: str, association_id: str, upload_path: str):
         self.id = str(uuid.uuid4())
         self.memberId = member_id
         self.associationId = association_id
         self.uploadPath = upload_path
-        self.uploadDate = str(int(datetime.now().timestamp()))
+        self.uploadDate = int(datetime.now().timestamp())
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -234,3 +300,8 @@ class Receipt:
         receipt.id = data["id"]
         receipt.uploadDate = data["uploadDate"]
         return receipt
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Receipt':
+        """COLUMNS sırasıyla seçilmiş satırdan nesne oluştur"""
+        return _hydrate(cls, row)
@@ -1,9 +1,21 @@
-from flask import Blueprint, render_template, session, redirect, url_for, flash, request, jsonify
-from app.services.db import get_all_associations, get_members_by_association, get_receipts_by_association
-from app.services.db import get_all_admin_users, create_admin_user, get_admin_user_by_id, get_admin_user_by_username, update_admin_user, delete_admin_user, get_association_by_username, get_association_by_id
-from app.services.jwt_service import get_user_from_token, create_association_token
+from flask import Blueprint, render_template, session, redirect, url_for, flash, request, jsonify, send_file
+from app.services.db import search_member_rows, get_association_counts, get_association_last_logins, get_cache_version, get_data_version, get_association_validators
+from app.services.db import get_member_page, get_receipt_page, get_member_rows_by_ids, count_receipts, count_members, clamp_page_size
+from app.services.db import get_all_admin_users, create_admin_user, get_admin_user_by_id, get_admin_user_by_username, update_admin_user, delete_admin_user
+from app.services.jwt_service import create_association_token
+from app.services.auth_context import get_current_user, get_current_admin_user, invalidate_admin_user, requires_policy, get_auth_metrics
+from app.services.association_cache import association_cache
+from app.services.fragment_cache import fragment_cache
+from app.services.conditional import page_etag, not_modified, with_validators
+from app.services.export_jobs import EXPORT_FORMATS, start_federation_export, export_file_path, describe_filters
+from app.services.db import MEMBER_FILTER_COLUMNS, get_export_job, get_recent_export_jobs
+from app.services.templating import stream_template
 from app.models import AdminUser
 from datetime import datetime
+from itertools import islice
+
+# Makbuz listesinde üyeleri birlikte getirilen makbuz sayısı
+RECEIPT_MEMBER_BATCH_SIZE = 50
 
 def format_last_login(last_login):
     """Unix timestamp'i okunabilir tarihe çevir"""
@@ -20,155 +32,137 @@ def format_last_login(last_login):
 
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
-def admin_required(f):
-    """Admin kontrolü decorator'ı"""
-    def decorated_function(*args, **kwargs):
-        if 'token' not in session:
-            flash('Lütfen önce giriş yapın', 'error')
-            return redirect(url_for('auth.login'))
-
-        user_data = get_user_from_token(session['token'])
-        if not user_data or user_data['user_type'] != 'admin':
-            flash('Bu sayfaya erişim yetkiniz yok', 'error')
-            return redirect(url_for('auth.login'))
-
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
-def manager_required(f):
-    """Yönetici kontrolü decorator'ı - sadece Yönetici rolündeki kullanıcılar"""
-    def decorated_function(*args, **kwargs):
-        if 'token' not in session:
-            flash('Lütfen önce giriş yapın', 'error')
-            return redirect(url_for('auth.login'))
-
-        user_data = get_user_from_token(session['token'])
-        if not user_data or user_data['user_type'] != 'admin':
-            flash('Bu sayfaya erişim yetkiniz yok', 'error')
-            return redirect(url_for('auth.login'))
-
-        # Yönetici kullanıcısını kontrol et
-        admin_user = get_admin_user_by_username(user_data['username'])
-        if not admin_user or admin_user.role != "Yönetici":
-            flash('Bu işlem için Yönetici yetkisi gereklidir', 'error')
-            return redirect(url_for('admin.dashboard'))
-
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
 @bp.route('/')
-@admin_required
 def dashboard():
     """Admin ana sayfası"""
     # Tüm dernekleri al
-    associations = get_all_associations()
-
-    # Her dernek için üye ve makbuz sayılarını hesapla
-    association_stats = []
-    total_members = 0
-    total_receipts = 0
-    total_pending_members = 0
-
-    for association in associations:
-        members = get_members_by_association(association.id)
-        receipts = get_receipts_by_association(association.id)
-
-        member_count = len(members)
-        receipt_count = len(receipts)
-        pending_count = len([m for m in members if m.status == 'pending'])
-
-        total_members += member_count
-        total_receipts += receipt_count
-        total_pending_members += pending_count
-
-        # Last login formatlaması
-        formatted_last_login = format_last_login(association.last_login)
-
-        association_stats.append({
-            'association': association,
-            'member_count': member_count,
-            'receipt_count': receipt_count,
-            'pending_count': pending_count,
-            'formatted_last_login': formatted_last_login
-        })
+    associations = association_cache.all()
+
+    # Son giriş zamanları dernek önbelleğinde güncel tutulmadığı için ayrıca okunur
+    last_logins = get_association_last_logins()
+
+    # Üye/makbuz sayıları şablondaki önbellek parçaları içinde, yalnızca ıskalamada ve istek
+    # başına bir kez hesaplanır; isabette members/receipts tablolarına hiç gidilmez
+    stats = {}
+    def load_stats():
+        if not stats:
+            counts = get_association_counts()
+            empty_counts = {'member_count': 0, 'pending_count': 0, 'receipt_count': 0}
+            association_stats = [dict(
+                counts.get(association.id, empty_counts),
+                association=association,
+                formatted_last_login=format_last_login(last_logins.get(association.id))
+            ) for association in associations]
+            stats.update(
+                associations=association_stats,
+                total_members=sum(stat['member_count'] for stat in association_stats),
+                total_receipts=sum(stat['receipt_count'] for stat in association_stats),
+                total_pending_members=sum(stat['pending_count'] for stat in association_stats)
+            )
+        return stats
 
     return render_template('admin.jinja2',
-                         associations=association_stats,
-                         total_members=total_members,
-                         total_receipts=total_receipts,
-                         total_pending_members=total_pending_members)
+                         associations=associations,
+                         load_stats=load_stats,
+                         associations_version=get_cache_version('associations'),
+                         data_version=get_data_version(),
+                         logins_version=sum(last_login or 0 for last_login in last_logins.values()))
 
 @bp.route('/association/<association_id>')
-@admin_required
 def association_detail(association_id):
     """Dernek detay sayfası"""
     # Dernek bilgilerini al
-    associations = get_all_associations()
-    association = None
-
-    for assoc in associations:
-        if assoc.id == association_id:
-            association = assoc
-            break
+    association = association_cache.get_by_id(association_id)
 
     if not association:
         flash('Dernek bulunamadı', 'error')
         return redirect(url_for('admin.dashboard'))
 
-    # Derneğin üyelerini al
-    members = get_members_by_association(association_id)
+    # Tarayıcıdaki sayfa güncelse üye/makbuz sorguları ve şablon atlanır
+    validators = get_association_validators(association_id)
+    etag = None
+    if validators:
+        # Dernek bilgileri sayfada önbellekten gösterildiği için ETag'e de oradan girer; üye
+        # istatistikleri içinde bulunulan yıla göre hesaplandığı için yıl da eklenir
+        etag = page_etag(request.full_path, *association.to_dict().values(), validators['last_login'],
+                         validators['data_version'], validators['updated_at'], validators['receipt_count'],
+                         datetime.now().year)
+        response = not_modified(etag)
+        if response:
+            return response
+
+    page_size = clamp_page_size(request.args.get('limit', type=int))
 
-    # Derneğin makbuzlarını al
-    receipts = get_receipts_by_association(association_id)
+    # Derneğin üyeleri ve makbuzları ayrı imleçlerle sayfalanır. Üye tablosu şablonda önbelleğe
+    # alındığı için üye sayfası yalnızca önbellekte yoksa sorgulanır
+    def load_members_page():
+        return get_member_page('list', association_id, cursor=request.args.get('members_cursor'), limit=page_size)
 
-    # Makbuz numaralarını hesapla
-    from app.services.db import get_receipt_number_for_member
-    receipts_with_numbers = []
-    for receipt in receipts:
-        receipt_number = get_receipt_number_for_member(receipt.id, receipt.memberId)
-        receipts_with_numbers.append({
-            'receipt': receipt,
-            'number': receipt_number
-        })
+    receipts_page = get_receipt_page(association_id, cursor=request.args.get('receipts_cursor'), limit=page_size)
 
-    return render_template('association_detail.jinja2',
+    receipts_with_numbers = [{'receipt': receipt, 'number': number} for receipt, number in receipts_page.rows]
+
+    page = render_template('association_detail.jinja2',
                          association=association,
-                         members=members,
-                         receipts=receipts_with_numbers)
+                         last_login=validators['last_login'] if validators else association.last_login,
+                         load_members_page=load_members_page,
+                         member_count=count_members(association_id),
+                         data_version=get_data_version(association_id),
+                         receipts=receipts_with_numbers,
+                         receipts_page=receipts_page,
+                         receipt_count=count_receipts(association_id),
+                         page_size=page_size)
+    return with_validators(page, etag) if etag else page
 
 @bp.route('/members')
-@admin_required
 def all_members():
     """Tüm üyeleri listele"""
-    from app.services.db import check_member_receipt_status
+    associations = association_cache.by_id()
+    search_query = request.args.get('q', '').strip()
+    page_size = clamp_page_size(request.args.get('limit', type=int))
 
-    associations = get_all_associations()
-    all_members = []
+    # Onay bekleyen üyeler SQL'de üste alınır; arama varsa alaka sırası kullanılır
+    page = get_member_page('list', search=search_query or None, pending_first=True,
+                           cursor=request.args.get('cursor'), limit=page_size, stream=True)
 
-    for association in associations:
-        members = get_members_by_association(association.id)
-        for member in members:
-            # Makbuz durumunu kontrol et ve status'u güncelle
-            member.status = check_member_receipt_status(member)
+    def member_rows():
+        for member in page.rows:
+            association = associations.get(member.association)
+            if not association:
+                continue
 
-            all_members.append({
+            yield {
                 'member': member,
                 'association': association
-            })
-
-    # Onay bekleyen üyeleri üstte göster
-    all_members.sort(key=lambda x: (x['member'].status != 'pending', x['member'].created_at))
-
-    return render_template('all_members.jinja2', members=all_members)
+            }
+
+    return stream_template('all_members.jinja2',
+                           members=member_rows(),
+                           page=page,
+                           page_size=page_size,
+                           member_count=count_members(),
+                           search_query=search_query)
+
+@bp.route('/members/search')
+def search_members():
+    """Tüm derneklerin üyelerinde tam metin araması (JSON)"""
+    search_query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 20, type=int), 100)
+
+    associations = association_cache.by_id()
+    results = []
+    for row in search_member_rows(search_query, 'list', limit=limit):
+        association = associations.get(row.association)
+        results.append(dict(row._asdict(), gsm=row.gsm,
+                            associationName=association.name if association else None))
+
+    return jsonify({'query': search_query, 'results': results})
 
 @bp.route('/members/<member_id>/approve', methods=['POST'])
-@admin_required
 def approve_member(member_id):
     """Üyeyi onayla ve İçişleri Bakanlığı sistemine kaydet"""
-    from app.services.db import get_member_by_id, update_member, get_association_by_id
-    from app.services.icisleri_submit_bot import IcisleriSubmitBot
+    from app.services.db import get_member_by_id, update_member
+    from app.services.approvals import submit_member_once, is_registration_completed
 
     member = get_member_by_id(member_id)
     if not member:
@@ -176,14 +170,13 @@ def approve_member(member_id):
         return redirect(url_for('admin.all_members'))
 
     # Dernek bilgilerini al
-    association = get_association_by_id(member.association)
+    association = association_cache.get_by_id(member.association)
     if not association:
         flash('Dernek bilgileri bulunamadı', 'error')
         return redirect(url_for('admin.all_members'))
 
     # Admin kullanıcısını al
-    user_data = get_user_from_token(session['token'])
-    admin_user = get_admin_user_by_username(user_data['username'])
+    admin_user = get_current_admin_user()
 
     # Progress callback fonksiyonu
     def progress_callback(message, progress):
@@ -191,82 +184,55 @@ def approve_member(member_id):
         # Şimdilik sadece log yazıyoruz
         print(f"Progress: {progress}% - {message}")
 
-    # Config'den bilgileri al
-    try:
-        from config import ICISLERI_CONFIG
-    except ImportError:
-        flash('Konfigürasyon dosyası bulunamadı', 'error')
-        return redirect(url_for('admin.all_members'))
+    # İçişleri Bakanlığı sistemine kaydet (aynı üye için tekrarlanan istekler tek gönderimi paylaşır)
+    result = submit_member_once(member, association, progress_callback)
 
-    # İçişleri Bakanlığı sistemine kaydet
-    bot = IcisleriSubmitBot(progress_callback=progress_callback)  # Headless değeri config'den alınacak
-    try:
-        # Giriş yap
-        if not bot.login_to_icisleri(ICISLERI_CONFIG['username'], ICISLERI_CONFIG['password']):
-            flash('İçişleri Bakanlığı sistemine giriş yapılamadı', 'error')
-            return redirect(url_for('admin.all_members'))
-
-        # Üyeyi sisteme kaydet
-        member_data = member.to_dict()
-        association_data = association.to_dict()
-
-        result = bot.submit_member_to_icisleri(member_data, association_data)
-
-        if result['success']:
-            # Mesaj türüne göre renklendirme ve status güncelleme
-            modal_message = result.get("message", "")
-
-            if "Yeni Kayıt Yapıldı" in modal_message:
-                # Sadece "Yeni Kayıt Yapıldı" mesajı geldiğinde status'u approved yap
-                member.status = 'approved'
-                member.approved_by = admin_user.full_name if admin_user else 'Bilinmeyen'
-                member.approved_at = str(int(datetime.now().timestamp()))
-                member.updated_at = str(int(datetime.now().timestamp()))
-
-                message_type = "success"
-                message_title = "✅ Başarılı"
-                success_message = f'{member.firstName} {member.lastName} başarıyla onaylandı ve İçişleri Bakanlığı sistemine kaydedildi.'
-            else:
-                # Diğer mesajlar geldiğinde status değişmesin, hala onay bekliyor
-                member.updated_at = str(int(datetime.now().timestamp()))
-
-                message_type = "warning"
-                message_title = "⚠️ Uyarı"
-                success_message = f'{member.firstName} {member.lastName} için İçişleri Bakanlığı sisteminden mesaj alındı: {modal_message}'
-
-            if update_member(member):
-
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return jsonify({
-                        'success': True,
-                        'message': success_message,
-                        'modal_message': modal_message,
-                        'message_type': message_type,
-                        'message_title': message_title
-                    })
-                else:
-                    flash(success_message, message_type)
+    if result['success']:
+        # Mesaj türüne göre renklendirme ve status güncelleme
+        modal_message = result.get("message", "")
+
+        if is_registration_completed(result):
+            # Sadece "Yeni Kayıt Yapıldı" mesajı geldiğinde status'u approved yap
+            member.status = 'approved'
+            member.approved_by = admin_user.full_name if admin_user else 'Bilinmeyen'
+            member.approved_at = int(datetime.now().timestamp())
+            member.updated_at = int(datetime.now().timestamp())
+
+            message_type = "success"
+            message_title = "✅ Başarılı"
+            success_message = f'{member.firstName} {member.lastName} başarıyla onaylandı ve İçişleri Bakanlığı sistemine kaydedildi.'
+        else:
+            # Diğer mesajlar geldiğinde status değişmesin, hala onay bekliyor
+            member.updated_at = int(datetime.now().timestamp())
+
+            message_type = "warning"
+            message_title = "⚠️ Uyarı"
+            success_message = f'{member.firstName} {member.lastName} için İçişleri Bakanlığı sisteminden mesaj alındı: {modal_message}'
+
+        if update_member(member):
+
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return jsonify({
+                    'success': True,
+                    'message': success_message,
+                    'modal_message': modal_message,
+                    'message_type': message_type,
+                    'message_title': message_title
+                })
             else:
-                error_message = 'Üye onaylanırken hata oluştu'
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return jsonify({'success': False, 'message': error_message})
-                else:
-                    flash(error_message, 'error')
+                flash(success_message, message_type)
         else:
-            error_message = f'İçişleri Bakanlığı sistemine kayıt başarısız: {result["message"]}'
+            error_message = 'Üye onaylanırken hata oluştu'
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return jsonify({'success': False, 'message': error_message})
             else:
                 flash(error_message, 'error')
-
-    except Exception as e:
-        error_message = f'İçişleri Bakanlığı sistemi hatası: {str(e)}'
+    else:
+        error_message = f'İçişleri Bakanlığı sistemine kayıt başarısız: {result["message"]}'
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({'success': False, 'message': error_message})
         else:
             flash(error_message, 'error')
-    finally:
-        bot.close()
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return jsonify({'success': False, 'message': 'Bilinmeyen hata'})
@@ -274,7 +240,6 @@ def approve_member(member_id):
     return redirect(url_for('admin.all_members'))
 
 @bp.route('/members/<member_id>/reject', methods=['POST'])
-@admin_required
 def reject_member(member_id):
     """Üyeyi reddet"""
     from app.services.db import get_member_by_id, update_member
@@ -287,15 +252,14 @@ def reject_member(member_id):
     rejection_reason = request.form.get('rejection_reason', '')
 
     # Admin kullanıcısını al
-    user_data = get_user_from_token(session['token'])
-    admin_user = get_admin_user_by_username(user_data['username'])
+    admin_user = get_current_admin_user()
 
     # Üye durumunu güncelle
     member.status = 'rejected'
     member.approved_by = admin_user.full_name if admin_user else 'Bilinmeyen'
-    member.approved_at = str(int(datetime.now().timestamp()))
+    member.approved_at = int(datetime.now().timestamp())
     member.rejection_reason = rejection_reason
-    member.updated_at = str(int(datetime.now().timestamp()))
+    member.updated_at = int(datetime.now().timestamp())
 
     if update_member(member):
         flash(f'{member.firstName} {member.lastName} reddedildi', 'success')
@@ -305,32 +269,41 @@ def reject_member(member_id):
     return redirect(url_for('admin.all_members'))
 
 @bp.route('/receipts')
-@admin_required
 def all_receipts():
     """Tüm makbuzları listele"""
-    from app.services.db import get_member_by_id, get_receipt_number_for_member
-
-    associations = get_all_associations()
-    all_receipts = []
-
-    for association in associations:
-        receipts = get_receipts_by_association(association.id)
-        for receipt in receipts:
-            # Üye bilgilerini al
-            member = get_member_by_id(receipt.memberId)
-            # Makbuz numarasını hesapla
-            receipt_number = get_receipt_number_for_member(receipt.id, receipt.memberId) if member else 0
-            all_receipts.append({
-                'receipt': receipt,
-                'association': association,
-                'member': member,
-                'receipt_number': receipt_number
-            })
-
-    return render_template('all_receipts.jinja2', receipts=all_receipts)
+    associations = association_cache.by_id()
+    page_size = clamp_page_size(request.args.get('limit', type=int))
+    page = get_receipt_page(cursor=request.args.get('cursor'), limit=page_size, stream=True)
+
+    def receipt_rows():
+        # Makbuzların üyeleri parça başına tek sorguda alınır
+        rows = iter(page.rows)
+        while True:
+            batch = list(islice(rows, RECEIPT_MEMBER_BATCH_SIZE))
+            if not batch:
+                return
+            members = get_member_rows_by_ids([receipt.memberId for receipt, _ in batch])
+
+            for receipt, number in batch:
+                association = associations.get(receipt.associationId)
+                if not association:
+                    continue
+
+                member = members.get(receipt.memberId)
+                yield {
+                    'receipt': receipt,
+                    'association': association,
+                    'member': member,
+                    'receipt_number': number if member else 0
+                }
+
+    return stream_template('all_receipts.jinja2',
+                           receipts=receipt_rows(),
+                           page=page,
+                           page_size=page_size,
+                           receipt_count=count_receipts())
 
 @bp.route('/receipts/<receipt_id>/details')
-@admin_required
 def receipt_details(receipt_id):
     """Makbuz detaylarına tıklandığında üye detay sayfasına yönlendir"""
     from app.services.db import get_receipt_by_id, get_member_by_id
@@ -348,16 +321,80 @@ def receipt_details(receipt_id):
     # Üye detay sayfasına yönlendir
     return redirect(url_for('members.detail', member_id=member.id))
 
+@bp.route('/exports', methods=['GET', 'POST'])
+def exports():
+    """Tüm derneklerin üyelerini arka planda dışa aktar ve hazırlanan dosyaları listele"""
+    if request.method == 'POST':
+        export_format = request.form.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            flash('Geçersiz dışa aktarım formatı', 'error')
+            return redirect(url_for('admin.exports'))
+
+        filters = {}
+        for name in MEMBER_FILTER_COLUMNS:
+            value = request.form.get(name, '').strip()
+            if value:
+                filters[name] = value
+
+        start_federation_export(export_format, filters, session.get('username'))
+        flash('Dışa aktarım başlatıldı. Hazır olduğunda aşağıdaki listeden indirebilirsiniz.', 'success')
+        return redirect(url_for('admin.exports'))
+
+    jobs = get_recent_export_jobs()
+    for job in jobs:
+        job['filters_text'] = describe_filters(job['filters'])
+    return render_template('admin_exports.jinja2', jobs=jobs)
+
+@bp.route('/exports/<job_id>')
+def export_status(job_id):
+    """Dışa aktarım işinin durumu (JSON)"""
+    job = get_export_job(job_id)
+    if not job:
+        return jsonify({'error': 'İş bulunamadı'}), 404
+    return jsonify({
+        'id': job['id'],
+        'status': job['status'],
+        'row_count': job['row_count'],
+        'error': job['error'],
+        'download_url': url_for('admin.export_download', job_id=job_id) if job['status'] == 'succeeded' else None
+    })
+
+@bp.route('/exports/<job_id>/download')
+def export_download(job_id):
+    """Tamamlanmış dışa aktarım dosyasını indir"""
+    job = get_export_job(job_id)
+    if not job or job['status'] != 'succeeded':
+        flash('Dışa aktarım dosyası bulunamadı', 'error')
+        return redirect(url_for('admin.exports'))
+
+    mimetype, extension = EXPORT_FORMATS[job['format']]
+    created = datetime.fromtimestamp(job['created_at']).strftime('%Y%m%d_%H%M%S')
+    return send_file(
+        export_file_path(job),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f'federasyon_uyeleri_{created}{extension}'
+    )
+
+@bp.route('/metrics/auth')
+def auth_metrics():
+    """Yetkilendirme adımının blueprint başına süre istatistikleri"""
+    return jsonify(get_auth_metrics())
+
+@bp.route('/metrics/fragment-cache')
+def fragment_cache_metrics():
+    """Şablon parçası önbelleğinin isabet/ıskalama ve bellek istatistikleri"""
+    return jsonify(fragment_cache.get_stats())
+
 # Yönetici Kullanıcı Yönetimi
 @bp.route('/users')
-@admin_required
 def users():
     """Yönetici kullanıcıları listele"""
     admin_users = get_all_admin_users()
     return render_template('admin_users.jinja2', admin_users=admin_users)
 
 @bp.route('/users/create', methods=['GET', 'POST'])
-@manager_required
+@requires_policy('manager')
 def create_user():
     """Yeni yönetici kullanıcısı oluştur"""
     if request.method == 'POST':
@@ -385,6 +422,7 @@ def create_user():
         admin_user = AdminUser(username, password, full_name, role, email)
 
         if create_admin_user(admin_user):
+            invalidate_admin_user(username)
             flash('Yönetici kullanıcısı başarıyla oluşturuldu', 'success')
             return redirect(url_for('admin.users'))
         else:
@@ -393,7 +431,7 @@ def create_user():
     return render_template('admin_user_create.jinja2')
 
 @bp.route('/users/<user_id>/edit', methods=['GET', 'POST'])
-@manager_required
+@requires_policy('manager')
 def edit_user(user_id):
     """Yönetici kullanıcısını düzenle"""
     admin_user = get_admin_user_by_id(user_id)
@@ -434,6 +472,7 @@ def edit_user(user_id):
             admin_user.password = password
 
         if update_admin_user(admin_user):
+            invalidate_admin_user()  # Kullanıcı adı da değişmiş olabilir
             flash('Kullanıcı başarıyla güncellendi', 'success')
             return redirect(url_for('admin.users'))
         else:
@@ -442,7 +481,7 @@ def edit_user(user_id):
     return render_template('admin_user_edit.jinja2', admin_user=admin_user)
 
 @bp.route('/users/<user_id>/delete', methods=['POST'])
-@manager_required
+@requires_policy('manager')
 def delete_user(user_id):
     """Yönetici kullanıcısını sil"""
     admin_user = get_admin_user_by_id(user_id)
@@ -451,12 +490,13 @@ def delete_user(user_id):
         return redirect(url_for('admin.users'))
 
     # Kendini silmeye çalışıyorsa engelle
-    current_user_data = get_user_from_token(session['token'])
+    current_user_data = get_current_user()
     if current_user_data and current_user_data['username'] == admin_user.username:
         flash('Kendinizi silemezsiniz', 'error')
         return redirect(url_for('admin.users'))
 
     if delete_admin_user(user_id):
+        invalidate_admin_user(admin_user.username)
         flash('Kullanıcı başarıyla silindi', 'success')
     else:
         flash('Kullanıcı silinirken hata oluştu', 'error')
@@ -464,17 +504,11 @@ def delete_user(user_id):
     return redirect(url_for('admin.users'))
 
 @bp.route('/login-as-association/<association_id>')
-@manager_required
+@requires_policy('manager')
 def login_as_association(association_id):
     """Yönetici olarak dernek adına giriş yap"""
     # Dernek bilgilerini al
-    associations = get_all_associations()
-    association = None
-
-    for assoc in associations:
-        if assoc.id == association_id:
-            association = assoc
-            break
+    association = association_cache.get_by_id(association_id)
 
     if not association:
         flash('Dernek bulunamadı', 'error')
@@ -494,7 +528,6 @@ def login_as_association(association_id):
     return redirect(url_for('dashboard.index'))
 
 @bp.route('/receipts/<receipt_id>/delete', methods=['POST'])
-@admin_required
 def delete_receipt(receipt_id):
     """Makbuzu sil"""
     from app.services.db import get_receipt_by_id, delete_receipt as db_delete_receipt
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash, session
-from app.services.db import get_user_by_username, get_association_by_username, update_user_login, update_association_login
-from app.services.db import get_admin_user_by_username, update_admin_user_login
+from app.services.db import get_user_by_username, get_admin_user_by_username
 from app.services.jwt_service import create_admin_token, create_association_token
+from app.services.association_cache import association_cache
+from app.services.login_buffer import login_buffer
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -36,7 +37,7 @@ def login():
                 session['admin_role'] = admin_user.role
                 session['full_name'] = admin_user.full_name
 
-                update_admin_user_login(admin_user.id)
+                login_buffer.record('admin_users', admin_user.id)
                 flash('Başarıyla giriş yaptınız', 'success')
                 return redirect(url_for('admin.dashboard'))
 
@@ -50,14 +51,14 @@ def login():
                 session['username'] = user.username
                 session['admin_role'] = 'Yönetici'  # Varsayılan rol
 
-                update_user_login(user.id)
+                login_buffer.record('users', user.id)
                 flash('Başarıyla giriş yaptınız', 'success')
                 return redirect(url_for('admin.dashboard'))
             else:
                 flash('Geçersiz kullanıcı adı veya şifre', 'error')
         else:
             # Dernek girişi
-            association = get_association_by_username(username)
+            association = association_cache.get_by_username(username)
             if association and association.password == password:  # Production'da hash kontrolü yapılmalı
                 token = create_association_token(association)
                 session['token'] = token
@@ -66,7 +67,7 @@ def login():
                 session['username'] = association.username
                 session['association_name'] = association.name
 
-                update_association_login(association.id)
+                login_buffer.record('associations', association.id)
                 flash('Başarıyla giriş yaptınız', 'success')
                 return redirect(url_for('dashboard.index'))
             else:
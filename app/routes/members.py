@@ -1,33 +1,20 @@
-from flask import Blueprint, request, render_template, redirect, url_for, flash, session, send_file, jsonify
-from app.services.db import create_member, get_members_by_association, get_member_by_id, create_receipt, get_receipts_by_member, update_member, delete_member, get_member_by_identity_and_association
+from flask import Blueprint, request, render_template, redirect, url_for, flash, session, send_file, jsonify, current_app
+from app.services.db import create_member, get_member_page, get_member_stats, clamp_page_size, search_member_rows, get_member_by_id, create_receipt, get_receipts_by_member, update_member, delete_member, get_member_by_identity_and_association, get_member_validators
 from app.services.file_upload import save_receipt_file, get_file_path
-from app.services.jwt_service import get_user_from_token
 from app.services.icisleri_bot import fetch_member_info_from_icisleri
+from app.services.association_cache import association_cache
+from app.services.export_artifacts import ARTIFACT_EXTENSIONS, artifact_etag, get_export_artifact
+from app.services.conditional import page_etag, not_modified, with_validators
+from app.services.prefetch import is_prefetchable, start_prefetch, get_prefetch_status, take_prefetched
 from app.models import Member, Receipt
-import pandas as pd
 import io
+import os
+import uuid
 from datetime import datetime
 
 bp = Blueprint('members', __name__, url_prefix='/members')
 
-def login_required(f):
-    """Giriş kontrolü decorator'ı"""
-    def decorated_function(*args, **kwargs):
-        if 'token' not in session:
-            flash('Lütfen önce giriş yapın', 'error')
-            return redirect(url_for('auth.login'))
-
-        user_data = get_user_from_token(session['token'])
-        if not user_data:
-            flash('Geçersiz oturum', 'error')
-            return redirect(url_for('auth.login'))
-
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
 @bp.route('/create', methods=['GET', 'POST'])
-@login_required
 def create():
     """Yeni üye oluştur"""
     if request.method == 'POST':
@@ -94,7 +81,7 @@ def create():
             }
             existing_member.membershipYear = membership_year
             existing_member.status = "pending"  # Onay bekliyor
-            existing_member.updated_at = str(int(datetime.now().timestamp()))
+            existing_member.updated_at = int(datetime.now().timestamp())
 
             member = existing_member
             is_update = True
@@ -157,62 +144,41 @@ def create():
                 if auto_approve:
                     try:
                         # İçişleri Bakanlığı sistemine gönder
-                        from app.services.icisleri_submit_bot import IcisleriSubmitBot
-                        from app.services.db import get_association_by_id
-                        from config import ICISLERI_CONFIG
+                        from app.services.approvals import submit_member_once, is_registration_completed
 
-                        association = get_association_by_id(association_id)
+                        association = association_cache.get_by_id(association_id)
                         if association:
-                            bot = IcisleriSubmitBot()
-
-                            # Giriş yap
-                            if bot.login_to_icisleri(ICISLERI_CONFIG['username'], ICISLERI_CONFIG['password']):
-                                # Üyeyi sisteme kaydet
-                                member_data = member.to_dict()
-                                association_data = association.to_dict()
-                                result = bot.submit_member_to_icisleri(member_data, association_data)
-
-                                if result['success'] and "Yeni Kayıt Yapıldı" in result.get("message", ""):
-                                    # Başarılı onaylama
-                                    member.status = 'approved'
-                                    member.approved_by = association.name
-                                    member.approved_at = str(int(datetime.now().timestamp()))
-                                    member.updated_at = str(int(datetime.now().timestamp()))
-                                    update_member(member)
-
-                                    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                                        return jsonify({
-                                            'success': True,
-                                            'message': 'Üye başarıyla oluşturuldu ve otomatik olarak onaylandı!',
-                                            'member_id': member.id,
-                                            'auto_approved': True
-                                        })
-                                    else:
-                                        flash('Üye başarıyla oluşturuldu ve otomatik olarak onaylandı!', 'success')
-                                        return redirect(url_for('members.list'))
+                            result = submit_member_once(member, association)
+
+                            if is_registration_completed(result):
+                                # Başarılı onaylama
+                                member.status = 'approved'
+                                member.approved_by = association.name
+                                member.approved_at = int(datetime.now().timestamp())
+                                member.updated_at = int(datetime.now().timestamp())
+                                update_member(member)
+
+                                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                                    return jsonify({
+                                        'success': True,
+                                        'message': 'Üye başarıyla oluşturuldu ve otomatik olarak onaylandı!',
+                                        'member_id': member.id,
+                                        'auto_approved': True
+                                    })
                                 else:
-                                    # Onaylama başarısız ama üye kaydedildi
-                                    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                                        return jsonify({
-                                            'success': True,
-                                            'message': 'Üye başarıyla oluşturuldu fakat otomatik onaylama başarısız oldu. Manuel onaylama gerekli.',
-                                            'member_id': member.id,
-                                            'auto_approved': False
-                                        })
-                                    else:
-                                        flash('Üye başarıyla oluşturuldu fakat otomatik onaylama başarısız oldu. Manuel onaylama gerekli.', 'warning')
-                                        return redirect(url_for('members.list'))
+                                    flash('Üye başarıyla oluşturuldu ve otomatik olarak onaylandı!', 'success')
+                                    return redirect(url_for('members.list'))
                             else:
-                                # Giriş başarısız ama üye kaydedildi
+                                # Onaylama başarısız ama üye kaydedildi
                                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                                     return jsonify({
                                         'success': True,
-                                        'message': 'Üye başarıyla oluşturuldu fakat otomatik onaylama için giriş yapılamadı. Manuel onaylama gerekli.',
+                                        'message': 'Üye başarıyla oluşturuldu fakat otomatik onaylama başarısız oldu. Manuel onaylama gerekli.',
                                         'member_id': member.id,
                                         'auto_approved': False
                                     })
                                 else:
-                                    flash('Üye başarıyla oluşturuldu fakat otomatik onaylama için giriş yapılamadı. Manuel onaylama gerekli.', 'warning')
+                                    flash('Üye başarıyla oluşturuldu fakat otomatik onaylama başarısız oldu. Manuel onaylama gerekli.', 'warning')
                                     return redirect(url_for('members.list'))
                     except Exception as e:
                         # Hata durumunda üye kaydedildi ama onaylanamadı
@@ -247,10 +213,29 @@ def create():
                 else:
                     flash('Üye oluşturulurken hata oluştu', 'error')
 
-    return render_template('member_create.jinja2', current_year=datetime.now().year)
+    return render_template('member_create.jinja2', current_year=datetime.now().year,
+                           prefetch_identity_lengths=current_app.config['PREFETCH_IDENTITY_LENGTHS'])
+
+def _prefetch_session_key():
+    """Ön sorgu slotu için oturuma özel anahtar"""
+    if 'prefetch_key' not in session:
+        session['prefetch_key'] = uuid.uuid4().hex
+    return session['prefetch_key']
+
+@bp.route('/prefetch-info', methods=['POST'])
+def prefetch_info():
+    """Kimlik numarası yazılırken İçişleri sorgusunu arka planda başlat"""
+    data = request.get_json(silent=True) or {}
+    identity_number = (data.get('identity_number') or '').strip()
+
+    if not is_prefetchable(identity_number, current_app.config['PREFETCH_IDENTITY_LENGTHS']):
+        return jsonify({'error': 'Geçersiz kimlik numarası'}), 400
+
+    session_key = _prefetch_session_key()
+    start_prefetch(session_key, identity_number)
+    return jsonify({'status': get_prefetch_status(session_key, identity_number)}), 202
 
 @bp.route('/fetch-info', methods=['POST'])
-@login_required
 def fetch_info():
     """İçişleri Bakanlığı sitesinden kimlik bilgilerini çek"""
     try:
@@ -260,8 +245,14 @@ def fetch_info():
         if not identity_number:
             return jsonify({'error': 'Kimlik numarası gerekli'}), 400
 
-        # İçişleri Bakanlığı sitesinden bilgileri çek
-        member_info = fetch_member_info_from_icisleri(identity_number)
+        # Yazılırken başlatılan ön sorgu varsa onun sonucunu kullan (devam ediyorsa bitmesini bekle)
+        member_info = None
+        if 'prefetch_key' in session:
+            member_info = take_prefetched(session['prefetch_key'], identity_number)
+
+        # Ön sorgu yoksa veya geçici bir hata ile bittiyse İçişleri Bakanlığı sitesinden bilgileri çek
+        if member_info is None or member_info.get('transient'):
+            member_info = fetch_member_info_from_icisleri(identity_number)
 
         if 'error' in member_info:
             return jsonify({'error': member_info['error']}), 400
@@ -272,45 +263,57 @@ def fetch_info():
         return jsonify({'error': f'İşlem hatası: {str(e)}'}), 500
 
 @bp.route('/list')
-@login_required
 def list():
     """Üye listesi"""
     association_id = session.get('user_id')
-    members = get_members_by_association(association_id)
-    current_year = datetime.now().year
-
-    # Bu yıl makbuz yüklenmeyen üyeleri hesapla
-    members_without_receipts = []
-    for member in members:
-        # Üyenin makbuzlarını al
-        receipts = get_receipts_by_member(member.id)
-
-        # Bu yıl yüklenen makbuz var mı kontrol et
-        has_receipt_this_year = False
-        for receipt in receipts:
-            receipt_date = datetime.fromtimestamp(int(receipt.uploadDate))
-            if receipt_date.year == current_year:
-                has_receipt_this_year = True
-                break
-
-        # Bu yıl makbuz yüklenmemişse listeye ekle
-        if not has_receipt_this_year:
-            members_without_receipts.append(member)
-
-    # Makbuz durumunu kontrol et ve status'ları güncelle
-    from app.services.db import check_member_receipt_status
-    for member in members:
-        member.status = check_member_receipt_status(member)
+    search_query = request.args.get('q', '').strip()
+    page_size = clamp_page_size(request.args.get('limit', type=int))
+
+    # Arama varsa yalnızca eşleşen üyeler, alaka sırasıyla getirilir
+    page = get_member_page('list', association_id, search=search_query or None,
+                           cursor=request.args.get('cursor'), limit=page_size)
+
+    # İstatistikler sayfadan bağımsız olarak tüm üyeler üzerinden SQL ile hesaplanır
+    stats = get_member_stats(association_id)
 
     return render_template('member_list.jinja2',
-                         members=members,
-                         members_without_receipts=members_without_receipts,
-                         current_year=current_year)
+                         members=page.rows,
+                         page=page,
+                         page_size=page_size,
+                         stats=stats,
+                         current_year=datetime.now().year,
+                         search_query=search_query)
+
+@bp.route('/search')
+def search():
+    """Dernek üyelerinde tam metin araması (JSON)"""
+    search_query = request.args.get('q', '').strip()
+    limit = min(request.args.get('limit', 20, type=int), 100)
+
+    rows = search_member_rows(search_query, 'list', session.get('user_id'), limit)
+    return jsonify({
+        'query': search_query,
+        'results': [dict(row._asdict(), gsm=row.gsm) for row in rows]
+    })
+
+def _member_validators(member_id: str, owned_only: bool = False):
+    """Üye sayfasının ETag'i; üye yoksa (veya `owned_only` ile oturumdaki derneğin değilse) None"""
+    validators = get_member_validators(member_id)
+    if not validators or (owned_only and validators['association'] != session.get('user_id')):
+        return None
+
+    return page_etag(request.path, validators['updated_at'], validators['receipt_count'], validators['data_version'])
 
 @bp.route('/<member_id>')
-@login_required
 def detail(member_id):
     """Üye detay sayfası"""
+    # Tarayıcıdaki sayfa güncelse üye ve makbuzlar hiç sorgulanmaz
+    etag = _member_validators(member_id)
+    if etag:
+        response = not_modified(etag)
+        if response:
+            return response
+
     member = get_member_by_id(member_id)
     if not member:
         flash('Üye bulunamadı', 'error')
@@ -329,10 +332,10 @@ def detail(member_id):
             'number': receipt_number
         })
 
-    return render_template('member_detail.jinja2', member=member, receipts=receipts_with_numbers)
+    page = render_template('member_detail.jinja2', member=member, receipts=receipts_with_numbers)
+    return with_validators(page, etag) if etag else page
 
 @bp.route('/<member_id>/receipt', methods=['POST'])
-@login_required
 def upload_receipt(member_id):
     """Üye için makbuz yükle"""
     member = get_member_by_id(member_id)
@@ -373,11 +376,10 @@ def upload_receipt(member_id):
     return redirect(url_for('members.detail', member_id=member_id))
 
 @bp.route('/<member_id>/approve', methods=['POST'])
-@login_required
 def approve_member(member_id):
     """Dernek tarafından üyeyi onayla ve İçişleri Bakanlığı sistemine kaydet"""
-    from app.services.db import get_member_by_id, update_member, get_association_by_id
-    from app.services.icisleri_submit_bot import IcisleriSubmitBot
+    from app.services.db import get_member_by_id, update_member
+    from app.services.approvals import submit_member_once, is_registration_completed
     from datetime import datetime
 
     # Üye kontrolü
@@ -389,7 +391,7 @@ def approve_member(member_id):
         return redirect(url_for('members.list'))
 
     # Dernek bilgilerini al
-    association = get_association_by_id(association_id)
+    association = association_cache.get_by_id(association_id)
     if not association:
         flash('Dernek bilgileri bulunamadı', 'error')
         return redirect(url_for('members.list'))
@@ -398,75 +400,50 @@ def approve_member(member_id):
     def progress_callback(message, progress):
         print(f"Progress: {progress}% - {message}")
 
-    # Config'den bilgileri al
-    try:
-        from config import ICISLERI_CONFIG
-    except ImportError:
-        flash('Konfigürasyon dosyası bulunamadı', 'error')
-        return redirect(url_for('members.list'))
+    # İçişleri Bakanlığı sistemine kaydet (aynı üye için tekrarlanan istekler tek gönderimi paylaşır)
+    result = submit_member_once(member, association, progress_callback)
 
-    # İçişleri Bakanlığı sistemine kaydet
-    bot = IcisleriSubmitBot(progress_callback=progress_callback)
-    try:
-        # Giriş yap
-        if not bot.login_to_icisleri(ICISLERI_CONFIG['username'], ICISLERI_CONFIG['password']):
-            flash('İçişleri Bakanlığı sistemine giriş yapılamadı', 'error')
-            return redirect(url_for('members.detail', member_id=member_id))
-
-        # Üyeyi sisteme kaydet
-        member_data = member.to_dict()
-        association_data = association.to_dict()
-
-        result = bot.submit_member_to_icisleri(member_data, association_data)
-
-        if result['success']:
-            # Mesaj türüne göre renklendirme ve status güncelleme
-            modal_message = result.get("message", "")
-
-            if "Yeni Kayıt Yapıldı" in modal_message:
-                # Sadece "Yeni Kayıt Yapıldı" mesajı geldiğinde status'u approved yap
-                member.status = 'approved'
-                member.approved_by = association.name
-                member.approved_at = str(int(datetime.now().timestamp()))
-                member.updated_at = str(int(datetime.now().timestamp()))
-
-                message_type = "success"
-                message_title = "✅ Başarılı"
-                success_message = f'{member.firstName} {member.lastName} başarıyla onaylandı ve İçişleri Bakanlığı sistemine kaydedildi.'
-            else:
-                # Diğer mesajlar geldiğinde status değişmesin, hala onay bekliyor
-                member.updated_at = str(int(datetime.now().timestamp()))
+    if result['success']:
+        # Mesaj türüne göre renklendirme ve status güncelleme
+        modal_message = result.get("message", "")
 
-                message_type = "warning"
-                message_title = "⚠️ Uyarı"
-                success_message = f'{member.firstName} {member.lastName} için İçişleri Bakanlığı sisteminden mesaj alındı: {modal_message}'
+        if is_registration_completed(result):
+            # Sadece "Yeni Kayıt Yapıldı" mesajı geldiğinde status'u approved yap
+            member.status = 'approved'
+            member.approved_by = association.name
+            member.approved_at = int(datetime.now().timestamp())
+            member.updated_at = int(datetime.now().timestamp())
 
-            if update_member(member):
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return jsonify({
-                        'success': True,
-                        'message': success_message,
-                        'modal_message': modal_message,
-                        'message_type': message_type,
-                        'message_title': message_title
-                    })
-                else:
-                    flash(success_message, message_type)
+            message_type = "success"
+            message_title = "✅ Başarılı"
+            success_message = f'{member.firstName} {member.lastName} başarıyla onaylandı ve İçişleri Bakanlığı sistemine kaydedildi.'
+        else:
+            # Diğer mesajlar geldiğinde status değişmesin, hala onay bekliyor
+            member.updated_at = int(datetime.now().timestamp())
+
+            message_type = "warning"
+            message_title = "⚠️ Uyarı"
+            success_message = f'{member.firstName} {member.lastName} için İçişleri Bakanlığı sisteminden mesaj alındı: {modal_message}'
+
+        if update_member(member):
+            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                return jsonify({
+                    'success': True,
+                    'message': success_message,
+                    'modal_message': modal_message,
+                    'message_type': message_type,
+                    'message_title': message_title
+                })
             else:
-                error_message = 'Üye onaylanırken hata oluştu'
-                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                    return jsonify({'success': False, 'message': error_message})
-                else:
-                    flash(error_message, 'error')
+                flash(success_message, message_type)
         else:
-            error_message = f'İçişleri Bakanlığı sistemine kayıt başarısız: {result["message"]}'
+            error_message = 'Üye onaylanırken hata oluştu'
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return jsonify({'success': False, 'message': error_message})
             else:
                 flash(error_message, 'error')
-
-    except Exception as e:
-        error_message = f'İçişleri Bakanlığı sistemi hatası: {str(e)}'
+    else:
+        error_message = f'İçişleri Bakanlığı sistemine kayıt başarısız: {result["message"]}'
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({'success': False, 'message': error_message})
         else:
@@ -474,102 +451,72 @@ def approve_member(member_id):
 
     return redirect(url_for('members.detail', member_id=member_id))
 
-@bp.route('/export/csv')
-@login_required
-def export_csv():
-    """Üyeleri CSV formatında dışa aktar"""
-    association_id = session.get('user_id')
-    members = get_members_by_association(association_id)
-
-    # DataFrame oluştur
-    data = []
-    for member in members:
-        data.append({
-            'Kimlik No': member.identityNumber,
-            'Ad': member.firstName,
-            'Soyad': member.lastName,
-            'İkinci Ad': member.middleName,
-            'Doğum Soyadı': member.birthSurname,
-            'Cinsiyet': member.gender,
-            'Doğum Yeri': member.birthPlace,
-            'Anne Adı': member.motherName,
-            'Doğum Tarihi': member.birthDate,
-            'Baba Adı': member.fatherName,
-            'İlçe': member.district,
-            'Mahalle': member.neighborhood,
-            'Cadde/Sokak': member.street,
-            'Bina': member.buildingNameOrNumber,
-            'Dış Kapı No': member.doorNumber,
-            'İç Kapı No': member.apartmentNumber,
-            'Telefon': member.phoneNumber,
-            'GSM': f"{member.gsm['countryCode']}{member.gsm['operatorCode']}{member.gsm['number']}",
-            'Üyelik Yılı': member.membershipYear
-        })
+@bp.route('/import', methods=['GET', 'POST'])
+def import_members():
+    """Excel/CSV dosyasından toplu üye içe aktarımı"""
+    result = None
+    if request.method == 'POST':
+        from app.services.member_import import import_members as run_import, MemberImportError
+
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Lütfen bir dosya seçin', 'error')
+            return render_template('member_import.jinja2', result=None)
+
+        try:
+            result = run_import(session.get('user_id'), upload.stream, upload.filename)
+        except MemberImportError as e:
+            flash(str(e), 'error')
+            return render_template('member_import.jinja2', result=None)
+
+        imported = result['inserted'] + result['updated']
+        if result['errors']:
+            flash(f"{imported} üye kaydedildi, {len(result['errors'])} satır hatalı olduğu için atlandı", 'warning')
+        else:
+            flash(f"{imported} üye kaydedildi", 'success')
 
-    df = pd.DataFrame(data)
+    return render_template('member_import.jinja2', result=result)
 
-    # CSV dosyası oluştur
-    output = io.StringIO()
-    df.to_csv(output, index=False, encoding='utf-8-sig')
-    output.seek(0)
+def _send_export(export_format: str, mimetype: str):
+    """Derneğin dışa aktarımını önbellekteki dosyadan gönder (veri değişmediyse 304 döner)"""
+    association_id = session.get('user_id')
 
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8-sig')),
-        mimetype='text/csv',
+    # Tarayıcıdaki kopya güncelse dosyaya hiç dokunmadan yanıt ver
+    etag = artifact_etag(association_id, export_format)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    # Dosya açık olarak gelir (silinse de gönderilebilir); boyut ve tarih açık dosyadan okunur
+    artifact, etag = get_export_artifact(association_id, export_format)
+    stat = os.fstat(artifact.fileno())
+    response = send_file(
+        artifact,
+        mimetype=mimetype,
         as_attachment=True,
-        download_name=f'uyeler_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        download_name=f'uyeler_{datetime.now().strftime("%Y%m%d_%H%M%S")}{ARTIFACT_EXTENSIONS[export_format]}',
+        etag=etag,
+        last_modified=stat.st_mtime,
+        conditional=False
     )
+    response.content_length = stat.st_size
+    response = response.make_conditional(request, accept_ranges=True, complete_length=stat.st_size)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@bp.route('/export/csv')
+def export_csv():
+    """Üyeleri CSV formatında dışa aktar"""
+    return _send_export('csv', 'text/csv')
 
 @bp.route('/export/excel')
-@login_required
 def export_excel():
     """Üyeleri Excel formatında dışa aktar"""
-    association_id = session.get('user_id')
-    members = get_members_by_association(association_id)
-
-    # DataFrame oluştur
-    data = []
-    for member in members:
-        data.append({
-            'Kimlik No': member.identityNumber,
-            'Ad': member.firstName,
-            'Soyad': member.lastName,
-            'İkinci Ad': member.middleName,
-            'Doğum Soyadı': member.birthSurname,
-            'Cinsiyet': member.gender,
-            'Doğum Yeri': member.birthPlace,
-            'Anne Adı': member.motherName,
-            'Doğum Tarihi': member.birthDate,
-            'Baba Adı': member.fatherName,
-            'İlçe': member.district,
-            'Mahalle': member.neighborhood,
-            'Cadde/Sokak': member.street,
-            'Bina': member.buildingNameOrNumber,
-            'Dış Kapı No': member.doorNumber,
-            'İç Kapı No': member.apartmentNumber,
-            'Telefon': member.phoneNumber,
-            'GSM': f"{member.gsm['countryCode']}{member.gsm['operatorCode']}{member.gsm['number']}",
-            'Üyelik Yılı': member.membershipYear
-        })
-
-    df = pd.DataFrame(data)
-
-    # Excel dosyası oluştur
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Üyeler')
-
-    output.seek(0)
-
-    return send_file(
-        output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name=f'uyeler_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    )
+    return _send_export('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
 
 @bp.route('/<member_id>/edit', methods=['GET', 'POST'])
-@login_required
 def edit(member_id):
     """Üye düzenleme"""
     association_id = session.get('user_id')
@@ -632,7 +579,7 @@ def edit(member_id):
             "number": gsm_number
         }
         member.membershipYear = membership_year
-        member.updated_at = str(int(datetime.now().timestamp()))
+        member.updated_at = int(datetime.now().timestamp())
 
         # Veritabanına kaydet
         if update_member(member):
@@ -644,7 +591,6 @@ def edit(member_id):
     return render_template('member_edit.jinja2', member=member, current_year=datetime.now().year)
 
 @bp.route('/<member_id>/delete', methods=['POST'])
-@login_required
 def delete(member_id):
     """Üye silme"""
     association_id = session.get('user_id')
@@ -662,10 +608,17 @@ def delete(member_id):
     return redirect(url_for('members.list'))
 
 @bp.route('/<member_id>/print')
-@login_required
 def print_member(member_id):
     """Üye yazdırma sayfası"""
     association_id = session.get('user_id')
+
+    # Sahiplik kontrol edilmeden 304 verilmez
+    etag = _member_validators(member_id, owned_only=True)
+    if etag:
+        response = not_modified(etag)
+        if response:
+            return response
+
     member = get_member_by_id(member_id)
 
     if not member or member.association != association_id:
@@ -673,10 +626,10 @@ def print_member(member_id):
         return redirect(url_for('members.list'))
 
     current_time = datetime.now().strftime('%d.%m.%Y %H:%M')
-    return render_template('member_print.jinja2', member=member, current_time=current_time)
+    page = render_template('member_print.jinja2', member=member, current_time=current_time)
+    return with_validators(page, etag) if etag else page
 
 @bp.route('/<member_id>/pdf')
-@login_required
 def pdf_member(member_id):
     """Üye PDF indirme"""
     association_id = session.get('user_id')
@@ -758,7 +711,6 @@ def pdf_member(member_id):
     )
 
 @bp.route('/<member_id>/receipts/<receipt_id>/delete', methods=['POST'])
-@login_required
 def delete_member_receipt(member_id, receipt_id):
     """Üye makbuzunu sil"""
     from app.services.db import get_receipt_by_id, delete_receipt as db_delete_receipt, get_member_by_id
@@ -0,0 +1,102 @@
+import time
+import threading
+import logging
+from concurrent.futures import TimeoutError
+from typing import Dict, Any, Optional, Callable
+from app.models import Member, Association
+from app.services.db import claim_member_submission, finish_member_submission, get_member_submission
+
+logger = logging.getLogger(__name__)
+
+# Başka bir worker'daki gönderimi bekleme ayarları (saniye)
+SUBMISSION_WAIT_TIMEOUT = 300
+SUBMISSION_POLL_INTERVAL = 1
+
+# Bu süreden eski "in_progress" kayıtları yarım kalmış kabul edilir (saniye)
+SUBMISSION_STALE_AFTER = 600
+
+class _InFlightSubmission:
+    """Aynı süreçte devam eden bir üye gönderimi"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def is_registration_completed(result: Dict[str, Any]) -> bool:
+    """İçişleri sonucu yeni kaydın yapıldığını gösteriyor mu"""
+    return bool(result.get('success')) and "Yeni Kayıt Yapıldı" in result.get('message', '')
+
+def submit_member_once(member: Member, association: Association,
+                       progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """Üyeyi İçişleri Bakanlığı sistemine bir kez gönder
+
+    Aynı üye için eşzamanlı gelen istekler yeni bir tarayıcı başlatmaz, devam eden
+    gönderimin sonucunu paylaşır. Başarıyla kaydedilmiş üyeler tekrar gönderilmez.
+    """
+    with _in_flight_lock:
+        entry = _in_flight.get(member.id)
+        is_owner = entry is None
+        if is_owner:
+            entry = _InFlightSubmission()
+            _in_flight[member.id] = entry
+
+    if not is_owner:
+        logger.info(f"🔁 {member.id} için devam eden gönderime bağlanılıyor")
+        if not entry.done.wait(SUBMISSION_WAIT_TIMEOUT):
+            return {"success": False, "message": "Devam eden gönderim zaman aşımına uğradı"}
+        return entry.result
+
+    try:
+        entry.result = _submit_with_idempotency_record(member, association, progress_callback)
+    except Exception as e:
+        entry.result = {"success": False, "message": f"İçişleri Bakanlığı sistemi hatası: {str(e)}"}
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(member.id, None)
+        entry.done.set()
+
+    return entry.result
+
+def _submit_with_idempotency_record(member: Member, association: Association,
+                                    progress_callback: Optional[Callable]) -> Dict[str, Any]:
+    """Veritabanındaki gönderim kaydını alıp gönderimi yap, diğer worker'ların kaydına saygı göster"""
+    existing = claim_member_submission(member.id, SUBMISSION_STALE_AFTER)
+    if existing:
+        if existing['status'] == 'succeeded':
+            logger.info(f"ℹ️ {member.id} daha önce İçişleri sistemine kaydedilmiş, tekrar gönderilmiyor")
+            return get_member_submission(member.id)['result']
+        return _wait_for_other_worker(member.id)
+
+    result = _run_submission(member, association, progress_callback)
+    if result.get('error_type') == 'timeout':
+        # Akış arka planda sürüyor olabilir; kayıt "in_progress" kalır ve SUBMISSION_STALE_AFTER sonra yeniden denenebilir
+        return result
+    finish_member_submission(member.id, 'succeeded' if is_registration_completed(result) else 'failed', result)
+    return result
+
+def _wait_for_other_worker(member_id: str) -> Dict[str, Any]:
+    """Başka bir süreçte devam eden gönderimin bitmesini bekle"""
+    logger.info(f"⏳ {member_id} için başka bir süreçteki gönderim bekleniyor")
+    deadline = time.monotonic() + SUBMISSION_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        submission = get_member_submission(member_id)
+        if submission and submission['status'] != 'in_progress':
+            return submission['result']
+        time.sleep(SUBMISSION_POLL_INTERVAL)
+    return {"success": False, "message": "Devam eden gönderim zaman aşımına uğradı"}
+
+def _run_submission(member: Member, association: Association,
+                    progress_callback: Optional[Callable]) -> Dict[str, Any]:
+    """Gönderimi async sürücünün izole tarayıcı bağlamında çalıştır ve sonucunu bekle"""
+    from app.services.icisleri_async import driver
+    from app.services.icisleri_submit_bot import submit_member_to_icisleri_async
+
+    try:
+        return driver.run(submit_member_to_icisleri_async(member.to_dict(), association.to_dict(), progress_callback))
+    except TimeoutError:
+        logger.error(f"❌ {member.id} gönderimi zaman aşımına uğradı")
+        return {"success": False, "message": "İçişleri Bakanlığı sistemi zamanında yanıt vermedi, kaydın durumu daha sonra kontrol edilmeli",
+                "error_type": "timeout"}
@@ -0,0 +1,88 @@
+import time
+import threading
+from typing import Dict, List, Optional
+from flask import current_app
+from app.models import Association
+from app.services.db import get_all_associations, get_cache_version
+
+# Veritabanındaki sürüm en fazla bu sıklıkla kontrol edilir (saniye)
+VERSION_CHECK_INTERVAL = 1.0
+
+
+class AssociationCache:
+    """Dernekler için süreç içi, okuma sırasında dolan önbellek
+
+    Dernekler id, kullanıcı adı ve governmentId ile O(1) bulunur. create_association ve dernek
+    içe aktarımı SQLite'taki 'associations' sürümünü artırır; her worker bu sürümü en fazla
+    VERSION_CHECK_INTERVAL saniyede bir kontrol edip değişmişse yeniden yükler. Girişler sürümü
+    artırmaz, bu yüzden kopyalardaki last_login güncel değildir (get_association_last_logins kullanılır).
+    """
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._database_path = None
+        self._version = None
+        self._checked_at = 0.0
+        self._associations: List[Association] = []
+        self._by_id: Dict[str, Association] = {}
+        self._by_username: Dict[str, Association] = {}
+        self._by_government_id: Dict[str, Association] = {}
+
+    def _load(self, version: int):
+        """Dernekleri veritabanından yükleyip indeksleri oluştur (kilit tutulurken çağrılır)"""
+        associations = get_all_associations()
+        self._associations = associations
+        self._by_id = {association.id: association for association in associations}
+        self._by_username = {association.username: association for association in associations}
+        self._by_government_id = {association.governmentId: association for association in associations}
+        self._version = version
+
+    def _ensure_fresh(self):
+        """Sürüm değiştiyse veya başka bir veritabanına geçildiyse önbelleği yenile"""
+        database_path = current_app.config['DATABASE_PATH']
+        now = time.monotonic()
+        if database_path == self._database_path and now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            if database_path == self._database_path and now - self._checked_at < self.check_interval:
+                return
+
+            version = get_cache_version('associations')
+            if database_path != self._database_path or version != self._version:
+                self._load(version)
+                self._database_path = database_path
+            self._checked_at = now
+
+    def invalidate(self):
+        """Bir sonraki erişimde yeniden yüklenmesini sağla"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+
+    def all(self) -> List[Association]:
+        """Tüm dernekler (veritabanı sırasıyla)"""
+        self._ensure_fresh()
+        return self._associations
+
+    def by_id(self) -> Dict[str, Association]:
+        """ID -> dernek sözlüğü"""
+        self._ensure_fresh()
+        return self._by_id
+
+    def get_by_id(self, association_id: str) -> Optional[Association]:
+        self._ensure_fresh()
+        return self._by_id.get(association_id)
+
+    def get_by_username(self, username: str) -> Optional[Association]:
+        self._ensure_fresh()
+        return self._by_username.get(username)
+
+    def get_by_government_id(self, government_id: str) -> Optional[Association]:
+        self._ensure_fresh()
+        return self._by_government_id.get(government_id)
+
+
+# Tüm istekler tarafından paylaşılan önbellek
+association_cache = AssociationCache()
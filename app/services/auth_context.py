@@ -0,0 +1,161 @@
+import time
+import threading
+from typing import Dict, Any, Optional, Tuple
+from flask import g, session, current_app, request, flash, redirect, url_for
+from app.models import AdminUser
+from app.services.db import get_admin_user_by_username
+from app.services.jwt_service import get_user_from_token
+
+MANAGER_ROLE = "Yönetici"
+
+# Kullanıcı adı -> (yüklenme zamanı, admin kullanıcısı)
+_admin_users: Dict[str, Tuple[float, Optional[AdminUser]]] = {}
+_admin_users_lock = threading.Lock()
+
+def get_current_user() -> Optional[Dict[str, Any]]:
+    """Oturumdaki token'ı istek başına bir kez doğrula ve kimliği flask.g üzerinde sakla"""
+    if 'current_user' not in g:
+        token = session.get('token')
+        g.current_user = get_user_from_token(token) if token else None
+    return g.current_user
+
+def get_cached_admin_user(username: str) -> Optional[AdminUser]:
+    """Admin kullanıcısını kısa süreli önbellekten al, süresi dolmuşsa veritabanından yükle"""
+    now = time.monotonic()
+    with _admin_users_lock:
+        entry = _admin_users.get(username)
+    if entry and now - entry[0] < current_app.config['ADMIN_USER_CACHE_TTL']:
+        return entry[1]
+
+    admin_user = get_admin_user_by_username(username)
+    with _admin_users_lock:
+        _admin_users[username] = (now, admin_user)
+    return admin_user
+
+def invalidate_admin_user(username: Optional[str] = None):
+    """Admin kullanıcı önbelleğini temizle (username verilmezse tamamını)"""
+    with _admin_users_lock:
+        if username is None:
+            _admin_users.clear()
+        else:
+            _admin_users.pop(username, None)
+
+def get_current_admin_user() -> Optional[AdminUser]:
+    """Oturumdaki admin kullanıcısı (istek başına bir kez çözülür)"""
+    if 'current_admin_user' not in g:
+        user_data = get_current_user()
+        if user_data and user_data['user_type'] == 'admin':
+            g.current_admin_user = get_cached_admin_user(user_data['username'])
+        else:
+            g.current_admin_user = None
+    return g.current_admin_user
+
+def is_manager(user_data: Optional[Dict[str, Any]]) -> bool:
+    """Kullanıcı Yönetici rolünde mi (rol token'da yoksa önbellekteki admin kullanıcısına bakılır)"""
+    if not user_data or user_data['user_type'] != 'admin':
+        return False
+    if user_data.get('role'):
+        return user_data['role'] == MANAGER_ROLE
+
+    admin_user = get_current_admin_user()
+    return bool(admin_user) and admin_user.role == MANAGER_ROLE
+
+# Blueprint -> varsayılan politika (listede olmayan blueprint'ler herkese açıktır)
+BLUEPRINT_POLICIES = {
+    'dashboard': 'association',
+    'members': 'authenticated',
+    'admin': 'admin',
+}
+
+# Politika -> (kimlik kontrolü, yetkisizlikte gösterilecek mesaj, yönlendirilecek endpoint)
+POLICIES = {
+    'authenticated': (lambda user_data: user_data is not None,
+                      'Geçersiz oturum', 'auth.login'),
+    'association': (lambda user_data: user_data is not None and user_data['user_type'] == 'association',
+                    'Bu sayfaya erişim yetkiniz yok', 'auth.login'),
+    'admin': (lambda user_data: user_data is not None and user_data['user_type'] == 'admin',
+              'Bu sayfaya erişim yetkiniz yok', 'auth.login'),
+}
+
+# Blueprint -> yetkilendirme adımı süre istatistikleri
+_auth_metrics: Dict[str, Dict[str, float]] = {}
+_auth_metrics_lock = threading.Lock()
+
+def requires_policy(policy: str):
+    """View için blueprint politikasının yerine geçecek politikayı belirle"""
+    def decorator(f):
+        f.auth_policy = policy
+        return f
+    return decorator
+
+def _resolve_policy() -> Optional[str]:
+    """İstenen endpoint için geçerli politika"""
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'auth_policy', BLUEPRINT_POLICIES.get(request.blueprint))
+
+def _check_policy(policy: str):
+    """Politikayı uygula; yetki yoksa yönlendirme yanıtı döndür"""
+    if 'token' not in session:
+        flash('Lütfen önce giriş yapın', 'error')
+        return redirect(url_for('auth.login'))
+
+    user_data = get_current_user()
+
+    if policy == 'manager':
+        check, message, endpoint = POLICIES['admin']
+        if not check(user_data):
+            flash(message, 'error')
+            return redirect(url_for(endpoint))
+        if not is_manager(user_data):
+            flash('Bu işlem için Yönetici yetkisi gereklidir', 'error')
+            return redirect(url_for('admin.dashboard'))
+        return None
+
+    check, message, endpoint = POLICIES[policy]
+    if not check(user_data):
+        flash(message, 'error')
+        return redirect(url_for(endpoint))
+    return None
+
+def _record_auth_metric(blueprint: str, duration: float, denied: bool):
+    """Yetkilendirme süresini blueprint istatistiğine ekle"""
+    with _auth_metrics_lock:
+        metric = _auth_metrics.setdefault(blueprint, {'requests': 0, 'denied': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        metric['requests'] += 1
+        metric['denied'] += int(denied)
+        metric['total_ms'] += duration * 1000
+        metric['max_ms'] = max(metric['max_ms'], duration * 1000)
+
+def authorize_request():
+    """before_request: kimliği bir kez çöz ve blueprint/endpoint politikasını uygula"""
+    policy = _resolve_policy()
+    if policy is None:
+        return None
+
+    started = time.perf_counter()
+    response = _check_policy(policy)
+    duration = time.perf_counter() - started
+
+    g.auth_duration = duration
+    _record_auth_metric(request.blueprint or 'app', duration, response is not None)
+    return response
+
+def add_auth_timing_header(response):
+    """after_request: yetkilendirme süresini Server-Timing başlığıyla bildir"""
+    duration = g.get('auth_duration')
+    if duration is not None:
+        response.headers.add('Server-Timing', f'auth;dur={duration * 1000:.3f}')
+    return response
+
+def get_auth_metrics() -> Dict[str, Dict[str, float]]:
+    """Blueprint başına yetkilendirme adımı istatistikleri (ortalama dahil)"""
+    with _auth_metrics_lock:
+        metrics = {blueprint: dict(metric) for blueprint, metric in _auth_metrics.items()}
+    for metric in metrics.values():
+        metric['avg_ms'] = metric['total_ms'] / metric['requests'] if metric['requests'] else 0.0
+    return metrics
+
+def init_auth(app):
+    """Yetkilendirme adımını uygulamaya bağla"""
+    app.before_request(authorize_request)
+    app.after_request(add_auth_timing_header)
@@ -0,0 +1,51 @@
+import os
+import hashlib
+import threading
+from typing import Optional
+from flask import current_app, request, session, Response
+from werkzeug.http import is_resource_modified
+
+# Şablon dosyalarının damgası (süreç başına bir kez hesaplanır); yeni sürümde ETag'ler değişir
+_templates_stamp: Optional[str] = None
+_templates_stamp_lock = threading.Lock()
+
+def _get_templates_stamp() -> str:
+    """Şablon dizinindeki en yeni değişiklik zamanı"""
+    global _templates_stamp
+    if _templates_stamp is None:
+        with _templates_stamp_lock:
+            if _templates_stamp is None:
+                template_dir = os.path.join(current_app.root_path, 'templates')
+                _templates_stamp = str(max((entry.stat().st_mtime_ns for entry in os.scandir(template_dir)), default=0))
+    return _templates_stamp
+
+def page_etag(*parts) -> str:
+    """Sayfa verisinin sürüm parçalarından ETag üret
+
+    Layout oturumdaki kullanıcıya göre değiştiği için oturum token'ı da ETag'e girer.
+    """
+    key = ':'.join([_get_templates_stamp(), session.get('token') or ''] + [str(part) for part in parts])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def _set_validators(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    # Tarayıcı kopyasını kullanmadan önce her seferinde sunucuya sorar
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def not_modified(etag: str) -> Optional[Response]:
+    """İstemcinin kopyası güncelse şablon işlenmeden döndürülecek 304 yanıtı, değilse None
+
+    Yalnızca ETag kullanılır: silme gibi değişiklikler hiçbir zaman damgasını ilerletmediği için
+    Last-Modified gönderilmez, If-Modified-Since ile gelen istekler her zaman sayfayı alır.
+    """
+    # Bekleyen flash mesajı sayfada gösterilmeli; 304 ile kaybolmasın
+    if '_flashes' in session:
+        return None
+    if is_resource_modified(request.environ, etag=etag):
+        return None
+    return _set_validators(current_app.response_class(status=304), etag)
+
+def with_validators(body, etag: str) -> Response:
+    """İşlenmiş sayfaya ETag ve Cache-Control başlıklarını ekle"""
+    return _set_validators(current_app.make_response(body), etag)
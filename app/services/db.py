@@ -1,10 +1,42 @@
 import sqlite3
 import json
 import os
-from typing import List, Dict, Any, Optional
+import re
+import base64
+from collections import namedtuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from flask import current_app
 from app.models import User, Association, Member, Receipt, AdminUser
 
+# Model.from_row satırları sütun sırasıyla eşlediği için sorgular bu listelerle yapılır
+USER_COLUMNS = ', '.join(User.COLUMNS)
+ADMIN_USER_COLUMNS = ', '.join(AdminUser.COLUMNS)
+ASSOCIATION_COLUMNS = ', '.join(Association.COLUMNS)
+MEMBER_COLUMNS = ', '.join(Member.COLUMNS)
+RECEIPT_COLUMNS = ', '.join(Receipt.COLUMNS)
+
+# Liste sayfaları ve dışa aktarımlar için üye sütun projeksiyonları
+MEMBER_PROJECTIONS = {
+    'list': ('id', 'identityNumber', 'nationality', 'firstName', 'middleName', 'lastName',
+             'phoneNumber', 'gsm', 'association', 'membershipYear', 'status', 'created_at'),
+    'export': ('identityNumber', 'firstName', 'lastName', 'middleName', 'birthSurname', 'gender',
+               'birthPlace', 'motherName', 'birthDate', 'fatherName', 'district', 'neighborhood',
+               'street', 'buildingNameOrNumber', 'doorNumber', 'apartmentNumber', 'phoneNumber',
+               'gsm', 'membershipYear'),
+}
+
+# Dışa aktarım filtreleri: filtre adı -> üye sütunu ('status' arayüzdeki gibi hesaplanan durumla eşlenir)
+MEMBER_FILTER_COLUMNS = {
+    'status': 'status',
+    'year': 'membershipYear',
+    'district': 'district',
+}
+
+# Projeksiyonlarda 'gsm' bu sütunlara açılır ve satırda sözlük görünümü olarak sunulur
+GSM_COLUMNS = ('gsmCountryCode', 'gsmOperatorCode', 'gsmNumber')
+
+_member_row_types = {}
+
 def get_db_connection():
     """Veritabanı bağlantısı oluştur"""
     conn = sqlite3.connect(current_app.config['DATABASE_PATH'])
@@ -22,7 +54,7 @@ def init_db():
             username TEXT UNIQUE NOT NULL,
             password TEXT NOT NULL,
             role TEXT NOT NULL,
-            lastLoginDate TEXT NOT NULL
+            lastLoginDate INTEGER
         )
     ''')
 
@@ -36,8 +68,8 @@ def init_db():
             role TEXT NOT NULL,
             email TEXT,
             is_active BOOLEAN NOT NULL DEFAULT 1,
-            created_at TEXT NOT NULL,
-            last_login TEXT NOT NULL
+            created_at INTEGER,
+            last_login INTEGER
         )
     ''')
 
@@ -49,7 +81,7 @@ def init_db():
             name TEXT NOT NULL,
             username TEXT UNIQUE NOT NULL,
             password TEXT NOT NULL,
-            last_login TEXT NOT NULL,
+            last_login INTEGER,
             typeCode TEXT,
             typeCodeDescription TEXT,
             subTypeCode TEXT,
@@ -81,14 +113,16 @@ def init_db():
             doorNumber TEXT,
             apartmentNumber TEXT,
             phoneNumber TEXT,
-            gsm TEXT,
+            gsmCountryCode TEXT,
+            gsmOperatorCode TEXT,
+            gsmNumber TEXT,
             association TEXT NOT NULL,
             membershipYear TEXT NOT NULL,
             status TEXT DEFAULT 'pending',
-            created_at TEXT,
-            updated_at TEXT,
+            created_at INTEGER,
+            updated_at INTEGER,
             approved_by TEXT,
-            approved_at TEXT,
+            approved_at INTEGER,
             rejection_reason TEXT,
             FOREIGN KEY (association) REFERENCES associations (id)
         )
@@ -101,12 +135,48 @@ def init_db():
             memberId TEXT NOT NULL,
             associationId TEXT NOT NULL,
             uploadPath TEXT NOT NULL,
-            uploadDate TEXT NOT NULL,
+            uploadDate INTEGER NOT NULL,
             FOREIGN KEY (memberId) REFERENCES members (id),
             FOREIGN KEY (associationId) REFERENCES associations (id)
         )
     ''')
 
+    # Üye gönderim (idempotency) tablosu - aynı üyenin İçişleri'ne iki kez gönderilmesini engeller
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS member_submissions (
+            member_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            result TEXT,
+            started_at TEXT NOT NULL,
+            finished_at TEXT
+        )
+    ''')
+
+    # Önbellek sürüm tablosu - bir kayıt grubu değiştiğinde tüm worker'ların önbelleğini geçersiz kılar
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+
+    # Dışa aktarım işleri tablosu - arka planda hazırlanan federasyon dışa aktarımları
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS export_jobs (
+            id TEXT PRIMARY KEY,
+            format TEXT NOT NULL,
+            filters TEXT,
+            status TEXT NOT NULL,
+            row_count INTEGER,
+            file_name TEXT,
+            error TEXT,
+            created_by TEXT,
+            created_at INTEGER NOT NULL,
+            finished_at INTEGER,
+            owner_pid INTEGER
+        )
+    ''')
+
     # Varsayılan admin kullanıcısı oluştur
     try:
         admin_user = User("admin", "admin123", "admin")
@@ -127,6 +197,14 @@ def init_db():
     # Mevcut members tablosuna eksik sütunları ekle
     add_missing_columns_to_members()
 
+    # Şema geçişlerini uygula
+    from app.services.migrations import run_migrations, ensure_member_search_index
+    conn = get_db_connection()
+    run_migrations(conn)
+    # FTS satırları members rowid'ine bağlı; rowid'ler değiştiyse arama yanlış üyeleri döndürmesin
+    ensure_member_search_index(conn)
+    conn.close()
+
 def add_missing_columns_to_members():
     """Mevcut members tablosuna eksik sütunları ekle"""
     try:
@@ -135,10 +213,10 @@ def add_missing_columns_to_members():
         # Sütunların var olup olmadığını kontrol et ve ekle
         columns_to_add = [
             ('status', 'TEXT DEFAULT "pending"'),
-            ('created_at', 'TEXT'),
-            ('updated_at', 'TEXT'),
+            ('created_at', 'INTEGER'),
+            ('updated_at', 'INTEGER'),
             ('approved_by', 'TEXT'),
-            ('approved_at', 'TEXT'),
+            ('approved_at', 'INTEGER'),
             ('rejection_reason', 'TEXT')
         ]
 
@@ -157,96 +235,144 @@ def add_missing_columns_to_members():
     except Exception as e:
         print(f"Error in add_missing_columns_to_members: {e}")
 
+# Önbellek sürümü işlemleri
+def bump_cache_version(name: str, conn: Optional[sqlite3.Connection] = None):
+    """Önbellek sürümünü artır. Bağlantı verilirse aynı transaction içinde yazılır (commit çağırana aittir)"""
+    own_connection = conn is None
+    if own_connection:
+        conn = get_db_connection()
+    conn.execute('''
+        INSERT INTO cache_versions (name, version) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1
+    ''', (name,))
+    if own_connection:
+        conn.commit()
+        conn.close()
+
+def get_members_version(association_id: str) -> int:
+    """Derneğin üye sürüm sayacı (üye eklenince/güncellenince/silinince trigger'larla artar)"""
+    return get_cache_version(f'members:{association_id}')
+
+def get_data_version(association_id: Optional[str] = None) -> int:
+    """Derneğin (verilmezse tüm derneklerin) üye ve makbuz sayaçlarının toplamı
+
+    Sayaçlar yalnızca artar; toplam, kapsanan üye/makbuzlardan biri değiştiğinde değişir.
+    Şablon parçası önbelleği anahtarlarında kullanılır.
+    """
+    conn = get_db_connection()
+    if association_id is None:
+        row = conn.execute('''
+            SELECT COALESCE(SUM(version), 0) FROM cache_versions
+            WHERE name LIKE 'members:%' OR name LIKE 'receipts:%'
+        ''').fetchone()
+    else:
+        row = conn.execute('SELECT COALESCE(SUM(version), 0) FROM cache_versions WHERE name IN (?, ?)',
+                           (f'members:{association_id}', f'receipts:{association_id}')).fetchone()
+    conn.close()
+    return row[0]
+
+def get_cache_version(name: str) -> int:
+    """Önbellek sürümünü getir (hiç artırılmadıysa 0)"""
+    conn = get_db_connection()
+    row = conn.execute('SELECT version FROM cache_versions WHERE name = ?', (name,)).fetchone()
+    conn.close()
+    return row['version'] if row else 0
+
+# Son giriş zamanı işlemleri
+# Tablo -> son giriş zamanı sütunu
+LOGIN_TIMESTAMP_COLUMNS = {
+    'users': 'lastLoginDate',
+    'admin_users': 'last_login',
+    'associations': 'last_login',
+}
+
+def write_login_timestamps(logins: Dict[str, List[Tuple[int, str]]]):
+    """Biriken son giriş zamanlarını (tablo -> [(zaman, id)]) tek transaction'da yaz"""
+    conn = get_db_connection()
+    try:
+        for table, rows in logins.items():
+            if rows:
+                conn.executemany(
+                    f'UPDATE {table} SET {LOGIN_TIMESTAMP_COLUMNS[table]} = ? WHERE id = ?',
+                    rows
+                )
+        # Dernek önbelleği burada yenilenmez; son giriş zamanı get_association_last_logins ile ayrıca okunur
+        conn.commit()
+    finally:
+        conn.close()
+
 # User işlemleri
 def create_user(user: User) -> bool:
     """Yeni kullanıcı oluştur"""
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         conn.execute(
             'INSERT INTO users (id, username, password, role, lastLoginDate) VALUES (?, ?, ?, ?, ?)',
             (user.id, user.username, user.password, user.role, user.lastLoginDate)
         )
         conn.commit()
-        conn.close()
         return True
     except Exception as e:
         print(f"User creation error: {e}")
         return False
+    finally:
+        # Başarısız INSERT açık transaction bırakıp veritabanını kilitlememeli
+        conn.close()
 
 def get_user_by_username(username: str) -> Optional[User]:
     """Kullanıcı adına göre kullanıcı getir"""
     conn = get_db_connection()
-    user_data = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
+    user_data = conn.execute(f'SELECT {USER_COLUMNS} FROM users WHERE username = ?', (username,)).fetchone()
     conn.close()
 
     if user_data:
-        return User.from_dict(dict(user_data))
+        return User.from_row(user_data)
     return None
 
-def update_user_login(user_id: str):
-    """Kullanıcının son giriş tarihini güncelle"""
-    from datetime import datetime
-    conn = get_db_connection()
-    conn.execute(
-        'UPDATE users SET lastLoginDate = ? WHERE id = ?',
-        (str(int(datetime.now().timestamp())), user_id)
-    )
-    conn.commit()
-    conn.close()
-
 # AdminUser işlemleri
 def create_admin_user(admin_user: AdminUser) -> bool:
     """Yeni yönetici kullanıcısı oluştur"""
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         conn.execute(
             'INSERT INTO admin_users (id, username, password, full_name, role, email, is_active, created_at, last_login) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
             (admin_user.id, admin_user.username, admin_user.password, admin_user.full_name, admin_user.role, admin_user.email, admin_user.is_active, admin_user.created_at, admin_user.last_login)
         )
         conn.commit()
-        conn.close()
         return True
     except Exception as e:
         print(f"Admin user creation error: {e}")
         return False
+    finally:
+        # Başarısız INSERT açık transaction bırakıp veritabanını kilitlememeli
+        conn.close()
 
 def get_admin_user_by_username(username: str) -> Optional[AdminUser]:
     """Kullanıcı adına göre yönetici kullanıcısı getir"""
     conn = get_db_connection()
-    admin_data = conn.execute('SELECT * FROM admin_users WHERE username = ?', (username,)).fetchone()
+    admin_data = conn.execute(f'SELECT {ADMIN_USER_COLUMNS} FROM admin_users WHERE username = ?', (username,)).fetchone()
     conn.close()
 
     if admin_data:
-        return AdminUser.from_dict(dict(admin_data))
+        return AdminUser.from_row(admin_data)
     return None
 
-def update_admin_user_login(admin_user_id: str):
-    """Yönetici kullanıcının son giriş tarihini güncelle"""
-    from datetime import datetime
-    conn = get_db_connection()
-    conn.execute(
-        'UPDATE admin_users SET last_login = ? WHERE id = ?',
-        (str(int(datetime.now().timestamp())), admin_user_id)
-    )
-    conn.commit()
-    conn.close()
-
 def get_all_admin_users() -> List[AdminUser]:
     """Tüm yönetici kullanıcıları getir"""
     conn = get_db_connection()
-    admin_users_data = conn.execute('SELECT * FROM admin_users ORDER BY created_at DESC').fetchall()
+    admin_users_data = conn.execute(f'SELECT {ADMIN_USER_COLUMNS} FROM admin_users ORDER BY created_at DESC').fetchall()
     conn.close()
 
-    return [AdminUser.from_dict(dict(user_data)) for user_data in admin_users_data]
+    return [AdminUser.from_row(user_data) for user_data in admin_users_data]
 
 def get_admin_user_by_id(admin_user_id: str) -> Optional[AdminUser]:
     """ID'ye göre yönetici kullanıcısı getir"""
     conn = get_db_connection()
-    admin_data = conn.execute('SELECT * FROM admin_users WHERE id = ?', (admin_user_id,)).fetchone()
+    admin_data = conn.execute(f'SELECT {ADMIN_USER_COLUMNS} FROM admin_users WHERE id = ?', (admin_user_id,)).fetchone()
     conn.close()
 
     if admin_data:
-        return AdminUser.from_dict(dict(admin_data))
+        return AdminUser.from_row(admin_data)
     return None
 
 def update_admin_user(admin_user: AdminUser) -> bool:
@@ -295,6 +421,7 @@ def create_association(association: Association) -> bool:
             association.typeCodeDescription, association.subTypeCode, association.subTypeCodeDescription,
             association.oldLegalEntityNumber, association.newLegalEntityNumber
         ))
+        bump_cache_version('associations', conn)
         conn.commit()
         conn.close()
         return True
@@ -305,42 +432,39 @@ def create_association(association: Association) -> bool:
 def get_association_by_username(username: str) -> Optional[Association]:
     """Kullanıcı adına göre dernek getir"""
     conn = get_db_connection()
-    assoc_data = conn.execute('SELECT * FROM associations WHERE username = ?', (username,)).fetchone()
+    assoc_data = conn.execute(f'SELECT {ASSOCIATION_COLUMNS} FROM associations WHERE username = ?', (username,)).fetchone()
     conn.close()
 
     if assoc_data:
-        return Association.from_dict(dict(assoc_data))
+        return Association.from_row(assoc_data)
     return None
 
 def get_association_by_id(association_id: str) -> Optional[Association]:
     """ID'ye göre dernek getir"""
     conn = get_db_connection()
-    assoc_data = conn.execute('SELECT * FROM associations WHERE id = ?', (association_id,)).fetchone()
+    assoc_data = conn.execute(f'SELECT {ASSOCIATION_COLUMNS} FROM associations WHERE id = ?', (association_id,)).fetchone()
     conn.close()
 
     if assoc_data:
-        return Association.from_dict(dict(assoc_data))
+        return Association.from_row(assoc_data)
     return None
 
-def get_all_associations() -> List[Association]:
-    """Tüm dernekleri getir"""
+def get_association_last_logins() -> Dict[str, Optional[int]]:
+    """Derneklerin son giriş zamanları (dernek ID -> zaman); önbellekteki dernek kopyaları bunu güncel tutmaz"""
     conn = get_db_connection()
-    assoc_data = conn.execute('SELECT * FROM associations').fetchall()
+    rows = conn.execute('SELECT id, last_login FROM associations').fetchall()
     conn.close()
 
-    return [Association.from_dict(dict(row)) for row in assoc_data]
+    return {row['id']: row['last_login'] for row in rows}
 
-def update_association_login(association_id: str):
-    """Derneğin son giriş tarihini güncelle"""
-    from datetime import datetime
+def get_all_associations() -> List[Association]:
+    """Tüm dernekleri getir"""
     conn = get_db_connection()
-    conn.execute(
-        'UPDATE associations SET last_login = ? WHERE id = ?',
-        (str(int(datetime.now().timestamp())), association_id)
-    )
-    conn.commit()
+    assoc_data = conn.execute(f'SELECT {ASSOCIATION_COLUMNS} FROM associations').fetchall()
     conn.close()
 
+    return [Association.from_row(row) for row in assoc_data]
+
 # Member işlemleri
 def create_member(member: Member) -> bool:
     """Yeni üye oluştur"""
@@ -350,15 +474,17 @@ def create_member(member: Member) -> bool:
             INSERT INTO members
             (id, identityNumber, nationality, firstName, lastName, middleName, birthSurname,
              gender, birthPlace, motherName, birthDate, fatherName, district, neighborhood,
-             street, buildingNameOrNumber, doorNumber, apartmentNumber, phoneNumber, gsm,
+             street, buildingNameOrNumber, doorNumber, apartmentNumber, phoneNumber,
+             gsmCountryCode, gsmOperatorCode, gsmNumber,
              association, membershipYear, status, created_at, updated_at, approved_by, approved_at, rejection_reason)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             member.id, member.identityNumber, member.nationality, member.firstName,
             member.lastName, member.middleName, member.birthSurname, member.gender,
             member.birthPlace, member.motherName, member.birthDate, member.fatherName,
             member.district, member.neighborhood, member.street, member.buildingNameOrNumber,
-            member.doorNumber, member.apartmentNumber, member.phoneNumber, json.dumps(member.gsm),
+            member.doorNumber, member.apartmentNumber, member.phoneNumber,
+            member.gsmCountryCode, member.gsmOperatorCode, member.gsmNumber,
             member.association, member.membershipYear, member.status, member.created_at,
             member.updated_at, member.approved_by, member.approved_at, member.rejection_reason
         ))
@@ -369,43 +495,251 @@ def create_member(member: Member) -> bool:
         print(f"Member creation error: {e}")
         return False
 
+# Toplu içe aktarımda yazılan üye sütunları (kimlik numarası dernekle birlikte çakışma anahtarıdır)
+MEMBER_IMPORT_COLUMNS = ('identityNumber', 'nationality', 'firstName', 'lastName', 'middleName',
+                         'birthSurname', 'gender', 'birthPlace', 'motherName', 'birthDate', 'fatherName',
+                         'district', 'neighborhood', 'street', 'buildingNameOrNumber', 'doorNumber',
+                         'apartmentNumber', 'phoneNumber', 'gsmCountryCode', 'gsmOperatorCode', 'gsmNumber',
+                         'membershipYear')
+
+def upsert_members(association_id: str, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Derneğin üyelerini (identityNumber, association) anahtarıyla tek transaction'da ekle/güncelle
+
+    Bilgileri değişen mevcut üyeler tekrar onaya düşer (status='pending'), değişmeyenlere
+    dokunulmaz. (eklenen, güncellenen) sayılarını döndürür.
+    """
+    from datetime import datetime
+    import uuid
+    if not rows:
+        return 0, 0
+
+    now = int(datetime.now().timestamp())
+    data_columns = MEMBER_IMPORT_COLUMNS[1:]
+    insert_columns = ('id', 'association') + MEMBER_IMPORT_COLUMNS + ('status', 'created_at', 'updated_at')
+    updates = ', '.join(f'{column} = excluded.{column}' for column in data_columns)
+    current = ', '.join(f'members.{column}' for column in data_columns)
+    incoming = ', '.join(f'excluded.{column}' for column in data_columns)
+
+    conn = get_db_connection()
+    try:
+        # Eklenen/güncellenen ayrımı için derneğin mevcut kimlik numaraları
+        existing = {row[0] for row in conn.execute(
+            'SELECT identityNumber FROM members WHERE association = ?', (association_id,)
+        ).fetchall()}
+
+        cursor = conn.executemany(f'''
+            INSERT INTO members ({', '.join(insert_columns)})
+            VALUES ({', '.join('?' for _ in insert_columns)})
+            ON CONFLICT (identityNumber, association) DO UPDATE SET
+                {updates}, status = 'pending', updated_at = excluded.updated_at
+            WHERE ({current}) IS NOT ({incoming})
+        ''', [
+            (str(uuid.uuid4()), association_id) + tuple(row[column] for column in MEMBER_IMPORT_COLUMNS)
+            + ('pending', now, now)
+            for row in rows
+        ])
+        conn.commit()
+
+        inserted = sum(1 for row in rows if row['identityNumber'] not in existing)
+        return inserted, cursor.rowcount - inserted
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def get_members_by_association(association_id: str) -> List[Member]:
     """Derneğe ait üyeleri getir"""
     conn = get_db_connection()
-    member_data = conn.execute('SELECT * FROM members WHERE association = ?', (association_id,)).fetchall()
+    member_data = conn.execute(f'SELECT {MEMBER_COLUMNS} FROM members WHERE association = ?', (association_id,)).fetchall()
+    conn.close()
+
+    return [Member.from_row(row) for row in member_data]
+
+def _gsm_view(self) -> Dict[str, str]:
+    """Satırın GSM sütunlarını Member.gsm ile aynı sözlük biçiminde döndür"""
+    return {"countryCode": self.gsmCountryCode, "operatorCode": self.gsmOperatorCode, "number": self.gsmNumber}
+
+def _member_row_type(columns: tuple):
+    """Projeksiyon için namedtuple tipini döndür (her sütun seti için bir kez oluşturulur)"""
+    row_type = _member_row_types.get(columns)
+    if row_type is None:
+        row_type = namedtuple('MemberRow', columns)
+        if all(column in columns for column in GSM_COLUMNS):
+            row_type = type('MemberRow', (row_type,), {'__slots__': (), 'gsm': property(_gsm_view)})
+        _member_row_types[columns] = row_type
+    return row_type
+
+def _projection_columns(projection) -> tuple:
+    """Projeksiyon adını/demetini doğrulanmış sütun listesine çevir ('gsm' GSM sütunlarına açılır)"""
+    columns = []
+    for column in MEMBER_PROJECTIONS.get(projection, projection):
+        columns.extend(GSM_COLUMNS if column == 'gsm' else (column,))
+    columns = tuple(dict.fromkeys(columns))
+
+    unknown = [column for column in columns if column not in Member.COLUMNS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen üye sütunları: {', '.join(unknown)}")
+    return columns
+
+def get_member_rows(projection='list', association_id: Optional[str] = None) -> List[tuple]:
+    """Üyeleri yalnızca istenen sütunlarla hafif namedtuple olarak getir
+
+    `projection` MEMBER_PROJECTIONS içindeki bir ad veya sütun adlarından oluşan bir demettir.
+    'gsm' istenirse GSM sütunları seçilir ve satırda `gsm` sözlük görünümü olur.
+    """
+    columns = _projection_columns(projection)
+    query = f"SELECT {', '.join(columns)} FROM members"
+    params = ()
+    if association_id is not None:
+        query += ' WHERE association = ?'
+        params = (association_id,)
+
+    conn = get_db_connection()
+    conn.row_factory = None
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    row_type = _member_row_type(columns)
+    return [row_type._make(row) for row in rows]
+
+def iter_member_rows(projection='export', association_id: Optional[str] = None,
+                     batch_size: int = 500, filters: Optional[Dict[str, str]] = None) -> Iterator[tuple]:
+    """Üyeleri cursor'dan parça parça okuyarak üret (tüm sonuç belleğe alınmaz)
+
+    `filters` MEMBER_FILTER_COLUMNS anahtarlarıyla eşitlik filtresidir (ör. {'status': 'approved'}).
+    """
+    from datetime import datetime
+    columns = _projection_columns(projection)
+    conditions = []
+    params = []
+    if association_id is not None:
+        conditions.append('m.association = ?')
+        params.append(association_id)
+    for name, value in (filters or {}).items():
+        if name == 'status':
+            # Listelerde görünen durumla aynı sonucu vermesi için makbuz durumu hesaba katılır
+            current_year = str(datetime.now().year)
+            conditions.append(f'{_effective_status_sql()} = ?')
+            params.extend([current_year, current_year, value])
+        else:
+            conditions.append(f'm.{MEMBER_FILTER_COLUMNS[name]} = ?')
+            params.append(value)
+
+    query = f"SELECT {', '.join(f'm.{column}' for column in columns)} FROM members m"
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+
+    row_type = _member_row_type(columns)
+    conn = get_db_connection()
+    conn.row_factory = None
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row_type._make(row)
+    finally:
+        conn.close()
+
+def get_member_rows_by_ids(member_ids, projection='list') -> Dict[str, tuple]:
+    """Verilen ID'lerdeki üyeleri projeksiyon satırı olarak getir (ID -> satır)"""
+    member_ids = list(dict.fromkeys(member_ids))
+    if not member_ids:
+        return {}
+
+    columns = _projection_columns(projection)
+    select_columns = columns if 'id' in columns else ('id',) + columns
+    placeholders = ', '.join('?' for _ in member_ids)
+
+    conn = get_db_connection()
+    conn.row_factory = None
+    rows = conn.execute(f"SELECT {', '.join(select_columns)} FROM members WHERE id IN ({placeholders})",
+                        member_ids).fetchall()
+    conn.close()
+
+    row_type = _member_row_type(select_columns)
+    id_index = select_columns.index('id')
+    return {row[id_index]: row_type._make(row) for row in rows}
+
+def fold_search_text(text: str) -> str:
+    """Arama metnindeki Türkçe ı/İ harflerini members_fts ile aynı şekilde i'ye indir"""
+    return text.replace('ı', 'i').replace('İ', 'i')
+
+def build_member_match_query(text: str) -> Optional[str]:
+    """Kullanıcı metninden FTS5 MATCH ifadesi oluştur (her kelime önek olarak aranır)"""
+    terms = re.findall(r'\w+', fold_search_text(text or ''))
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_member_rows(text: str, projection='list', association_id: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[tuple]:
+    """Üyelerde tam metin araması yap, sonuçları alaka sırasıyla projeksiyon satırı olarak döndür
+
+    Ad, soyad, ikinci ad, kimlik no, telefon, GSM, ilçe ve mahalle alanlarında önek eşleşmesi
+    yapılır; sıralama bm25 ile ad/soyad ve kimlik no eşleşmeleri öne alınarak yapılır.
+    """
+    match_query = build_member_match_query(text)
+    if match_query is None:
+        return []
+
+    columns = _projection_columns(projection)
+    query = f'''
+        SELECT {', '.join('m.' + column for column in columns)}
+        FROM members_fts f
+        JOIN members m ON m.rowid = f.rowid
+        WHERE members_fts MATCH ?
+    '''
+    params = [match_query]
+    if association_id is not None:
+        query += ' AND m.association = ?'
+        params.append(association_id)
+    query += ' ORDER BY bm25(members_fts, 10.0, 5.0, 10.0, 8.0, 3.0, 3.0, 1.0, 1.0)'
+    if limit is not None:
+        query += ' LIMIT ?'
+        params.append(limit)
+
+    conn = get_db_connection()
+    conn.row_factory = None
+    rows = conn.execute(query, params).fetchall()
     conn.close()
 
-    members = []
-    for row in member_data:
-        member_dict = dict(row)
-        member_dict['gsm'] = json.loads(member_dict['gsm'])
-        members.append(Member.from_dict(member_dict))
+    row_type = _member_row_type(columns)
+    return [row_type._make(row) for row in rows]
+
+def get_members_by_gsm(country_code: str, operator_code: str, number: str) -> List[Member]:
+    """GSM numarasına göre üyeleri getir (idx_members_gsm indeksini kullanır)"""
+    conn = get_db_connection()
+    member_data = conn.execute(f'''
+        SELECT {MEMBER_COLUMNS} FROM members
+        WHERE gsmCountryCode = ? AND gsmOperatorCode = ? AND gsmNumber = ?
+    ''', (country_code, operator_code, number)).fetchall()
+    conn.close()
 
-    return members
+    return [Member.from_row(row) for row in member_data]
 
 def get_member_by_id(member_id: str) -> Optional[Member]:
     """ID'ye göre üye getir"""
     conn = get_db_connection()
-    member_data = conn.execute('SELECT * FROM members WHERE id = ?', (member_id,)).fetchone()
+    member_data = conn.execute(f'SELECT {MEMBER_COLUMNS} FROM members WHERE id = ?', (member_id,)).fetchone()
     conn.close()
 
     if member_data:
-        member_dict = dict(member_data)
-        member_dict['gsm'] = json.loads(member_dict['gsm'])
-        return Member.from_dict(member_dict)
+        return Member.from_row(member_data)
     return None
 
 def get_member_by_identity_and_association(identity_number: str, association_id: str) -> Optional[Member]:
     """Kimlik numarası ve dernek ID'sine göre üye getir"""
     conn = get_db_connection()
-    member_data = conn.execute('SELECT * FROM members WHERE identityNumber = ? AND association = ?',
+    member_data = conn.execute(f'SELECT {MEMBER_COLUMNS} FROM members WHERE identityNumber = ? AND association = ?',
                               (identity_number, association_id)).fetchone()
     conn.close()
 
     if member_data:
-        member_dict = dict(member_data)
-        member_dict['gsm'] = json.loads(member_dict['gsm'])
-        return Member.from_dict(member_dict)
+        return Member.from_row(member_data)
     return None
 
 def update_member(member: Member) -> bool:
@@ -417,7 +751,8 @@ def update_member(member: Member) -> bool:
             SET identityNumber = ?, nationality = ?, firstName = ?, lastName = ?, middleName = ?,
                 birthSurname = ?, gender = ?, birthPlace = ?, motherName = ?, birthDate = ?,
                 fatherName = ?, district = ?, neighborhood = ?, street = ?, buildingNameOrNumber = ?,
-                doorNumber = ?, apartmentNumber = ?, phoneNumber = ?, gsm = ?, membershipYear = ?,
+                doorNumber = ?, apartmentNumber = ?, phoneNumber = ?, gsmCountryCode = ?,
+                gsmOperatorCode = ?, gsmNumber = ?, membershipYear = ?,
                 status = ?, updated_at = ?
             WHERE id = ?
         ''', (
@@ -425,7 +760,8 @@ def update_member(member: Member) -> bool:
             member.middleName, member.birthSurname, member.gender, member.birthPlace,
             member.motherName, member.birthDate, member.fatherName, member.district,
             member.neighborhood, member.street, member.buildingNameOrNumber, member.doorNumber,
-            member.apartmentNumber, member.phoneNumber, json.dumps(member.gsm), member.membershipYear,
+            member.apartmentNumber, member.phoneNumber, member.gsmCountryCode,
+            member.gsmOperatorCode, member.gsmNumber, member.membershipYear,
             member.status, member.updated_at, member.id
         ))
         conn.commit()
@@ -469,29 +805,36 @@ def create_receipt(receipt: Receipt) -> bool:
 def get_receipts_by_association(association_id: str) -> List[Receipt]:
     """Derneğe ait makbuzları getir"""
     conn = get_db_connection()
-    receipt_data = conn.execute('SELECT * FROM receipts WHERE associationId = ?', (association_id,)).fetchall()
+    receipt_data = conn.execute(f'SELECT {RECEIPT_COLUMNS} FROM receipts WHERE associationId = ?', (association_id,)).fetchall()
     conn.close()
 
-    return [Receipt.from_dict(dict(row)) for row in receipt_data]
+    return [Receipt.from_row(row) for row in receipt_data]
 
 def get_receipts_by_member(member_id: str) -> List[Receipt]:
     """Üyeye ait makbuzları getir"""
     conn = get_db_connection()
-    receipt_data = conn.execute('SELECT * FROM receipts WHERE memberId = ?', (member_id,)).fetchall()
+    receipt_data = conn.execute(f'SELECT {RECEIPT_COLUMNS} FROM receipts WHERE memberId = ?', (member_id,)).fetchall()
     conn.close()
 
-    return [Receipt.from_dict(dict(row)) for row in receipt_data]
+    return [Receipt.from_row(row) for row in receipt_data]
 
 def get_receipt_by_id(receipt_id: str) -> Optional[Receipt]:
     """ID'ye göre makbuz getir"""
     conn = get_db_connection()
-    receipt_data = conn.execute('SELECT * FROM receipts WHERE id = ?', (receipt_id,)).fetchone()
+    receipt_data = conn.execute(f'SELECT {RECEIPT_COLUMNS} FROM receipts WHERE id = ?', (receipt_id,)).fetchone()
     conn.close()
 
     if receipt_data:
-        return Receipt.from_dict(dict(receipt_data))
+        return Receipt.from_row(receipt_data)
     return None
 
+def year_range(year: int) -> Tuple[int, int]:
+    """Yılın ilk ve son saniyesini epoch olarak döndür (BETWEEN sorguları için)"""
+    from datetime import datetime
+    start = int(datetime(year, 1, 1).timestamp())
+    end = int(datetime(year + 1, 1, 1).timestamp()) - 1
+    return start, end
+
 def has_receipt_for_current_year(member_id: str, current_year: str) -> bool:
     """Üyenin bu yıl için makbuzu var mı kontrol et"""
     conn = get_db_connection()
@@ -566,3 +909,530 @@ def get_receipt_number_for_member(receipt_id: str, member_id: str) -> int:
     except Exception as e:
         print(f"Receipt number error: {e}")
         return 0
+
+# Sayfalama (keyset) işlemleri
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# rows: sayfadaki satırlar, next_cursor/prev_cursor: sonraki/önceki sayfa imleci (yoksa None)
+Page = namedtuple('Page', ['rows', 'next_cursor', 'prev_cursor'])
+
+# sql/params: _keyset_query sorgusu, decoded: çözülmüş imleç, key_count: satır sonundaki anahtar sayısı
+KeysetQuery = namedtuple('KeysetQuery', ['sql', 'params', 'decoded', 'key_count', 'limit'])
+
+def encode_cursor(keys: list, direction: str) -> str:
+    """Sıralama anahtarlarını URL'de taşınabilir imlece çevir"""
+    payload = json.dumps({'k': keys, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[list, str]]:
+    """İmleci (anahtarlar, yön) olarak çöz. Geçersiz imleç ilk sayfa sayılır (None)"""
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if payload['d'] not in ('next', 'prev') or not isinstance(payload['k'], list):
+            return None
+        return payload['k'], payload['d']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """İstenen sayfa boyutunu izin verilen aralığa çek"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+def _keyset_query(columns: List[str], from_sql: str, conditions: List[str], params: list,
+                  key_columns: List[str], cursor: Optional[str], limit: int,
+                  outer_columns: Optional[List[str]] = None, outer_params: tuple = (),
+                  groups: Optional[List[Tuple[str, list]]] = None) -> 'KeysetQuery':
+    """Keyset sayfası sorgusunu oluştur
+
+    İmleç koşulu `(key_columns) > (?...)`, ORDER BY ve LIMIT doğrudan `from_sql` üzerinde
+    uygulanır; anahtarlar indeksli sütunlar olduğunda sorgu indeksten yalnızca `limit + 1`
+    satır okur (fazladan satır sonraki sayfanın varlığını gösterir). `outer_columns` bu
+    satırlar üzerinde (`p` takma adıyla) hesaplanan sütunlardır, verilmezse `columns` aynen
+    döner. `groups` (koşul, parametreler) listesidir: satırlar önce grup sırasına, sonra
+    anahtarlara göre sıralanır ve her grup kendi indeks taramasıyla okunur. Satırın son
+    sütunları sıralama anahtarlarıdır (_k0.._kN); 'prev' yönünde satırlar azalan sıradadır.
+    """
+    key_aliases = [f'_k{i}' for i in range(len(key_columns) + (1 if groups else 0))]
+    decoded = decode_cursor(cursor)
+    if decoded and len(decoded[0]) != len(key_aliases):
+        decoded = None
+    if decoded and groups and decoded[0][0] not in range(len(groups)):
+        decoded = None
+    direction = decoded[1] if decoded else 'next'
+    operator, order = ('>', 'ASC') if direction == 'next' else ('<', 'DESC')
+
+    seek = f"({', '.join(key_columns)}) {operator} ({', '.join('?' for _ in key_columns)})"
+    segments, segment_params = [], []
+    for index, (group_condition, group_params) in enumerate(groups or [(None, [])]):
+        where, where_params = list(conditions), list(params)
+        if group_condition:
+            where.append(group_condition)
+            where_params.extend(group_params)
+
+        if decoded:
+            cursor_keys = decoded[0]
+            if groups:
+                cursor_group, cursor_keys = cursor_keys[0], cursor_keys[1:]
+                # İmlecin grubundan önceki gruplar atlanır, sonrakiler baştan okunur
+                if (index < cursor_group) if direction == 'next' else (index > cursor_group):
+                    continue
+                if index != cursor_group:
+                    cursor_keys = None
+            if cursor_keys is not None:
+                where.append(seek)
+                where_params.extend(cursor_keys)
+
+        select_list = list(columns)
+        if groups:
+            select_list.append(f'{index} AS _k0')
+        select_list += [f'{key} AS {alias}' for key, alias in zip(key_columns, key_aliases[-len(key_columns):])]
+        segment = f"SELECT {', '.join(select_list)} FROM {from_sql}"
+        if where:
+            segment += ' WHERE ' + ' AND '.join(where)
+        segment += ' ORDER BY ' + ', '.join(f'{key} {order}' for key in key_columns) + ' LIMIT ?'
+        segments.append(f'SELECT * FROM ({segment})')
+        segment_params.extend(where_params + [limit + 1])
+
+    if outer_columns is None:
+        outer_columns = [f"p.{column.split('.')[-1]}" for column in columns]
+    query = (f"SELECT {', '.join(outer_columns + [f'p.{alias}' for alias in key_aliases])}"
+             f" FROM ({' UNION ALL '.join(segments)}) AS p"
+             f" ORDER BY {', '.join(f'p.{alias} {order}' for alias in key_aliases)} LIMIT ?")
+    query_params = list(outer_params) + segment_params + [limit + 1]
+
+    return KeysetQuery(query, query_params, decoded, len(key_aliases), limit)
+
+def _fetch_keyset_page(conn: sqlite3.Connection, keyset: 'KeysetQuery') -> Page:
+    """_keyset_query sorgusunu çalıştırıp satırları sıralama anahtarlarına göre artan sırada sayfala
+
+    Sayfa sınırı OFFSET ile değil son görülen anahtarla belirlenir; böylece hangi sayfada
+    olunursa olunsun sorgu yalnızca `limit` kadar satır okur.
+    """
+    decoded, key_count, limit = keyset.decoded, keyset.key_count, keyset.limit
+    direction = decoded[1] if decoded else 'next'
+
+    fetched = conn.execute(keyset.sql, keyset.params).fetchall()
+    has_more = len(fetched) > limit
+    fetched = fetched[:limit]
+    if direction == 'prev':
+        fetched.reverse()
+
+    rows = [tuple(row)[:-key_count] for row in fetched]
+    first_keys = list(fetched[0])[-key_count:] if fetched else None
+    last_keys = list(fetched[-1])[-key_count:] if fetched else None
+
+    if direction == 'next':
+        next_cursor = encode_cursor(last_keys, 'next') if has_more else None
+        prev_cursor = encode_cursor(first_keys, 'prev') if decoded and fetched else None
+    else:
+        next_cursor = encode_cursor(last_keys, 'next') if fetched else None
+        prev_cursor = encode_cursor(first_keys, 'prev') if has_more else None
+
+    return Page(rows, next_cursor, prev_cursor)
+
+class StreamedPage:
+    """Satırları veritabanı imlecinden okundukça veren keyset sayfası (stream_template ile kullanılır)
+
+    `rows` bir kez tüketilebilen bir üreteçtir; bağlantı satırlar bitince kapanır. `prev_cursor`
+    hemen, `next_cursor` ise son satır okunduktan sonra bilinir (şablonda tablodan sonra kullanılır).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, keyset: 'KeysetQuery', make_row):
+        decoded = keyset.decoded
+        self._conn = conn
+        self._key_count = keyset.key_count
+        self._make_row = make_row
+        self._limit = keyset.limit
+        self.next_cursor = None
+
+        rows = conn.execute(keyset.sql, keyset.params)
+        if decoded and decoded[1] == 'prev':
+            # Geriye giderken satırlar azalan sırada gelir; en fazla limit + 1 satır olduğu için
+            # sayfa belleğe alınıp çevrilir, fazladan satır önceki sayfanın varlığını gösterir
+            fetched = rows.fetchall()
+            conn.close()
+            has_more = len(fetched) > self._limit
+            fetched = fetched[:self._limit][::-1]
+            self._rows = iter(fetched)
+            first = next(self._rows, None)
+            self.prev_cursor = encode_cursor(self._keys(first), 'prev') if has_more else None
+            if fetched:
+                self.next_cursor = encode_cursor(self._keys(fetched[-1]), 'next')
+        else:
+            # İleri yönde satırlar artan sırada okundukça verilir; limit + 1. satır varsa sonraki sayfa vardır
+            self._rows = iter(rows.fetchone, None)
+            first = next(self._rows, None)
+            self.prev_cursor = encode_cursor(self._keys(first), 'prev') if decoded and first else None
+            if first is None:
+                conn.close()
+
+        self._first = first
+        self.has_rows = first is not None
+        self.rows = self._iter_rows()
+
+    @classmethod
+    def empty(cls) -> 'StreamedPage':
+        """Sorgu çalıştırılmadan boş sayfa (ör. aranacak kelime yoksa)"""
+        page = cls.__new__(cls)
+        page.rows = iter(())
+        page.has_rows = False
+        page.prev_cursor = page.next_cursor = None
+        return page
+
+    def _keys(self, row) -> list:
+        return list(row[-self._key_count:])
+
+    def _iter_rows(self):
+        if self._first is None:
+            return
+        try:
+            row, last, count = self._first, None, 0
+            while row is not None and count < self._limit:
+                yield self._make_row(row[:-self._key_count])
+                last, count = row, count + 1
+                row = next(self._rows, None)
+
+            if row is not None and self.next_cursor is None:
+                self.next_cursor = encode_cursor(self._keys(last), 'next')
+        finally:
+            self._conn.close()
+
+def _effective_status_sql(alias: str = 'm') -> str:
+    """check_member_receipt_status ile aynı kuralla üyenin görünen durumunu hesaplayan SQL
+
+    Bu yılın üyesi olup makbuzu olmayan 'pending' üye 'receipt_pending', makbuzu yüklenmiş
+    'receipt_pending' üye 'pending' görünür. İki parametre alır, ikisi de içinde bulunulan yıl.
+    """
+    return f'''
+        CASE
+            WHEN {alias}.membershipYear = ? AND {alias}.status = 'pending'
+                 AND NOT EXISTS (SELECT 1 FROM receipts r WHERE r.memberId = {alias}.id) THEN 'receipt_pending'
+            WHEN {alias}.membershipYear = ? AND {alias}.status = 'receipt_pending'
+                 AND EXISTS (SELECT 1 FROM receipts r WHERE r.memberId = {alias}.id) THEN 'pending'
+            ELSE {alias}.status
+        END
+    '''
+
+def get_member_page(projection='list', association_id: Optional[str] = None, search: Optional[str] = None,
+                    pending_first: bool = False, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE, stream: bool = False) -> Page:
+    """Üyeleri keyset sayfalama ile projeksiyon satırı olarak getir
+
+    Sıralama: aramada alaka (bm25), aksi halde (created_at, id) indeksi; `pending_first` ile onay
+    bekleyenler öne alınır. `status` sütunu makbuz durumuna göre hesaplanmış durumu taşır ve
+    yalnızca sayfadaki satırlar için hesaplanır. `stream` ile satırları okundukça veren bir
+    StreamedPage döndürülür.
+    """
+    from datetime import datetime
+
+    columns = _projection_columns(projection)
+    current_year = str(datetime.now().year)
+    status_params = [current_year, current_year]  # _effective_status_sql parametreleri
+
+    # Görünen durum sayfa satırları üzerinde hesaplanır; bunun için gereken sütunlar da okunur
+    selected = columns + (('id', 'status', 'membershipYear') if 'status' in columns else ())
+    inner_columns = [f'm.{column}' for column in dict.fromkeys(selected)]
+    outer_columns = [f"{_effective_status_sql('p')} AS status" if column == 'status' else f'p.{column}'
+                     for column in columns]
+    outer_params = status_params if 'status' in columns else []
+
+    from_sql, params, conditions, groups = 'members m', [], [], None
+    if search:
+        match_query = build_member_match_query(search)
+        if match_query is None:
+            return StreamedPage.empty() if stream else Page([], None, None)
+        # Alaka sırası indekslenemez; sıralama yalnızca eşleşen üyeler üzerinde yapılır
+        from_sql = '''(
+            SELECT m.*, bm25(members_fts, 10.0, 5.0, 10.0, 8.0, 3.0, 3.0, 1.0, 1.0) AS _rank
+            FROM members_fts f JOIN members m ON m.rowid = f.rowid
+            WHERE members_fts MATCH ?
+        ) m'''
+        params.append(match_query)
+        key_columns = ['m._rank', 'm.id']
+    else:
+        key_columns = ['m.created_at', 'm.id']
+        if pending_first:
+            status_sql = _effective_status_sql('m')
+            groups = [(f"{status_sql} IS 'pending'", status_params),
+                      (f"{status_sql} IS NOT 'pending'", status_params)]
+    if association_id is not None:
+        conditions.append('m.association = ?')
+        params.append(association_id)
+
+    keyset = _keyset_query(inner_columns, from_sql, conditions, params, key_columns, cursor,
+                           clamp_page_size(limit), outer_columns, outer_params, groups)
+
+    row_type = _member_row_type(columns)
+    conn = get_db_connection()
+    conn.row_factory = None
+    if stream:
+        return StreamedPage(conn, keyset, row_type._make)
+
+    page = _fetch_keyset_page(conn, keyset)
+    conn.close()
+
+    return Page([row_type._make(row) for row in page.rows], page.next_cursor, page.prev_cursor)
+
+def get_member_stats(association_id: Optional[str] = None) -> Dict[str, int]:
+    """Üye istatistiklerini (görünen duruma göre) SQL ile hesapla"""
+    from datetime import datetime
+
+    current_year = datetime.now().year
+    start, end = year_range(current_year)
+    status_sql = _effective_status_sql()
+
+    query = f'''
+        SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(status = 'pending'), 0) AS pending,
+            COALESCE(SUM(status = 'receipt_pending'), 0) AS receipt_pending,
+            COALESCE(SUM(status = 'approved'), 0) AS approved,
+            COALESCE(SUM(status = 'rejected'), 0) AS rejected,
+            COALESCE(SUM(membershipYear = ?), 0) AS current_year,
+            COALESCE(SUM(NOT has_receipt_this_year), 0) AS without_receipts
+        FROM (
+            SELECT {status_sql} AS status, m.membershipYear,
+                   EXISTS (SELECT 1 FROM receipts r
+                           WHERE r.memberId = m.id AND r.uploadDate BETWEEN ? AND ?) AS has_receipt_this_year
+            FROM members m
+            {'WHERE m.association = ?' if association_id is not None else ''}
+        )
+    '''
+    # Sırasıyla: bu yılın üyeleri, _effective_status_sql (2), makbuz tarih aralığı
+    params = [str(current_year), str(current_year), str(current_year), start, end]
+    if association_id is not None:
+        params.append(association_id)
+
+    conn = get_db_connection()
+    row = conn.execute(query, params).fetchone()
+    conn.close()
+
+    return dict(row)
+
+def get_receipt_page(association_id: Optional[str] = None, cursor: Optional[str] = None,
+                     limit: int = DEFAULT_PAGE_SIZE, stream: bool = False) -> Page:
+    """Makbuzları yükleme tarihine göre keyset sayfalama ile getir
+
+    Satırlar: (Receipt, makbuzun üyeye ait sıra numarası). Sıra numarası get_receipt_number_for_member
+    ile aynıdır, yalnızca sayfadaki makbuzlar için hesaplanır. `stream` için get_member_page'e bakın.
+    """
+    columns = [f'r.{column}' for column in Receipt.COLUMNS]
+    outer_columns = [f'p.{column}' for column in Receipt.COLUMNS] + ['''
+        (SELECT COUNT(*) FROM receipts r2
+         WHERE r2.memberId = p.memberId
+           AND (r2.uploadDate < p.uploadDate OR (r2.uploadDate = p.uploadDate AND r2.id <= p.id))) AS number
+    ''']
+    conditions, params = [], []
+    if association_id is not None:
+        conditions.append('r.associationId = ?')
+        params.append(association_id)
+
+    keyset = _keyset_query(columns, 'receipts r', conditions, params, ['r.uploadDate', 'r.id'], cursor,
+                           clamp_page_size(limit), outer_columns)
+
+    conn = get_db_connection()
+    conn.row_factory = None
+    if stream:
+        return StreamedPage(conn, keyset, lambda row: (Receipt.from_row(row[:-1]), row[-1]))
+
+    page = _fetch_keyset_page(conn, keyset)
+    conn.close()
+
+    rows = [(Receipt.from_row(row[:-1]), row[-1]) for row in page.rows]
+    return Page(rows, page.next_cursor, page.prev_cursor)
+
+# Koşullu GET (ETag) doğrulayıcıları
+def get_member_validators(member_id: str) -> Optional[Dict[str, Any]]:
+    """Üye sayfasının değişip değişmediğini anlamak için gereken değerleri tek sorguda getir
+
+    data_version, üyenin derneğindeki üye/makbuz sayaçlarının toplamıdır; aynı saniyedeki
+    güncellemeler updated_at'i değiştirmese de sayaçlar her yazımda artar.
+    """
+    conn = get_db_connection()
+    row = conn.execute('''
+        SELECT m.association,
+               COALESCE(m.updated_at, m.created_at, 0) AS updated_at,
+               (SELECT COUNT(*) FROM receipts r WHERE r.memberId = m.id) AS receipt_count,
+               (SELECT COALESCE(SUM(version), 0) FROM cache_versions
+                WHERE name IN ('members:' || m.association, 'receipts:' || m.association)) AS data_version
+        FROM members m WHERE m.id = ?
+    ''', (member_id,)).fetchone()
+    conn.close()
+
+    return dict(row) if row else None
+
+def get_association_validators(association_id: str) -> Optional[Dict[str, Any]]:
+    """Dernek detay sayfası için get_member_validators karşılığı"""
+    conn = get_db_connection()
+    row = conn.execute('''
+        SELECT a.last_login,
+               (SELECT MAX(COALESCE(m.updated_at, m.created_at, 0)) FROM members m
+                WHERE m.association = a.id) AS updated_at,
+               (SELECT COUNT(*) FROM receipts r WHERE r.associationId = a.id) AS receipt_count,
+               (SELECT COALESCE(SUM(version), 0) FROM cache_versions
+                WHERE name IN ('members:' || a.id, 'receipts:' || a.id)) AS data_version
+        FROM associations a WHERE a.id = ?
+    ''', (association_id,)).fetchone()
+    conn.close()
+
+    return dict(row) if row else None
+
+def get_association_counts() -> Dict[str, Dict[str, int]]:
+    """Dernek başına üye, onay bekleyen üye ve makbuz sayıları (dernek ID -> sayılar)"""
+    conn = get_db_connection()
+    counts = {}
+    for row in conn.execute('''
+        SELECT association, COUNT(*) AS member_count, SUM(status = 'pending') AS pending_count
+        FROM members GROUP BY association
+    '''):
+        counts[row['association']] = {'member_count': row['member_count'], 'pending_count': row['pending_count'],
+                                      'receipt_count': 0}
+    for row in conn.execute('SELECT associationId, COUNT(*) AS receipt_count FROM receipts GROUP BY associationId'):
+        counts.setdefault(row['associationId'], {'member_count': 0, 'pending_count': 0, 'receipt_count': 0})
+        counts[row['associationId']]['receipt_count'] = row['receipt_count']
+    conn.close()
+
+    return counts
+
+def count_receipts(association_id: Optional[str] = None) -> int:
+    """Makbuz sayısını getir"""
+    conn = get_db_connection()
+    if association_id is None:
+        row = conn.execute('SELECT COUNT(*) FROM receipts').fetchone()
+    else:
+        row = conn.execute('SELECT COUNT(*) FROM receipts WHERE associationId = ?', (association_id,)).fetchone()
+    conn.close()
+
+    return row[0]
+
+def count_members(association_id: Optional[str] = None) -> int:
+    """Üye sayısını getir"""
+    conn = get_db_connection()
+    if association_id is None:
+        row = conn.execute('SELECT COUNT(*) FROM members').fetchone()
+    else:
+        # (association, created_at, id) indeksi üzerinden sayılır; tabloya inilmez
+        row = conn.execute('SELECT COUNT(*) FROM members WHERE association = ?', (association_id,)).fetchone()
+    conn.close()
+
+    return row[0]
+
+# Üye gönderim (idempotency) işlemleri
+def claim_member_submission(member_id: str, stale_after: int = 600) -> Optional[Dict[str, Any]]:
+    """Üye için gönderim kaydını al. Alınırsa None, başka bir gönderim varsa mevcut kaydı döndür"""
+    from datetime import datetime
+    now = int(datetime.now().timestamp())
+
+    conn = get_db_connection()
+    conn.isolation_level = None
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('SELECT * FROM member_submissions WHERE member_id = ?', (member_id,)).fetchone()
+
+        # Başarılı gönderim kalıcıdır, devam eden gönderim zaman aşımına uğramadıysa beklenir
+        if row and (row['status'] == 'succeeded' or
+                    (row['status'] == 'in_progress' and now - int(row['started_at']) < stale_after)):
+            conn.execute('COMMIT')
+            return dict(row)
+
+        conn.execute(
+            'INSERT OR REPLACE INTO member_submissions (member_id, status, result, started_at, finished_at) VALUES (?, ?, NULL, ?, NULL)',
+            (member_id, 'in_progress', str(now))
+        )
+        conn.execute('COMMIT')
+        return None
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+def finish_member_submission(member_id: str, status: str, result: Dict[str, Any]):
+    """Gönderim kaydını sonuçlandır ('succeeded' veya 'failed')"""
+    from datetime import datetime
+    conn = get_db_connection()
+    conn.execute(
+        'UPDATE member_submissions SET status = ?, result = ?, finished_at = ? WHERE member_id = ?',
+        (status, json.dumps(result), str(int(datetime.now().timestamp())), member_id)
+    )
+    conn.commit()
+    conn.close()
+
+def get_member_submission(member_id: str) -> Optional[Dict[str, Any]]:
+    """Üyenin gönderim kaydını getir"""
+    conn = get_db_connection()
+    row = conn.execute('SELECT * FROM member_submissions WHERE member_id = ?', (member_id,)).fetchone()
+    conn.close()
+
+    if row:
+        submission = dict(row)
+        submission['result'] = json.loads(submission['result']) if submission['result'] else None
+        return submission
+    return None
+
+# Dışa aktarım işi işlemleri
+def _export_job_from_row(row) -> Dict[str, Any]:
+    job = dict(row)
+    job['filters'] = json.loads(job['filters']) if job['filters'] else {}
+    return job
+
+def create_export_job(job_id: str, export_format: str, filters: Dict[str, str], created_by: str):
+    """Kuyruğa alınmış dışa aktarım işi kaydı oluştur"""
+    from datetime import datetime
+    conn = get_db_connection()
+    conn.execute(
+        'INSERT INTO export_jobs (id, format, filters, status, created_by, created_at, owner_pid) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (job_id, export_format, json.dumps(filters), 'queued', created_by, int(datetime.now().timestamp()), os.getpid())
+    )
+    conn.commit()
+    conn.close()
+
+def update_export_job(job_id: str, status: str, row_count: Optional[int] = None,
+                      file_name: Optional[str] = None, error: Optional[str] = None):
+    """İş durumunu güncelle; 'succeeded' veya 'failed' olduğunda bitiş zamanı yazılır"""
+    from datetime import datetime
+    finished_at = int(datetime.now().timestamp()) if status in ('succeeded', 'failed') else None
+    conn = get_db_connection()
+    conn.execute(
+        'UPDATE export_jobs SET status = ?, row_count = ?, file_name = ?, error = ?, finished_at = ? WHERE id = ?',
+        (status, row_count, file_name, error, finished_at, job_id)
+    )
+    conn.commit()
+    conn.close()
+
+def get_export_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Dışa aktarım işini getir"""
+    conn = get_db_connection()
+    row = conn.execute('SELECT * FROM export_jobs WHERE id = ?', (job_id,)).fetchone()
+    conn.close()
+    return _export_job_from_row(row) if row else None
+
+def get_unfinished_export_jobs() -> List[Dict[str, Any]]:
+    """Kuyrukta bekleyen veya çalışan işler (sahibi olan sürecin ID'siyle)"""
+    conn = get_db_connection()
+    rows = conn.execute("SELECT * FROM export_jobs WHERE status IN ('queued', 'running')").fetchall()
+    conn.close()
+    return [_export_job_from_row(row) for row in rows]
+
+def expire_export_jobs(job_ids: List[str]):
+    """Dosyası silinen tamamlanmış işleri 'expired' olarak işaretle"""
+    if not job_ids:
+        return
+    conn = get_db_connection()
+    conn.executemany("UPDATE export_jobs SET status = 'expired' WHERE id = ? AND status = 'succeeded'",
+                     [(job_id,) for job_id in job_ids])
+    conn.commit()
+    conn.close()
+
+def get_recent_export_jobs(limit: int = 20) -> List[Dict[str, Any]]:
+    """Son dışa aktarım işlerini getir (yeniden eskiye)"""
+    conn = get_db_connection()
+    rows = conn.execute('SELECT * FROM export_jobs ORDER BY created_at DESC, rowid DESC LIMIT ?', (limit,)).fetchall()
+    conn.close()
+    return [_export_job_from_row(row) for row in rows]
@@ -0,0 +1,109 @@
+import os
+import shutil
+import hashlib
+import threading
+import logging
+from typing import BinaryIO, Dict, Tuple
+from flask import current_app
+from app.services.db import get_members_version
+from app.services.member_export import iter_members_csv, write_members_xlsx
+
+logger = logging.getLogger(__name__)
+
+# Dışa aktarım biçimi (sütunlar, başlıklar) değişirse artırılır; eski dosyalar kullanılmaz
+EXPORT_SCHEMA_VERSION = 1
+
+# Format -> dosya uzantısı
+ARTIFACT_EXTENSIONS = {
+    'csv': '.csv',
+    'xlsx': '.xlsx',
+}
+
+# Aynı dosyanın aynı süreçte iki kez üretilmemesi için anahtar başına kilit ve onu bekleyen istek sayısı;
+# kilit ancak bekleyen kalmayınca silinir, yoksa sonradan gelen istek yeni kilitle dosyayı yeniden üretir
+_build_locks: Dict[str, threading.Lock] = {}
+_build_lock_users: Dict[str, int] = {}
+_build_locks_lock = threading.Lock()
+
+def _artifact_dir() -> str:
+    return os.path.join(current_app.config['EXPORT_DIR'], 'artifacts')
+
+def artifact_etag(association_id: str, export_format: str) -> str:
+    """Derneğin şu anki verisine karşılık gelen dışa aktarım anahtarı (ETag olarak da kullanılır)"""
+    version = get_members_version(association_id)
+    key = f"{association_id}:{export_format}:{version}:{EXPORT_SCHEMA_VERSION}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def _write_artifact(path: str, association_id: str, export_format: str):
+    """Dışa aktarımı verilen yola yaz"""
+    with open(path, 'wb') as output:
+        if export_format == 'csv':
+            for chunk in iter_members_csv(association_id):
+                output.write(chunk)
+        else:
+            workbook, _ = write_members_xlsx(association_id)
+            with workbook:
+                shutil.copyfileobj(workbook, output)
+
+def get_export_artifact(association_id: str, export_format: str) -> Tuple[BinaryIO, str]:
+    """Dışa aktarım dosyasını diskten ver, veri değiştiyse yeniden üret. (açık dosya, etag) döndürür
+
+    Dosya kilit tutulurken açılır; başka bir isteğin disk bütçesi için sildiği dosya da gönderilebilir.
+    """
+    etag = artifact_etag(association_id, export_format)
+    directory = _artifact_dir()
+    path = os.path.join(directory, etag + ARTIFACT_EXTENSIONS[export_format])
+
+    with _build_locks_lock:
+        lock = _build_locks.setdefault(etag, threading.Lock())
+        _build_lock_users[etag] = _build_lock_users.get(etag, 0) + 1
+
+    try:
+        with lock:
+            if os.path.exists(path):
+                os.utime(path)  # Son kullanım zamanı; disk bütçesi aşılınca en eski kullanılan silinir
+            else:
+                os.makedirs(directory, exist_ok=True)
+                partial_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+                try:
+                    _write_artifact(partial_path, association_id, export_format)
+                    os.replace(partial_path, path)
+                finally:
+                    if os.path.exists(partial_path):
+                        os.remove(partial_path)
+                logger.info(f"📦 Dışa aktarım dosyası oluşturuldu: {association_id} ({export_format})")
+                evict_artifacts(keep=path)
+            artifact = open(path, 'rb')
+    finally:
+        with _build_locks_lock:
+            _build_lock_users[etag] -= 1
+            if not _build_lock_users[etag]:
+                del _build_lock_users[etag]
+                del _build_locks[etag]
+
+    return artifact, etag
+
+def evict_artifacts(keep: str = None):
+    """Disk bütçesi aşıldıysa en uzun süredir kullanılmayan dosyaları sil"""
+    directory = _artifact_dir()
+    max_bytes = current_app.config['EXPORT_CACHE_MAX_BYTES']
+
+    artifacts = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith('.part'):
+            stat = entry.stat()
+            artifacts.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in artifacts)
+    for _, size, path in sorted(artifacts):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass  # Başka bir worker silmiş
+        except PermissionError:
+            pass  # Windows'ta gönderilmekte olan (açık) dosya silinemez
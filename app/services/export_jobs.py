@@ -0,0 +1,195 @@
+import os
+import re
+import csv
+import time
+import uuid
+import shutil
+import zipfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from flask import current_app
+from openpyxl import Workbook
+from app.services.db import create_export_job, update_export_job, get_unfinished_export_jobs, expire_export_jobs
+from app.services.association_cache import association_cache
+from app.services.member_export import EXPORT_HEADERS, EXCEL_SHEET_NAME, iter_export_values, write_members_xlsx
+
+logger = logging.getLogger(__name__)
+
+# Format -> (mimetype, dosya uzantısı)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+    'zip': ('application/zip', '.zip'),
+}
+
+# Federasyon dışa aktarımında üye sütunlarının önüne eklenen dernek sütunu
+FEDERATION_HEADERS = ['Dernek'] + EXPORT_HEADERS
+
+# Tüm satırları dolaşan işler veritabanını yormasın diye tek tek çalıştırılır
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-job')
+
+def _jobs_dir() -> str:
+    return os.path.join(current_app.config['EXPORT_DIR'], 'jobs')
+
+def export_file_path(job: Dict[str, Any]) -> str:
+    """Tamamlanmış işin dosya yolu"""
+    return os.path.join(_jobs_dir(), job['file_name'])
+
+def _is_process_alive(pid: Optional[int]) -> bool:
+    """Aynı makinede bu ID ile çalışan başka bir süreç var mı"""
+    if not pid or pid == os.getpid():
+        return False  # Bu süreç yeni başladı; kayıttaki aynı ID önceki bir çalıştırmaya ait
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def recover_export_jobs() -> int:
+    """Sahibi olan süreç kapanmış, yarıda kalan işleri 'failed' yap; işaretlenen iş sayısını döndür"""
+    recovered = 0
+    for job in get_unfinished_export_jobs():
+        if _is_process_alive(job.get('owner_pid')):
+            continue  # Başka bir worker hâlâ çalıştırıyor
+        partial_path = os.path.join(_jobs_dir(), job['id'] + EXPORT_FORMATS.get(job['format'], ('', ''))[1] + '.part')
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        update_export_job(job['id'], 'failed', error='Uygulama yeniden başlatıldığı için iş yarıda kaldı')
+        recovered += 1
+
+    if recovered:
+        logger.warning(f"⚠️ {recovered} yarıda kalan dışa aktarım işi başarısız olarak işaretlendi")
+    return recovered
+
+def prune_export_files(keep: Optional[str] = None):
+    """EXPORT_JOB_MAX_AGE'den eski dosyaları, ardından bütçe aşıldıysa en eskileri sil ve işlerini 'expired' yap"""
+    directory = _jobs_dir()
+    if not os.path.isdir(directory):
+        return
+    max_age = current_app.config['EXPORT_JOB_MAX_AGE']
+    max_bytes = current_app.config['EXPORT_CACHE_MAX_BYTES']
+
+    files = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith('.part'):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in files)
+    cutoff = time.time() - max_age
+    removed = []
+    for modified, size, path in sorted(files):
+        if path == keep or (modified >= cutoff and total <= max_bytes):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Başka bir worker silmiş
+        total -= size
+        removed.append(os.path.splitext(os.path.basename(path))[0])
+
+    expire_export_jobs(removed)
+
+def init_export_jobs():
+    """Başlangıçta yarıda kalan işleri sonuçlandır ve eski dosyaları temizle (uygulama context'i içinde çağrılır)"""
+    recover_export_jobs()
+    prune_export_files()
+
+def start_federation_export(export_format: str, filters: Dict[str, str], created_by: str) -> str:
+    """Tüm derneklerin üyelerini arka planda dışa aktar, iş ID'sini döndür"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Bilinmeyen dışa aktarım formatı: {export_format}")
+
+    job_id = str(uuid.uuid4())
+    create_export_job(job_id, export_format, filters, created_by)
+    _executor.submit(_run_job, current_app._get_current_object(), job_id, export_format, filters)
+    logger.info(f"📦 Federasyon dışa aktarımı kuyruğa alındı: {job_id} ({export_format})")
+    return job_id
+
+def _run_job(app, job_id: str, export_format: str, filters: Dict[str, str]):
+    """Dışa aktarımı geçici dosyaya yaz, bitince yerine taşı ve işi sonuçlandır"""
+    with app.app_context():
+        update_export_job(job_id, 'running')
+        directory = os.path.join(app.config['EXPORT_DIR'], 'jobs')
+        os.makedirs(directory, exist_ok=True)
+        file_name = job_id + EXPORT_FORMATS[export_format][1]
+        path = os.path.join(directory, file_name)
+        partial_path = path + '.part'
+
+        try:
+            writer = {'csv': _write_csv, 'xlsx': _write_xlsx, 'zip': _write_zip}[export_format]
+            row_count = writer(partial_path, filters)
+            os.replace(partial_path, path)
+            update_export_job(job_id, 'succeeded', row_count=row_count, file_name=file_name)
+            logger.info(f"✅ Federasyon dışa aktarımı tamamlandı: {job_id} ({row_count} üye)")
+            prune_export_files(keep=path)
+        except Exception as e:
+            logger.error(f"❌ Federasyon dışa aktarımı başarısız: {job_id}: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            update_export_job(job_id, 'failed', error=str(e))
+
+def _iter_federation_rows(filters: Dict[str, str]):
+    """Tüm derneklerin üyelerini başında dernek adıyla üret (her dernek kendi indeksiyle okunur)"""
+    for association in association_cache.all():
+        for values in iter_export_values(association.id, filters):
+            yield [association.name] + values
+
+def _write_csv(path: str, filters: Dict[str, str]) -> int:
+    """Tek CSV dosyası (UTF-8 BOM'lu)"""
+    row_count = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(FEDERATION_HEADERS)
+        for values in _iter_federation_rows(filters):
+            writer.writerow(values)
+            row_count += 1
+    return row_count
+
+def _write_xlsx(path: str, filters: Dict[str, str]) -> int:
+    """Tek sayfalık Excel dosyası"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(EXCEL_SHEET_NAME)
+    sheet.append(FEDERATION_HEADERS)
+
+    row_count = 0
+    for values in _iter_federation_rows(filters):
+        sheet.append(values)
+        row_count += 1
+
+    workbook.save(path)
+    return row_count
+
+def _archive_name(name: str, used: set) -> str:
+    """Dernek adından ZIP içinde benzersiz, güvenli bir dosya adı üret"""
+    base = re.sub(r'[\\/:*?"<>|\s]+', '_', name).strip('_') or 'dernek'
+    candidate = base
+    index = 2
+    while candidate in used:
+        candidate = f"{base}_{index}"
+        index += 1
+    used.add(candidate)
+    return candidate + '.xlsx'
+
+def _write_zip(path: str, filters: Dict[str, str]) -> int:
+    """Her dernek için ayrı bir Excel dosyası içeren ZIP (üyesi olmayan dernekler atlanır)"""
+    row_count = 0
+    used_names = set()
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for association in association_cache.all():
+            output, count = write_members_xlsx(association.id, filters)
+            with output:
+                if not count:
+                    continue
+                with archive.open(_archive_name(association.name, used_names), 'w') as entry:
+                    shutil.copyfileobj(output, entry)
+            row_count += count
+    return row_count
+
+def describe_filters(filters: Optional[Dict[str, str]]) -> str:
+    """Filtreleri listede gösterilecek metne çevir"""
+    labels = {'status': 'Durum', 'year': 'Yıl', 'district': 'İlçe'}
+    return ', '.join(f"{labels.get(name, name)}: {value}" for name, value in (filters or {}).items()) or 'Tümü'
@@ -0,0 +1,105 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from flask import current_app
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Şablon parçaları için süreç içi, bellek sınırlı LRU önbellek
+
+    Anahtarlar şablonda verilir ve ilgili verinin sürümünü (ör. get_data_version) içermelidir;
+    veri değişince anahtar değişir, eski parça kullanılmadan LRU sırasıyla düşer. TTL, anahtara
+    girmeyen verinin (ör. içinde bulunulan yıl) en fazla ne kadar eski kalabileceğini sınırlar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # anahtar -> (geçerlilik sonu, html, boyut)
+        self._fragments: 'OrderedDict[Tuple, Tuple[float, str, int]]' = OrderedDict()
+        self._size = 0
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    @staticmethod
+    def _make_key(key: Any) -> Tuple:
+        """Şablondaki anahtarı veritabanına özgü, hashlenebilir bir demete çevir"""
+        parts = tuple(key) if isinstance(key, (list, tuple)) else (key,)
+        return (current_app.config['DATABASE_PATH'],) + tuple(str(part) for part in parts)
+
+    def _remove(self, key: Tuple):
+        _, _, size = self._fragments.pop(key)
+        self._size -= size
+
+    def get_or_render(self, key: Any, ttl: float, render) -> str:
+        """Parçayı önbellekten ver; yoksa veya süresi dolduysa render() ile üretip sakla"""
+        key = self._make_key(key)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._fragments.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._fragments.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[1]
+                self._remove(key)
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+
+        html = render()
+        size = len(html.encode('utf-8'))
+        max_bytes = current_app.config['FRAGMENT_CACHE_MAX_BYTES']
+        if size > max_bytes:
+            return html  # Bütçeden büyük parça saklanmaz
+
+        with self._lock:
+            if key in self._fragments:
+                self._remove(key)
+            self._fragments[key] = (now + ttl, html, size)
+            self._size += size
+            while self._size > max_bytes:
+                self._remove(next(iter(self._fragments)))
+                self._stats['evictions'] += 1
+
+        return html
+
+    def clear(self):
+        """Tüm parçaları sil"""
+        with self._lock:
+            self._fragments.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """İsabet/ıskalama sayıları, isabet oranı ve bellek kullanımı"""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._fragments), size_bytes=self._size)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_bytes'] = current_app.config['FRAGMENT_CACHE_MAX_BYTES']
+        return stats
+
+
+fragment_cache = FragmentCache()
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache anahtar, ttl %} ... {% endcache %} bloğu
+
+    Anahtar bir değer ya da liste olabilir, ttl saniye cinsindendir. Blok gövdesi yalnızca
+    önbellekte parça yoksa çalışır; pahalı sorgular gövdenin içinde çağrılırsa isabette atlanır.
+    """
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = parser.parse_expression()
+        parser.stream.expect('comma')
+        ttl = parser.parse_expression()
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [key, ttl]), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, ttl, caller):
+        return Markup(fragment_cache.get_or_render(key, ttl, caller))
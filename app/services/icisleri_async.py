@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
+from typing import Any, Callable, Coroutine
+from app.services.icisleri_governor import governor
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIcisleriDriver:
+    """İçişleri akışları için asyncio tabanlı sürücü katmanı
+
+    Tek bir event loop, arka plandaki bir thread'de çalışır. Her arama veya gönderim
+    kendi izole tarayıcı bağlamında (ayrı Chrome oturumu) yürütülür. Havuz, açık bağlam
+    sayısından (`max_contexts`) `max_waiting` kadar büyüktür: fazladan thread'ler governor
+    kuyruğunda FIFO sırasıyla ve `queue_timeout` süresince slot bekler, böylece bekleyenler
+    havuzun sınırsız iç kuyruğunda değil governor'da sıraya girer.
+    """
+
+    def __init__(self, max_contexts: int, max_waiting: int = 0):
+        self.max_contexts = max_contexts
+        self.max_waiting = max_waiting
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Event loop thread'ini gerekirse başlat"""
+        with self._start_lock:
+            if self._loop is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_contexts + self.max_waiting,
+                                                    thread_name_prefix='icisleri-context')
+                self._loop = asyncio.new_event_loop()
+                self._loop.set_default_executor(self._executor)
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='icisleri-async', daemon=True)
+                self._thread.start()
+                logger.info(f"🔄 İçişleri async sürücüsü başlatıldı ({self.max_contexts} bağlam)")
+            return self._loop
+
+    async def run_in_context(self, func: Callable, *args) -> Any:
+        """Engelleyen bot adımlarını izole bir tarayıcı bağlamında çalıştır ve sonucunu bekle"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Coroutine'i sürücünün event loop'unda başlat, sonucu için Future döndür"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine, timeout: float = None) -> Any:
+        """Senkron koddan (ör. Flask route'u) coroutine'i çalıştırıp sonucunu bekle
+
+        Süre dolarsa akış iptal edilir (henüz başlamadıysa havuz kuyruğundan düşer) ve
+        TimeoutError fırlatılır. Varsayılan süre: slot bekleme + tek akışın en fazla süresi.
+        """
+        return self.wait(self.submit(coro), timeout)
+
+    def wait(self, future: Future, timeout: float = None) -> Any:
+        """Daha önce başlatılmış akışın sonucunu `run` ile aynı süre sınırıyla bekle"""
+        timeout = FLOW_TIMEOUT + governor.queue_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+
+def _get_flow_timeout() -> float:
+    """Config'deki tek akış süresi sınırı (saniye)"""
+    try:
+        from config import BOT_CONFIG
+        return BOT_CONFIG.get('flow_timeout', 180)
+    except ImportError:
+        return 180
+
+# Slot alındıktan sonra tek bir arama/gönderim akışının en fazla süresi (saniye)
+FLOW_TIMEOUT = _get_flow_timeout()
+
+# Tüm İçişleri akışlarının paylaştığı tek sürücü
+driver = AsyncIcisleriDriver(max_contexts=governor.max_sessions, max_waiting=governor.max_waiting)
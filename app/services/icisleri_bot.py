@@ -1,6 +1,8 @@
 import time
 import json
-from typing import Dict, Any, Optional
+import asyncio
+from concurrent.futures import TimeoutError
+from typing import Dict, Any, List, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,6 +12,8 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
+from app.services.icisleri_governor import governor, IcisleriUnavailableError
+from app.services.icisleri_async import driver
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -21,6 +25,7 @@ class IcisleriBot:
     def __init__(self, headless=True):
         self.driver = None
         self.is_logged_in = False
+        self.has_session_slot = False
         self.headless = headless
         self.wait_timeout = 10
 
@@ -57,8 +62,23 @@ class IcisleriBot:
             logger.error(f"❌ Driver setup hatası: {e}")
             return False
 
+    def acquire_session_slot(self):
+        """Ortak sınırlayıcıdan oturum slotu al (devre açıksa hemen hata verir)"""
+        if not self.has_session_slot:
+            governor.acquire()
+            self.has_session_slot = True
+
+    def navigate(self, url: str):
+        """Sayfaya git, yükleme hatasını devre kesiciye bildir"""
+        try:
+            self.driver.get(url)
+        except Exception:
+            governor.record_failure()
+            raise
+
     def login_to_icisleri(self, username: str, password: str) -> bool:
         """İçişleri Bakanlığı sitesine giriş yap"""
+        self.acquire_session_slot()
         try:
             if not self.driver:
                 if not self.setup_driver():
@@ -95,14 +115,17 @@ class IcisleriBot:
             time.sleep(3)
             if "Login" not in self.driver.current_url:
                 self.is_logged_in = True
+                governor.record_success()
                 logger.info("✅ İçişleri Bakanlığı sistemine başarıyla giriş yapıldı")
                 return True
             else:
                 logger.error("❌ Giriş başarısız - Login sayfasında kaldı")
+                governor.record_failure()
                 return False
 
         except Exception as e:
             logger.error(f"❌ İçişleri giriş hatası: {e}")
+            governor.record_failure()
             return False
 
     def get_member_info(self, identity_number: str) -> Dict[str, Any]:
@@ -114,7 +137,7 @@ class IcisleriBot:
             logger.info(f"🔍 Kimlik numarası {identity_number} için bilgiler aranıyor...")
             # Üye ekleme sayfasına git
             url = f"https://asilah.icisleri.gov.ct.tr/AvcilikAticilikDernekUye/Yeni?kimlikNumarasi={identity_number}"
-            self.driver.get(url)
+            self.navigate(url)
             logger.info("📄 Üye bilgi sayfası yüklendi")
 
             # Sayfanın yüklenmesini bekle
@@ -215,10 +238,10 @@ class IcisleriBot:
 
         except Exception as e:
             logger.error(f"❌ Bilgi çekme hatası: {e}")
-            return {"error": f"Bilgi çekme hatası: {str(e)}"}
+            return {"error": f"Bilgi çekme hatası: {str(e)}", "transient": True}
 
     def close(self):
-        """Driver'ı kapat"""
+        """Driver'ı kapat ve oturum slotunu bırak"""
         try:
             if self.driver:
                 logger.info("🔒 ChromeDriver kapatılıyor...")
@@ -226,9 +249,15 @@ class IcisleriBot:
                 logger.info("✅ ChromeDriver kapatıldı")
         except:
             pass
-
-def fetch_member_info_from_icisleri(identity_number: str) -> Dict[str, Any]:
-    """İçişleri Bakanlığı sitesinden üye bilgilerini çek"""
+        finally:
+            self.driver = None
+            self.is_logged_in = False
+            if self.has_session_slot:
+                governor.release()
+                self.has_session_slot = False
+
+def _fetch_member_info_blocking(identity_number: str) -> Dict[str, Any]:
+    """Kendi tarayıcı bağlamında giriş yapıp üye bilgilerini çek (engelleyen adımlar)"""
     logger.info(f"🚀 Kimlik numarası {identity_number} için bilgi çekme işlemi başlatılıyor...")
     bot = IcisleriBot(headless=True)
 
@@ -237,7 +266,7 @@ def fetch_member_info_from_icisleri(identity_number: str) -> Dict[str, Any]:
         logger.info("🔐 İçişleri Bakanlığı sistemine giriş yapılıyor...")
         if not bot.login_to_icisleri("gizay.kilicoglu", "1234avfed"):
             logger.error("❌ Giriş başarısız")
-            return {"error": "İçişleri Bakanlığı sitesine giriş başarısız"}
+            return {"error": "İçişleri Bakanlığı sitesine giriş başarısız", "transient": True}
 
         # Bilgileri çek
         logger.info("📋 Üye bilgileri çekiliyor...")
@@ -246,9 +275,30 @@ def fetch_member_info_from_icisleri(identity_number: str) -> Dict[str, Any]:
         logger.info("✅ Bilgi çekme işlemi tamamlandı")
         return member_info
 
-    except Exception as e:
+    except IcisleriUnavailableError as e:
+        # Devre açık/kuyruk dolu: hemen tekrar denemek aynı sonucu verir
         logger.error(f"❌ İşlem hatası: {str(e)}")
         return {"error": f"İşlem hatası: {str(e)}"}
 
+    except Exception as e:
+        logger.error(f"❌ İşlem hatası: {str(e)}")
+        return {"error": f"İşlem hatası: {str(e)}", "transient": True}
+
     finally:
         bot.close()
+
+async def fetch_member_info_from_icisleri_async(identity_number: str) -> Dict[str, Any]:
+    """İçişleri Bakanlığı sitesinden üye bilgilerini izole bir tarayıcı bağlamında çek"""
+    return await driver.run_in_context(_fetch_member_info_blocking, identity_number)
+
+async def fetch_members_info_from_icisleri_async(identity_numbers: List[str]) -> List[Dict[str, Any]]:
+    """Birden fazla kimlik numarasını aynı event loop'ta eşzamanlı sorgula"""
+    return await asyncio.gather(*(fetch_member_info_from_icisleri_async(number) for number in identity_numbers))
+
+def fetch_member_info_from_icisleri(identity_number: str) -> Dict[str, Any]:
+    """İçişleri Bakanlığı sitesinden üye bilgilerini çek"""
+    try:
+        return driver.run(fetch_member_info_from_icisleri_async(identity_number))
+    except TimeoutError:
+        logger.error(f"❌ {identity_number} için bilgi çekme zaman aşımına uğradı")
+        return {"error": "İçişleri Bakanlığı sistemi zamanında yanıt vermedi, lütfen tekrar deneyin"}
@@ -0,0 +1,85 @@
+from typing import Dict, Type
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException,
+    ElementClickInterceptedException, ElementNotInteractableException, WebDriverException
+)
+
+
+class IcisleriError(Exception):
+    """İçişleri Bakanlığı sistemi işlemlerinde oluşan sınıflandırılmış hata"""
+    error_type = "unknown"
+
+
+class TransientError(IcisleriError):
+    """Geçici ağ/zaman aşımı hatası - aynı oturumla tekrar denenebilir"""
+    error_type = "transient"
+
+
+class StaleSessionError(IcisleriError):
+    """Oturum düşmüş - aynı tarayıcıda yeniden giriş yapılıp tekrar denenebilir"""
+    error_type = "stale_session"
+
+
+class DomChangedError(IcisleriError):
+    """Sayfa yapısı beklenenden farklı - tekrar denemek sonucu değiştirmez"""
+    error_type = "dom_changed"
+
+
+class BusinessRejectionError(IcisleriError):
+    """İçişleri sistemi işlemi kabul etmedi (ör. dernek bulunamadı) - tekrar denenmez"""
+    error_type = "business_rejection"
+
+
+class RetryPolicy:
+    """Bir hata türü için tekrar deneme politikası"""
+
+    def __init__(self, max_attempts: int = 1, base_delay: float = 0, max_delay: float = 0, relogin: bool = False):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.relogin = relogin
+
+    def delay_for(self, attempt: int) -> float:
+        """`attempt`. denemeden sonra beklenecek süre (üstel artış)"""
+        return min(self.base_delay * (2 ** (attempt - 1)), self.max_delay)
+
+
+RETRY_POLICIES: Dict[Type[IcisleriError], RetryPolicy] = {
+    TransientError: RetryPolicy(max_attempts=3, base_delay=2, max_delay=10),
+    StaleSessionError: RetryPolicy(max_attempts=2, base_delay=1, max_delay=1, relogin=True),
+    DomChangedError: RetryPolicy(max_attempts=1),
+    BusinessRejectionError: RetryPolicy(max_attempts=1),
+    IcisleriError: RetryPolicy(max_attempts=1),
+}
+
+
+def get_retry_policy(error: IcisleriError) -> RetryPolicy:
+    """Hatanın türüne uygun tekrar deneme politikasını döndür"""
+    for error_class in type(error).__mro__:
+        if error_class in RETRY_POLICIES:
+            return RETRY_POLICIES[error_class]
+    return RETRY_POLICIES[IcisleriError]
+
+
+def classify_exception(error: Exception, driver=None, message: str = None) -> IcisleriError:
+    """Selenium/ağ hatasını sınıflandırılmış İçişleri hatasına çevir"""
+    if isinstance(error, IcisleriError):
+        return error
+
+    message = message or str(error)
+
+    # Giriş sayfasına yönlendirildiysek oturum düşmüştür
+    try:
+        if driver is not None and "Login" in driver.current_url:
+            return StaleSessionError(message)
+    except Exception:
+        pass
+
+    if isinstance(error, TimeoutException):
+        return TransientError(message)
+    if isinstance(error, (NoSuchElementException, StaleElementReferenceException,
+                          ElementClickInterceptedException, ElementNotInteractableException)):
+        return DomChangedError(message)
+    if isinstance(error, WebDriverException) and ("net::" in str(error) or "timeout" in str(error).lower()):
+        return TransientError(message)
+    return IcisleriError(message)
@@ -0,0 +1,175 @@
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class IcisleriUnavailableError(Exception):
+    """İçişleri Bakanlığı sitesine şu an oturum açılamıyor (devre açık veya kuyruk zaman aşımı)"""
+
+
+class CircuitOpenError(IcisleriUnavailableError):
+    """Devre kesici açık - site geçici olarak erişilemez kabul ediliyor"""
+
+
+class QueueTimeoutError(IcisleriUnavailableError):
+    """Boş oturum için bekleme süresi doldu"""
+
+
+class QueueFullError(IcisleriUnavailableError):
+    """Bekleme kuyruğu dolu - istek sıraya alınmadan reddedildi"""
+
+
+class IcisleriGovernor:
+    """İçişleri botları için ortak eşzamanlılık sınırlayıcı ve devre kesici
+
+    - Aynı anda en fazla `max_sessions` Chrome oturumu açılır.
+    - Bekleyen istekler FIFO sırasıyla (adil) slot alır, `queue_timeout` saniye sonra vazgeçilir.
+      Sırada en fazla `max_waiting` istek bekler, kuyruk doluyken gelen istek beklemeden reddedilir.
+    - Art arda `failure_threshold` giriş/sayfa hatasından sonra devre açılır ve istekler
+      beklemeden reddedilir. `recovery_timeout` sonra devre yarı açık olur ve
+      `half_open_max_probes` kadar deneme isteğine izin verilir; başarılı olursa kapanır.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, max_sessions: int = 2, queue_timeout: float = 60, max_waiting: int = 8,
+                 failure_threshold: int = 3, recovery_timeout: float = 120,
+                 half_open_max_probes: int = 1):
+        self.max_sessions = max_sessions
+        self.queue_timeout = queue_timeout
+        self.max_waiting = max_waiting
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_probes = half_open_max_probes
+
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._waiters = deque()
+        self._active = 0
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_probes = 0
+        self._probe_started_at = 0.0
+
+    @classmethod
+    def from_config(cls) -> 'IcisleriGovernor':
+        """Config'deki GOVERNOR_CONFIG ayarlarıyla oluştur"""
+        try:
+            from config import GOVERNOR_CONFIG
+        except ImportError:
+            GOVERNOR_CONFIG = {}
+
+        return cls(
+            max_sessions=GOVERNOR_CONFIG.get('max_sessions', 2),
+            queue_timeout=GOVERNOR_CONFIG.get('queue_timeout', 60),
+            max_waiting=GOVERNOR_CONFIG.get('max_waiting', 8),
+            failure_threshold=GOVERNOR_CONFIG.get('failure_threshold', 3),
+            recovery_timeout=GOVERNOR_CONFIG.get('recovery_timeout', 120),
+            half_open_max_probes=GOVERNOR_CONFIG.get('half_open_max_probes', 1)
+        )
+
+    # Devre kesici
+    def _check_circuit(self):
+        """Devre durumunu kontrol et, açıksa hemen hata ver (kilit tutulurken çağrılır)"""
+        if self._state == self.OPEN:
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                logger.info("🟡 Devre kesici yarı açık duruma geçti")
+                self._state = self.HALF_OPEN
+                self._half_open_probes = 0
+            else:
+                raise CircuitOpenError("İçişleri Bakanlığı sistemi geçici olarak erişilemiyor, lütfen daha sonra tekrar deneyin")
+
+        if self._state == self.HALF_OPEN:
+            # Sonuç bildirmeden kaybolan deneme isteği devreyi kilitlemesin
+            if time.monotonic() - self._probe_started_at >= self.recovery_timeout:
+                self._half_open_probes = 0
+            if self._half_open_probes >= self.half_open_max_probes:
+                raise CircuitOpenError("İçişleri Bakanlığı sistemi kontrol ediliyor, lütfen birazdan tekrar deneyin")
+            self._half_open_probes += 1
+            self._probe_started_at = time.monotonic()
+
+    def record_success(self):
+        """Başarılı giriş/sayfa yüklemesini kaydet"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("🟢 Devre kesici kapandı")
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_probes = 0
+
+    def record_failure(self):
+        """Başarısız giriş/sayfa yüklemesini kaydet"""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"🔴 Devre kesici açıldı ({self._consecutive_failures} ardışık hata)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    # Eşzamanlılık sınırlayıcı
+    def acquire(self, timeout: float = None):
+        """Bir oturum slotu al, gerekirse sırayla bekle"""
+        timeout = self.queue_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            # Slot hemen alınamayacaksa ve kuyruk doluysa sıraya girmeden reddet
+            if (self._waiters or self._active >= self.max_sessions) and len(self._waiters) >= self.max_waiting:
+                raise QueueFullError("İçişleri Bakanlığı sistemi şu an yoğun, lütfen daha sonra tekrar deneyin")
+
+            self._check_circuit()
+
+            ticket = object()
+            self._waiters.append(ticket)
+            try:
+                while self._waiters[0] is not ticket or self._active >= self.max_sessions:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise QueueTimeoutError("İçişleri Bakanlığı sistemi şu an yoğun, lütfen daha sonra tekrar deneyin")
+                    self._condition.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._condition.notify_all()
+
+            self._active += 1
+
+    def release(self):
+        """Oturum slotunu bırak"""
+        with self._condition:
+            if self._active > 0:
+                self._active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def session(self, timeout: float = None):
+        """Slot alıp blok bitince bırakan context manager"""
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Anlık durum bilgisi"""
+        with self._lock:
+            return {
+                "state": self._state,
+                "active_sessions": self._active,
+                "waiting": len(self._waiters),
+                "max_sessions": self.max_sessions,
+                "consecutive_failures": self._consecutive_failures
+            }
+
+
+# Tüm botların paylaştığı tek örnek
+governor = IcisleriGovernor.from_config()
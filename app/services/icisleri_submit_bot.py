@@ -1,6 +1,6 @@
 import time
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,6 +10,12 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
+from app.services.icisleri_governor import governor
+from app.services.icisleri_async import driver
+from app.services.icisleri_errors import (
+    IcisleriError, TransientError, StaleSessionError, DomChangedError, BusinessRejectionError,
+    classify_exception, get_retry_policy
+)
 
 # Logging ayarları
 import os
@@ -55,6 +61,9 @@ class IcisleriSubmitBot:
     def __init__(self, headless=None, progress_callback=None):  # Headless değeri config'den alınacak
         self.driver = None
         self.is_logged_in = False
+        self.has_session_slot = False
+        self.credentials = None
+        self.save_clicked = False
         self.headless = headless
         self.progress_callback = progress_callback
 
@@ -142,8 +151,24 @@ class IcisleriSubmitBot:
             logger.error(f"❌ Driver setup hatası: {e}")
             return False
 
+    def acquire_session_slot(self):
+        """Ortak sınırlayıcıdan oturum slotu al (devre açıksa hemen hata verir)"""
+        if not self.has_session_slot:
+            governor.acquire()
+            self.has_session_slot = True
+
+    def navigate(self, url: str):
+        """Sayfaya git, yükleme hatasını devre kesiciye bildir"""
+        try:
+            self.driver.get(url)
+        except Exception:
+            governor.record_failure()
+            raise
+
     def login_to_icisleri(self, username: str, password: str) -> bool:
         """İçişleri Bakanlığı sitesine giriş yap"""
+        self.acquire_session_slot()
+        self.credentials = (username, password)
         try:
             if not self.driver:
                 if not self.setup_driver():
@@ -188,6 +213,7 @@ class IcisleriSubmitBot:
             time.sleep(3)
             if "Login" not in self.driver.current_url:
                 self.is_logged_in = True
+                governor.record_success()
                 if self.progress_callback:
                     self.progress_callback("İçişleri Bakanlığı sistemine başarıyla giriş yapıldı", 30)
                 logger.info("✅ İçişleri Bakanlığı sistemine başarıyla giriş yapıldı")
@@ -196,25 +222,67 @@ class IcisleriSubmitBot:
                 if self.progress_callback:
                     self.progress_callback("Giriş başarısız oldu", 30)
                 logger.error("❌ Giriş başarısız oldu")
+                governor.record_failure()
                 return False
 
         except Exception as e:
             logger.error(f"❌ Giriş hatası: {e}")
+            governor.record_failure()
             return False
 
     def submit_member_to_icisleri(self, member_data: Dict[str, Any], association_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Üyeyi İçişleri Bakanlığı sistemine kaydet"""
+        """Üyeyi İçişleri Bakanlığı sistemine kaydet
+
+        Hatalar türüne göre sınıflandırılır ve RETRY_POLICIES'e göre aynı tarayıcı oturumu
+        kullanılarak tekrar denenir. Kaydet butonuna tıklandıktan sonra oluşan hatalar,
+        çift kayıt riskine karşı tekrar denenmez.
+        """
+        attempts = {}
+        while True:
+            self.save_clicked = False
+            try:
+                return self._submit_member_attempt(member_data, association_data)
+            except Exception as e:
+                error = classify_exception(e, self.driver)
+
+            policy = get_retry_policy(error)
+            attempt = attempts[type(error)] = attempts.get(type(error), 0) + 1
+            logger.warning(f"⚠️ Gönderim hatası ({error.error_type}, deneme {attempt}/{policy.max_attempts}): {error}")
+
+            if self.save_clicked or attempt >= policy.max_attempts:
+                return {"success": False, "message": str(error), "error_type": error.error_type}
+
+            delay = policy.delay_for(attempt)
+            if self.progress_callback:
+                self.progress_callback(f"Geçici hata, {delay:.0f} saniye sonra tekrar denenecek...", 35)
+            time.sleep(delay)
+
+            if policy.relogin:
+                self.is_logged_in = False
+                if self.credentials is None:
+                    # Daha önce giriş yapılmadıysa yenilenecek oturum yok
+                    return {"success": False, "message": "Oturum yenilenemedi, önce giriş yapılmalı",
+                            "error_type": error.error_type}
+                username, password = self.credentials
+                if not self.login_to_icisleri(username, password):
+                    return {"success": False, "message": "Oturum yenilenemedi, İçişleri Bakanlığı sistemine giriş yapılamadı",
+                            "error_type": error.error_type}
+
+    def _submit_member_attempt(self, member_data: Dict[str, Any], association_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Üye kaydını tek seferde dene, başarısızlıkta sınıflandırılmış hata fırlat"""
         try:
             if not self.is_logged_in:
                 logger.error("❌ Önce giriş yapılmalı")
-                return {"success": False, "message": "Sisteme giriş yapılmamış"}
+                raise StaleSessionError("Sisteme giriş yapılmamış")
 
             if self.progress_callback:
                 self.progress_callback("Üye kayıt sayfasına gidiliyor...", 35)
             logger.info("📝 Üye kayıt sayfasına gidiliyor...")
             # Üye ekleme sayfasına git
             url = f"https://asilah.icisleri.gov.ct.tr/AvcilikAticilikDernekUye/Yeni?kimlikNumarasi={member_data['identityNumber']}"
-            self.driver.get(url)
+            self.navigate(url)
+            if "Login" in self.driver.current_url:
+                raise StaleSessionError("Oturum sona ermiş, giriş sayfasına yönlendirildi")
             logger.info("📄 Üye kayıt sayfası yüklendi")
 
             # Sayfanın yüklenmesini bekle
@@ -249,16 +317,10 @@ class IcisleriSubmitBot:
                 logger.info("✅ Dernek listesi tablosu bulundu")
             except TimeoutException:
                 logger.error("❌ Dernek listesi tablosu bulunamadı")
-                return {
-                    "success": False,
-                    "message": "Dernek listesi tablosu bulunamadı. XPath kontrol edilmeli."
-                }
+                raise TransientError("Dernek listesi tablosu bulunamadı. XPath kontrol edilmeli.")
             except Exception as e:
                 logger.error(f"❌ Dernek listesi tablosu hatası: {e}")
-                return {
-                    "success": False,
-                    "message": f"Dernek listesi tablosu hatası: {str(e)}"
-                }
+                raise classify_exception(e, self.driver, f"Dernek listesi tablosu hatası: {str(e)}")
 
                         # Tablo satırlarını al
             try:
@@ -267,16 +329,12 @@ class IcisleriSubmitBot:
 
                 if len(table_rows) == 0:
                     logger.error("❌ Tablo satırı bulunamadı")
-                    return {
-                        "success": False,
-                        "message": "Dernek tablosunda satır bulunamadı"
-                    }
+                    raise BusinessRejectionError("Dernek tablosunda satır bulunamadı")
+            except IcisleriError:
+                raise
             except Exception as e:
                 logger.error(f"❌ Tablo satırları okuma hatası: {e}")
-                return {
-                    "success": False,
-                    "message": f"Tablo satırları okuma hatası: {str(e)}"
-                }
+                raise classify_exception(e, self.driver, f"Tablo satırları okuma hatası: {str(e)}")
 
             # Aranacak dernek adı
             target_dernek_name = association_data.get('name', '')
@@ -318,10 +376,7 @@ class IcisleriSubmitBot:
 
             if not dernek_found:
                 logger.error(f"❌ Dernek bulunamadı: {target_dernek_name}")
-                return {
-                    "success": False,
-                    "message": f"Dernek bulunamadı: {target_dernek_name}. Mevcut dernekler kontrol edilmeli."
-                }
+                raise BusinessRejectionError(f"Dernek bulunamadı: {target_dernek_name}. Mevcut dernekler kontrol edilmeli.")
 
             # Dernek seçimini kaydet butonuna tıkla
             logger.info("💾 Dernek seçimini kaydet butonuna tıklanıyor...")
@@ -481,15 +536,13 @@ class IcisleriSubmitBot:
 
                 # JavaScript ile tıkla (daha güvenilir)
                 self.driver.execute_script("arguments[0].click();", save_button)
+                self.save_clicked = True
                 if self.progress_callback:
                     self.progress_callback("Kaydetme işlemi bekleniyor...", 85)
                 logger.info("⏳ Kaydetme işlemi bekleniyor...")
             except Exception as e:
                 logger.error(f"❌ Kaydet butonu hatası: {e}")
-                return {
-                    "success": False,
-                    "message": f"Kaydet butonu hatası: {str(e)}"
-                }
+                raise classify_exception(e, self.driver, f"Kaydet butonu hatası: {str(e)}")
 
             # POST işleminin tamamlanmasını bekle
             time.sleep(5)
@@ -529,10 +582,7 @@ class IcisleriSubmitBot:
 
             if not modal_found:
                 logger.error("❌ Modal bulunamadı")
-                return {
-                    "success": False,
-                    "message": "Modal bulunamadı, işlem başarısız olabilir"
-                }
+                raise DomChangedError("Modal bulunamadı, işlem başarısız olabilir")
 
             # Modal mesajını al
             try:
@@ -559,20 +609,48 @@ class IcisleriSubmitBot:
 
             except Exception as e:
                 logger.error(f"❌ Modal işlemi hatası: {e}")
-                return {
-                    "success": False,
-                    "message": f"Modal işlemi hatası: {str(e)}"
-                }
+                raise classify_exception(e, self.driver, f"Modal işlemi hatası: {str(e)}")
 
+        except IcisleriError:
+            raise
         except Exception as e:
             logger.error(f"❌ Üye kaydetme hatası: {e}")
-            return {
-                "success": False,
-                "message": f"Üye kaydetme hatası: {str(e)}"
-            }
+            raise classify_exception(e, self.driver, f"Üye kaydetme hatası: {str(e)}")
 
     def close(self):
-        """Driver'ı kapat"""
-        if self.driver:
-            self.driver.quit()
-            logger.info("🔒 Driver kapatıldı")
+        """Driver'ı kapat ve oturum slotunu bırak"""
+        try:
+            if self.driver:
+                self.driver.quit()
+                logger.info("🔒 Driver kapatıldı")
+        finally:
+            self.driver = None
+            self.is_logged_in = False
+            if self.has_session_slot:
+                governor.release()
+                self.has_session_slot = False
+
+def _submit_member_blocking(member_data: Dict[str, Any], association_data: Dict[str, Any],
+                            progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """Kendi tarayıcı bağlamında giriş yapıp üyeyi kaydet (engelleyen adımlar)"""
+    try:
+        from config import ICISLERI_CONFIG
+    except ImportError:
+        return {"success": False, "message": "Konfigürasyon dosyası bulunamadı"}
+
+    bot = IcisleriSubmitBot(progress_callback=progress_callback)
+    try:
+        if not bot.login_to_icisleri(ICISLERI_CONFIG['username'], ICISLERI_CONFIG['password']):
+            return {"success": False, "message": "İçişleri Bakanlığı sistemine giriş yapılamadı"}
+
+        return bot.submit_member_to_icisleri(member_data, association_data)
+    except Exception as e:
+        logger.error(f"❌ Gönderim hatası: {e}")
+        return {"success": False, "message": f"İçişleri Bakanlığı sistemi hatası: {str(e)}"}
+    finally:
+        bot.close()
+
+async def submit_member_to_icisleri_async(member_data: Dict[str, Any], association_data: Dict[str, Any],
+                                          progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """Üyeyi izole bir tarayıcı bağlamında İçişleri Bakanlığı sistemine kaydet"""
+    return await driver.run_in_context(_submit_member_blocking, member_data, association_data, progress_callback)
@@ -1,9 +1,16 @@
 import jwt
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from flask import current_app
 from app.models import User, Association
 
+# (secret, token) -> doğrulanmış payload; token süresi dolana kadar geçerlidir
+_verified_tokens: 'OrderedDict[Tuple[str, str], Dict[str, Any]]' = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
 def create_token(user_data: Dict[str, Any], user_type: str = "admin") -> str:
     """JWT token oluştur"""
     payload = {
@@ -14,6 +21,10 @@ def create_token(user_data: Dict[str, Any], user_type: str = "admin") -> str:
         'iat': datetime.utcnow()
     }
 
+    # Admin rolü token'a yazılır, yönetici kontrolü veritabanına gitmeden yapılır
+    if user_type == 'admin' and user_data.get('role'):
+        payload['role'] = user_data['role']
+
     token = jwt.encode(
         payload,
         current_app.config['JWT_SECRET_KEY'],
@@ -23,19 +34,36 @@ def create_token(user_data: Dict[str, Any], user_type: str = "admin") -> str:
     return token
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
-    """JWT token doğrula"""
+    """JWT token doğrula (doğrulanmış token'lar LRU önbellekte tutulur)"""
+    secret = current_app.config['JWT_SECRET_KEY']
+    key = (secret, token)
+
+    with _verified_tokens_lock:
+        payload = _verified_tokens.get(key)
+        if payload is not None:
+            if payload['exp'] > time.time():
+                _verified_tokens.move_to_end(key)
+                return payload
+            del _verified_tokens[key]
+
     try:
         payload = jwt.decode(
             token,
-            current_app.config['JWT_SECRET_KEY'],
+            secret,
             algorithms=['HS256']
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    with _verified_tokens_lock:
+        _verified_tokens[key] = payload
+        while len(_verified_tokens) > current_app.config['TOKEN_CACHE_SIZE']:
+            _verified_tokens.popitem(last=False)
+
+    return payload
+
 def get_user_from_token(token: str) -> Optional[Dict[str, Any]]:
     """Token'dan kullanıcı bilgilerini al"""
     payload = verify_token(token)
@@ -45,7 +73,8 @@ def get_user_from_token(token: str) -> Optional[Dict[str, Any]]:
     return {
         'user_id': payload['user_id'],
         'username': payload['username'],
-        'user_type': payload['user_type']
+        'user_type': payload['user_type'],
+        'role': payload.get('role')  # Eski token'larda bulunmaz
     }
 
 def create_admin_token(user) -> str:
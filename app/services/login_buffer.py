@@ -0,0 +1,105 @@
+import time
+import atexit
+import threading
+import logging
+from typing import Dict, List, Tuple
+from flask import current_app
+from app.services.db import write_login_timestamps, LOGIN_TIMESTAMP_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class LoginTimestampBuffer:
+    """Son giriş zamanlarını bellekte biriktirip toplu yazan tampon
+
+    Giriş isteği yalnızca tampona kayıt ekler, yazma kilidini beklemez. Tampon
+    `flush_interval` saniyede bir veya `max_pending` giriş birikince tek transaction'da
+    yazılır; uygulama kapanırken kalanlar da yazılır. Aynı kullanıcının art arda
+    girişlerinden yalnızca sonuncusu yazılır.
+    """
+
+    def __init__(self, flush_interval: float = 5, max_pending: int = 100):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Uygulama -> {(tablo, id): zaman}
+        self._pending: Dict[object, Dict[Tuple[str, str], int]] = {}
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls) -> 'LoginTimestampBuffer':
+        """Config'deki LOGIN_BUFFER_CONFIG ayarlarıyla oluştur"""
+        try:
+            from config import LOGIN_BUFFER_CONFIG
+        except ImportError:
+            LOGIN_BUFFER_CONFIG = {}
+
+        return cls(
+            flush_interval=LOGIN_BUFFER_CONFIG.get('flush_interval', 5),
+            max_pending=LOGIN_BUFFER_CONFIG.get('max_pending', 100)
+        )
+
+    def _ensure_started(self):
+        """Periyodik yazma thread'ini gerekirse başlat (kilit tutulurken çağrılır)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='login-buffer', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        """Tamponu periyodik olarak veya dolduğunda yaz"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def record(self, table: str, record_id: str):
+        """Girişi tampona ekle (tablo: users, admin_users veya associations)"""
+        if table not in LOGIN_TIMESTAMP_COLUMNS:
+            raise ValueError(f"Bilinmeyen tablo: {table}")
+
+        app = current_app._get_current_object()
+        with self._lock:
+            self._ensure_started()
+            entries = self._pending.setdefault(app, {})
+            if (table, record_id) not in entries:
+                self._pending_count += 1
+            entries[(table, record_id)] = int(time.time())
+            full = self._pending_count >= self.max_pending
+
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Biriken girişleri veritabanına yaz"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._pending_count = self._pending, {}, 0
+
+            for app, entries in pending.items():
+                logins: Dict[str, List[Tuple[int, str]]] = {}
+                for (table, record_id), timestamp in entries.items():
+                    logins.setdefault(table, []).append((timestamp, record_id))
+
+                try:
+                    with app.app_context():
+                        write_login_timestamps(logins)
+                except Exception as e:
+                    logger.warning(f"⚠️ Son giriş zamanları yazılamadı, sonraki denemede tekrar yazılacak: {e}")
+                    self._requeue(app, entries)
+
+    def _requeue(self, app, entries: Dict[Tuple[str, str], int]):
+        """Yazılamayan girişleri, bu arada gelen daha yeni girişleri ezmeden tampona geri koy"""
+        with self._lock:
+            current = self._pending.setdefault(app, {})
+            for key, timestamp in entries.items():
+                if key not in current:
+                    current[key] = timestamp
+                    self._pending_count += 1
+
+
+# Tüm istekler tarafından paylaşılan tampon
+login_buffer = LoginTimestampBuffer.from_config()
@@ -0,0 +1,79 @@
+import io
+import csv
+import tempfile
+from typing import Dict, Iterator, Optional, Tuple
+from openpyxl import Workbook
+from app.services.db import iter_member_rows
+
+# Dışa aktarım sütunları: (başlık, satırdan değeri alan fonksiyon)
+EXPORT_COLUMNS = [
+    ('Kimlik No', lambda row: row.identityNumber),
+    ('Ad', lambda row: row.firstName),
+    ('Soyad', lambda row: row.lastName),
+    ('İkinci Ad', lambda row: row.middleName),
+    ('Doğum Soyadı', lambda row: row.birthSurname),
+    ('Cinsiyet', lambda row: row.gender),
+    ('Doğum Yeri', lambda row: row.birthPlace),
+    ('Anne Adı', lambda row: row.motherName),
+    ('Doğum Tarihi', lambda row: row.birthDate),
+    ('Baba Adı', lambda row: row.fatherName),
+    ('İlçe', lambda row: row.district),
+    ('Mahalle', lambda row: row.neighborhood),
+    ('Cadde/Sokak', lambda row: row.street),
+    ('Bina', lambda row: row.buildingNameOrNumber),
+    ('Dış Kapı No', lambda row: row.doorNumber),
+    ('İç Kapı No', lambda row: row.apartmentNumber),
+    ('Telefon', lambda row: row.phoneNumber),
+    ('GSM', lambda row: f"{row.gsmCountryCode}{row.gsmOperatorCode}{row.gsmNumber}"),
+    ('Üyelik Yılı', lambda row: row.membershipYear),
+]
+
+EXPORT_HEADERS = [header for header, _ in EXPORT_COLUMNS]
+
+# Akışta tek seferde gönderilen satır sayısı
+CSV_CHUNK_ROWS = 500
+
+# Excel dosyası bu boyutu aşarsa bellekten geçici dosyaya taşınır (byte)
+EXCEL_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXCEL_SHEET_NAME = 'Üyeler'
+
+def iter_export_values(association_id: str, filters: Optional[Dict[str, str]] = None) -> Iterator[list]:
+    """Derneğin üyelerini dışa aktarım sütun sırasıyla değer listeleri olarak üret"""
+    getters = [getter for _, getter in EXPORT_COLUMNS]
+    for row in iter_member_rows('export', association_id, filters=filters):
+        yield [getter(row) for getter in getters]
+
+def iter_members_csv(association_id: str) -> Iterator[bytes]:
+    """Üyeleri UTF-8 BOM'lu CSV olarak parça parça üret"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    # Excel'in Türkçe karakterleri doğru açması için BOM
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_HEADERS)
+
+    for index, values in enumerate(iter_export_values(association_id), 1):
+        writer.writerow(values)
+        if index % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode('utf-8')
+
+def write_members_xlsx(association_id: str,
+                       filters: Optional[Dict[str, str]] = None) -> Tuple[tempfile.SpooledTemporaryFile, int]:
+    """Üyeleri openpyxl write-only modunda Excel'e yaz; başa sarılmış dosyayı ve satır sayısını döndür"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(EXCEL_SHEET_NAME)
+    sheet.append(EXPORT_HEADERS)
+
+    row_count = 0
+    for values in iter_export_values(association_id, filters):
+        sheet.append(values)
+        row_count += 1
+
+    output = tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE, suffix='.xlsx')
+    workbook.save(output)
+    output.seek(0)
+    return output, row_count
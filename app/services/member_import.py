@@ -0,0 +1,154 @@
+import os
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+import pandas as pd
+from app.services.db import MEMBER_IMPORT_COLUMNS, upsert_members
+
+# Tek dosyada içe aktarılabilecek en fazla satır
+MAX_IMPORT_ROWS = 10000
+
+ALLOWED_IMPORT_EXTENSIONS = {'.csv', '.xlsx'}
+
+# Dışa aktarım başlığı -> üye alanı ('GSM' tek sütundan üç alana ayrılır)
+IMPORT_HEADERS = {
+    'Kimlik No': 'identityNumber',
+    'Uyruk': 'nationality',
+    'Ad': 'firstName',
+    'Soyad': 'lastName',
+    'İkinci Ad': 'middleName',
+    'Doğum Soyadı': 'birthSurname',
+    'Cinsiyet': 'gender',
+    'Doğum Yeri': 'birthPlace',
+    'Anne Adı': 'motherName',
+    'Doğum Tarihi': 'birthDate',
+    'Baba Adı': 'fatherName',
+    'İlçe': 'district',
+    'Mahalle': 'neighborhood',
+    'Cadde/Sokak': 'street',
+    'Bina': 'buildingNameOrNumber',
+    'Dış Kapı No': 'doorNumber',
+    'İç Kapı No': 'apartmentNumber',
+    'Telefon': 'phoneNumber',
+    'GSM': 'gsm',
+    'Üyelik Yılı': 'membershipYear',
+}
+
+REQUIRED_HEADERS = ('Kimlik No', 'Ad', 'Soyad')
+
+# Kabul edilen doğum tarihi biçimleri (hepsi YYYY-MM-DD olarak saklanır)
+BIRTH_DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S')
+
+# Member modelindeki varsayılan GSM
+DEFAULT_GSM = ('+90', '533', '0000000')
+
+
+class MemberImportError(Exception):
+    """Dosya bütünüyle okunamadı (biçim, başlık veya boyut hatası)"""
+
+
+def read_member_file(stream, filename: str) -> pd.DataFrame:
+    """Yüklenen CSV/XLSX dosyasını tüm hücreler metin olacak şekilde oku"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in ALLOWED_IMPORT_EXTENSIONS:
+        raise MemberImportError('Yalnızca .csv veya .xlsx dosyaları yüklenebilir')
+
+    try:
+        if extension == '.csv':
+            # Türkçe Excel CSV'yi ';' ile kaydettiği için ayraç otomatik bulunur
+            frame = pd.read_csv(stream, dtype=str, keep_default_na=False, encoding='utf-8-sig',
+                                sep=None, engine='python')
+        else:
+            frame = pd.read_excel(stream, dtype=str, keep_default_na=False)
+    except Exception as e:
+        raise MemberImportError(f'Dosya okunamadı: {e}')
+
+    frame.columns = [str(column).strip() for column in frame.columns]
+    missing = [header for header in REQUIRED_HEADERS if header not in frame.columns]
+    if missing:
+        raise MemberImportError(f"Eksik sütunlar: {', '.join(missing)}")
+    if len(frame) > MAX_IMPORT_ROWS:
+        raise MemberImportError(f'Bir dosyada en fazla {MAX_IMPORT_ROWS} üye içe aktarılabilir')
+
+    return frame
+
+def _parse_birth_dates(values: pd.Series) -> pd.Series:
+    """Desteklenen biçimlerdeki tarihleri ayrıştır (ayrıştırılamayanlar NaT olur)"""
+    # Saniye çözünürlüğü, nanosaniyenin taşacağı uzak yılları (ör. 2999) da tutabilir
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[s]')
+    for date_format in BIRTH_DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors='coerce').astype('datetime64[s]')
+    return parsed
+
+def validate_members(frame: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Satırları sütun bazında (vektörel) doğrula; (geçerli satırlar, satır hataları) döndür"""
+    frame = frame.rename(columns=IMPORT_HEADERS)
+    for field in set(IMPORT_HEADERS.values()):
+        if field not in frame.columns:
+            frame[field] = ''
+    frame = frame[list(IMPORT_HEADERS.values())].apply(lambda column: column.astype(str).str.strip())
+
+    # Excel sayı hücrelerinden gelen ".0" ekleri
+    for field in ('identityNumber', 'membershipYear'):
+        frame[field] = frame[field].str.replace(r'\.0$', '', regex=True)
+
+    checks = {}
+
+    identity = frame['identityNumber']
+    checks['Kimlik numarası 1-11 haneli rakamlardan oluşmalıdır'] = ~identity.str.fullmatch(r'\d{1,11}')
+    checks['Kimlik numarası dosyada birden fazla kez geçiyor'] = identity.duplicated(keep=False) & (identity != '')
+    checks['Ad zorunludur'] = frame['firstName'] == ''
+    checks['Soyad zorunludur'] = frame['lastName'] == ''
+
+    birth_dates = _parse_birth_dates(frame['birthDate'])
+    has_birth_date = frame['birthDate'] != ''
+    checks['Doğum tarihi geçersiz (GG.AA.YYYY veya YYYY-AA-GG olmalı)'] = has_birth_date & birth_dates.isna()
+    checks['Doğum tarihi gelecekte olamaz'] = birth_dates > pd.Timestamp(datetime.now())
+    frame['birthDate'] = birth_dates.dt.strftime('%Y-%m-%d').where(birth_dates.notna(), '')
+
+    phone = frame['phoneNumber'].str.replace(r'[\s\-()]', '', regex=True)
+    checks['Telefon numarası geçersiz'] = (phone != '') & ~phone.str.fullmatch(r'\+?\d{7,15}')
+    frame['phoneNumber'] = phone
+
+    # GSM: +90XXXXXXXXXX, 0XXXXXXXXXX veya XXXXXXXXXX (ülke kodu yoksa +90)
+    gsm = frame['gsm'].str.replace(r'[\s\-()]', '', regex=True)
+    gsm = gsm.str.replace(r'^0?(?=\d{10}$)', '+90', regex=True)
+    parts = gsm.str.extract(r'^(\+\d{1,3})(\d{3})(\d{7})$')
+    checks['GSM numarası geçersiz (+90XXXXXXXXXX biçiminde olmalı)'] = (gsm != '') & parts[0].isna()
+    for index, field in enumerate(('gsmCountryCode', 'gsmOperatorCode', 'gsmNumber')):
+        frame[field] = parts[index].fillna(DEFAULT_GSM[index])
+
+    frame['membershipYear'] = frame['membershipYear'].mask(frame['membershipYear'] == '', str(datetime.now().year))
+    checks['Üyelik yılı dört haneli olmalıdır'] = ~frame['membershipYear'].str.fullmatch(r'\d{4}')
+
+    frame['nationality'] = frame['nationality'].mask(frame['nationality'] == '', 'KT')
+
+    failed = pd.DataFrame(checks)
+    has_error = failed.any(axis=1)
+
+    errors = []
+    for index in failed.index[has_error]:
+        errors.append({
+            'row': index + 2,  # Başlık satırı ve 1'den başlayan numaralandırma
+            'identityNumber': identity[index],
+            'messages': [message for message, is_failed in failed.loc[index].items() if is_failed]
+        })
+
+    valid_rows = frame.loc[~has_error, list(MEMBER_IMPORT_COLUMNS)].to_dict('records')
+    return valid_rows, errors
+
+def import_members(association_id: str, stream, filename: str) -> Dict[str, Any]:
+    """Dosyayı oku, doğrula ve geçerli satırları derneğe ekle/güncelle"""
+    frame = read_member_file(stream, filename)
+    valid_rows, errors = validate_members(frame)
+    inserted, updated = upsert_members(association_id, valid_rows)
+
+    return {
+        'total': len(frame),
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(valid_rows) - inserted - updated,
+        'errors': errors,
+    }
@@ -0,0 +1,450 @@
+import sqlite3
+import json
+from datetime import datetime
+from typing import List, Optional
+
+# Varsayılan GSM bilgisi (Member modelindeki ile aynı)
+DEFAULT_GSM = {"countryCode": "+90", "operatorCode": "533", "number": "0000000"}
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Tablonun sütun adlarını döndür"""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})').fetchall()]
+
+def _split_member_gsm(conn: sqlite3.Connection):
+    """members.gsm JSON sütununu gsmCountryCode/gsmOperatorCode/gsmNumber sütunlarına ayır"""
+    columns = _table_columns(conn, 'members')
+
+    if 'gsm' in columns:
+        for column in ('gsmCountryCode', 'gsmOperatorCode', 'gsmNumber'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE members ADD COLUMN {column} TEXT')
+
+        updates = []
+        for member_id, gsm_json in conn.execute('SELECT id, gsm FROM members').fetchall():
+            try:
+                gsm = json.loads(gsm_json) if gsm_json else {}
+            except (TypeError, ValueError):
+                gsm = {}
+            updates.append((
+                gsm.get('countryCode', DEFAULT_GSM['countryCode']),
+                gsm.get('operatorCode', DEFAULT_GSM['operatorCode']),
+                gsm.get('number', DEFAULT_GSM['number']),
+                member_id
+            ))
+
+        conn.executemany('''
+            UPDATE members SET gsmCountryCode = ?, gsmOperatorCode = ?, gsmNumber = ?
+            WHERE id = ?
+        ''', updates)
+        conn.execute('ALTER TABLE members DROP COLUMN gsm')
+
+    # Telefon numarasıyla arama için tam numara indeksi
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_members_gsm
+        ON members (gsmCountryCode, gsmOperatorCode, gsmNumber)
+    ''')
+
+def _to_epoch(value) -> Optional[int]:
+    """TEXT olarak saklanmış zamanı epoch saniyesine çevir (boş/geçersiz değerler NULL olur)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value).strip()
+    try:
+        return int(float(value))
+    except ValueError:
+        pass
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        return None
+
+# Zaman sütunları INTEGER olan tablo tanımları
+_EPOCH_TABLES = {
+    'users': ('''
+        CREATE TABLE users_new (
+            id TEXT PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL,
+            lastLoginDate INTEGER
+        )
+    ''', ('lastLoginDate',)),
+    'admin_users': ('''
+        CREATE TABLE admin_users_new (
+            id TEXT PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            role TEXT NOT NULL,
+            email TEXT,
+            is_active BOOLEAN NOT NULL DEFAULT 1,
+            created_at INTEGER,
+            last_login INTEGER
+        )
+    ''', ('created_at', 'last_login')),
+    'associations': ('''
+        CREATE TABLE associations_new (
+            id TEXT PRIMARY KEY,
+            governmentId TEXT NOT NULL,
+            name TEXT NOT NULL,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            last_login INTEGER,
+            typeCode TEXT,
+            typeCodeDescription TEXT,
+            subTypeCode TEXT,
+            subTypeCodeDescription TEXT,
+            oldLegalEntityNumber TEXT,
+            newLegalEntityNumber TEXT
+        )
+    ''', ('last_login',)),
+    'members': ('''
+        CREATE TABLE members_new (
+            id TEXT PRIMARY KEY,
+            identityNumber TEXT NOT NULL,
+            nationality TEXT NOT NULL,
+            firstName TEXT NOT NULL,
+            lastName TEXT NOT NULL,
+            middleName TEXT,
+            birthSurname TEXT,
+            gender TEXT,
+            birthPlace TEXT,
+            motherName TEXT,
+            birthDate TEXT,
+            fatherName TEXT,
+            district TEXT,
+            neighborhood TEXT,
+            street TEXT,
+            buildingNameOrNumber TEXT,
+            doorNumber TEXT,
+            apartmentNumber TEXT,
+            phoneNumber TEXT,
+            gsmCountryCode TEXT,
+            gsmOperatorCode TEXT,
+            gsmNumber TEXT,
+            association TEXT NOT NULL,
+            membershipYear TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            created_at INTEGER,
+            updated_at INTEGER,
+            approved_by TEXT,
+            approved_at INTEGER,
+            rejection_reason TEXT,
+            FOREIGN KEY (association) REFERENCES associations (id)
+        )
+    ''', ('created_at', 'updated_at', 'approved_at')),
+    'receipts': ('''
+        CREATE TABLE receipts_new (
+            id TEXT PRIMARY KEY,
+            memberId TEXT NOT NULL,
+            associationId TEXT NOT NULL,
+            uploadPath TEXT NOT NULL,
+            uploadDate INTEGER NOT NULL,
+            FOREIGN KEY (memberId) REFERENCES members (id),
+            FOREIGN KEY (associationId) REFERENCES associations (id)
+        )
+    ''', ('uploadDate',)),
+}
+
+def _integer_timestamps(conn: sqlite3.Connection):
+    """Zaman sütunlarını INTEGER epoch'a çevir ve tarih aralığı indekslerini oluştur"""
+    conn.create_function('to_epoch', 1, _to_epoch, deterministic=True)
+
+    for table, (create_sql, epoch_columns) in _EPOCH_TABLES.items():
+        column_types = {row[1]: row[2] for row in conn.execute(f'PRAGMA table_info({table})').fetchall()}
+        if all(column_types.get(column) == 'INTEGER' for column in epoch_columns):
+            continue  # Yeni kurulum, tablo zaten INTEGER sütunlarla oluşturulmuş
+
+        # SQLite sütun tipini değiştiremediği için tablo yeniden oluşturulur
+        conn.execute(create_sql)
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table}_new)').fetchall()]
+        select_list = ', '.join(f'to_epoch({column})' if column in epoch_columns else column for column in columns)
+        if table == 'receipts':
+            # Tarihi okunamayan makbuzlar NOT NULL sütuna 0 olarak aktarılır
+            select_list = select_list.replace('to_epoch(uploadDate)', 'COALESCE(to_epoch(uploadDate), 0)')
+        conn.execute(f'INSERT INTO {table}_new ({", ".join(columns)}) SELECT {select_list} FROM {table}')
+        conn.execute(f'DROP TABLE {table}')
+        conn.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_members_gsm
+        ON members (gsmCountryCode, gsmOperatorCode, gsmNumber)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_members_association_created
+        ON members (association, created_at)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_receipts_member_upload
+        ON receipts (memberId, uploadDate)
+    ''')
+
+def _fold_sql(column: str) -> str:
+    """Türkçe ı/İ harflerini i'ye indiren SQL ifadesi (unicode61 İ'yi çevirir ama ı'yı çevirmez)"""
+    return f"replace(replace(COALESCE({column}, ''), 'ı', 'i'), 'İ', 'i')"
+
+def _member_fts_values(prefix: str) -> str:
+    """members satırından members_fts sütun değerlerini üreten SQL ifadeleri"""
+    gsm = (f"COALESCE({prefix}gsmCountryCode, '') || COALESCE({prefix}gsmOperatorCode, '') || COALESCE({prefix}gsmNumber, '')"
+           f" || ' ' || COALESCE({prefix}gsmOperatorCode, '') || COALESCE({prefix}gsmNumber, '')"
+           f" || ' ' || COALESCE({prefix}gsmNumber, '')")
+    return ', '.join([
+        f'{prefix}rowid',
+        _fold_sql(f'{prefix}firstName'),
+        _fold_sql(f'{prefix}middleName'),
+        _fold_sql(f'{prefix}lastName'),
+        f"COALESCE({prefix}identityNumber, '')",
+        f"COALESCE({prefix}phoneNumber, '')",
+        gsm,
+        _fold_sql(f'{prefix}district'),
+        _fold_sql(f'{prefix}neighborhood'),
+    ])
+
+MEMBER_FTS_COLUMNS = 'rowid, firstName, middleName, lastName, identityNumber, phoneNumber, gsm, district, neighborhood'
+
+def rebuild_member_search_index(conn: sqlite3.Connection):
+    """members_fts içeriğini members tablosundan yeniden oluştur (ör. VACUUM sonrası rowid değişirse)"""
+    conn.execute('DELETE FROM members_fts')
+    conn.execute(f'INSERT INTO members_fts ({MEMBER_FTS_COLUMNS}) SELECT {_member_fts_values("")} FROM members')
+
+def member_search_index_diverged(conn: sqlite3.Connection) -> bool:
+    """members_fts satırları members rowid'leriyle eşleşmiyor mu (members rowid'i kararlı değildir; VACUUM/dump-restore değiştirebilir)"""
+    row = conn.execute('''
+        SELECT (SELECT COUNT(*) FROM members) != (SELECT COUNT(*) FROM members_fts)
+            OR EXISTS (
+                SELECT 1 FROM members m LEFT JOIN members_fts f ON f.rowid = m.rowid
+                WHERE f.rowid IS NULL OR f.identityNumber IS NOT COALESCE(m.identityNumber, '')
+            )
+    ''').fetchone()
+    return bool(row[0])
+
+def ensure_member_search_index(conn: sqlite3.Connection):
+    """Arama indeksi members ile uyuşmuyorsa yeniden oluştur (uygulama açılışında çağrılır)"""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'members_fts'").fetchone() is None:
+        return
+    if member_search_index_diverged(conn):
+        with conn:
+            rebuild_member_search_index(conn)
+        print("Üye arama indeksi members tablosuyla uyuşmadığı için yeniden oluşturuldu")
+
+def _member_search_index(conn: sqlite3.Connection):
+    """Üye araması için FTS5 tablosu ve members ile senkron tutan trigger'ları oluştur"""
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS members_fts USING fts5(
+            firstName, middleName, lastName, identityNumber, phoneNumber, gsm, district, neighborhood,
+            tokenize = "unicode61 remove_diacritics 2"
+        )
+    ''')
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_fts_insert AFTER INSERT ON members BEGIN
+            INSERT INTO members_fts ({MEMBER_FTS_COLUMNS}) VALUES ({_member_fts_values("new.")});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_fts_update AFTER UPDATE ON members BEGIN
+            DELETE FROM members_fts WHERE rowid = old.rowid;
+            INSERT INTO members_fts ({MEMBER_FTS_COLUMNS}) VALUES ({_member_fts_values("new.")});
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS members_fts_delete AFTER DELETE ON members BEGIN
+            DELETE FROM members_fts WHERE rowid = old.rowid;
+        END
+    ''')
+
+    rebuild_member_search_index(conn)
+
+def _bump_version_sql(counter: str, association: str) -> str:
+    """Derneğin '<counter>:<id>' sürüm sayacını artıran SQL (trigger gövdesinde kullanılır)"""
+    return f'''
+        INSERT INTO cache_versions (name, version) VALUES ('{counter}:' || {association}, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1;
+    '''
+
+def _member_change_counters(conn: sqlite3.Connection):
+    """Üye değişikliklerinde derneğin 'members:<id>' sürümünü artıran trigger'ları oluştur"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_version_insert AFTER INSERT ON members BEGIN
+            {_bump_version_sql("members", "new.association")}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_version_update AFTER UPDATE ON members BEGIN
+            {_bump_version_sql("members", "new.association")}
+        END
+    ''')
+    # Üye başka bir derneğe taşınırsa eski derneğin dışa aktarımı da değişir
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_version_move AFTER UPDATE OF association ON members
+        WHEN old.association IS NOT new.association BEGIN
+            {_bump_version_sql("members", "old.association")}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS members_version_delete AFTER DELETE ON members BEGIN
+            {_bump_version_sql("members", "old.association")}
+        END
+    ''')
+
+# Aynı kimlikte birden çok üye varsa kalacak kaydın seçim sırası (küçük olan önce)
+_STATUS_PRIORITY_SQL = "CASE status WHEN 'approved' THEN 0 WHEN 'pending' THEN 1 WHEN 'receipt_pending' THEN 1 ELSE 2 END"
+
+# Gönderim kayıtları birleştirilirken hangisinin korunacağı (küçük olan önce)
+_SUBMISSION_PRIORITY = {'succeeded': 0, 'in_progress': 1}
+
+def _merge_member_submissions(conn: sqlite3.Connection, member_id: str, kept_id: str):
+    """Silinecek üyenin gönderim kaydını kalan üyeye aktar; ikisinde de varsa daha ileri durumdaki korunur"""
+    removed = conn.execute('SELECT status FROM member_submissions WHERE member_id = ?', (member_id,)).fetchone()
+    if removed is None:
+        return
+    kept = conn.execute('SELECT status FROM member_submissions WHERE member_id = ?', (kept_id,)).fetchone()
+    if kept is not None and _SUBMISSION_PRIORITY.get(kept[0], 2) <= _SUBMISSION_PRIORITY.get(removed[0], 2):
+        conn.execute('DELETE FROM member_submissions WHERE member_id = ?', (member_id,))
+        return
+    conn.execute('DELETE FROM member_submissions WHERE member_id = ?', (kept_id,))
+    conn.execute('UPDATE member_submissions SET member_id = ? WHERE member_id = ?', (kept_id, member_id))
+
+def _unique_member_identity(conn: sqlite3.Connection):
+    """Aynı dernekteki tekrar eden kimlik numaralarını birleştir ve (identityNumber, association) tekil indeksini oluştur"""
+    # Her grupta önce onaylı, sonra en son güncellenen kayıt kalır; diğerlerinin makbuzları ve
+    # gönderim kayıtları ona aktarılır, kendileri member_duplicates tablosuna yedeklenir
+    order = f'{_STATUS_PRIORITY_SQL}, COALESCE(updated_at, created_at, 0) DESC, rowid DESC'
+    duplicates = conn.execute(f'''
+        WITH ranked AS (
+            SELECT id, identityNumber, association,
+                   ROW_NUMBER() OVER (PARTITION BY identityNumber, association ORDER BY {order}) AS position,
+                   FIRST_VALUE(id) OVER (PARTITION BY identityNumber, association ORDER BY {order}) AS kept_id
+            FROM members
+        )
+        SELECT id, kept_id, identityNumber, association FROM ranked WHERE position > 1
+    ''').fetchall()
+
+    if duplicates:
+        conn.execute('CREATE TABLE IF NOT EXISTS member_duplicates AS SELECT * FROM members WHERE 0')
+        if 'kept_id' not in _table_columns(conn, 'member_duplicates'):
+            conn.execute('ALTER TABLE member_duplicates ADD COLUMN kept_id TEXT')
+            conn.execute('ALTER TABLE member_duplicates ADD COLUMN removed_at INTEGER')
+        removed_at = int(datetime.now().timestamp())
+
+        for member_id, kept_id, identity_number, association in duplicates:
+            conn.execute('INSERT INTO member_duplicates SELECT *, ?, ? FROM members WHERE id = ?',
+                         (kept_id, removed_at, member_id))
+            conn.execute('UPDATE receipts SET memberId = ? WHERE memberId = ?', (kept_id, member_id))
+            _merge_member_submissions(conn, member_id, kept_id)
+            conn.execute('DELETE FROM members WHERE id = ?', (member_id,))
+            print(f"Tekrar eden üye {member_id} ({identity_number}, dernek {association}) -> {kept_id} ile birleştirildi")
+        print(f"{len(duplicates)} tekrar eden üye kaydı birleştirildi; silinen kayıtlar member_duplicates tablosunda")
+
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_members_identity_association
+        ON members (identityNumber, association)
+    ''')
+
+def _receipt_change_counters(conn: sqlite3.Connection):
+    """Makbuz değişikliklerinde derneğin 'receipts:<id>' sürümünü artıran trigger'ları oluştur"""
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS receipts_version_insert AFTER INSERT ON receipts BEGIN
+            {_bump_version_sql("receipts", "new.associationId")}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS receipts_version_update AFTER UPDATE ON receipts BEGIN
+            {_bump_version_sql("receipts", "new.associationId")}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS receipts_version_move AFTER UPDATE OF associationId ON receipts
+        WHEN old.associationId IS NOT new.associationId BEGIN
+            {_bump_version_sql("receipts", "old.associationId")}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS receipts_version_delete AFTER DELETE ON receipts BEGIN
+            {_bump_version_sql("receipts", "old.associationId")}
+        END
+    ''')
+
+def _receipt_association_index(conn: sqlite3.Connection):
+    """Dernek bazlı makbuz sorguları için (associationId, uploadDate) indeksini oluştur"""
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_receipts_association_upload
+        ON receipts (associationId, uploadDate)
+    ''')
+
+def _keyset_sort_indexes(conn: sqlite3.Connection):
+    """Keyset sayfalama için boş created_at değerlerini doldur ve (…, created_at, id)/(…, uploadDate, id) indekslerini oluştur"""
+    # Sıralama anahtarı NULL olursa imleç karşılaştırması satırı atlar; sütun boş bırakılmaz
+    conn.execute('UPDATE members SET created_at = COALESCE(updated_at, 0) WHERE created_at IS NULL')
+    for event in ('INSERT', 'UPDATE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS members_created_at_{event.lower()} AFTER {event} ON members
+            WHEN new.created_at IS NULL BEGIN
+                UPDATE members SET created_at = COALESCE(new.updated_at, CAST(strftime('%s', 'now') AS INTEGER))
+                WHERE rowid = new.rowid;
+            END
+        ''')
+
+    # Eski indeksler yenilerinin ön ekidir
+    conn.execute('DROP INDEX IF EXISTS idx_members_association_created')
+    conn.execute('DROP INDEX IF EXISTS idx_receipts_association_upload')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_members_association_created_id
+        ON members (association, created_at, id)
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_members_created_id ON members (created_at, id)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_receipts_association_upload_id
+        ON receipts (associationId, uploadDate, id)
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_receipts_upload_id ON receipts (uploadDate, id)')
+
+def _export_job_owner(conn: sqlite3.Connection):
+    """export_jobs tablosuna işi çalıştıran sürecin ID'sini (owner_pid) ekle"""
+    if 'owner_pid' not in _table_columns(conn, 'export_jobs'):
+        conn.execute('ALTER TABLE export_jobs ADD COLUMN owner_pid INTEGER')
+
+# (sürüm, geçiş) - sırayla ve yalnızca bir kez uygulanır
+MIGRATIONS = [
+    (1, _split_member_gsm),
+    (2, _integer_timestamps),
+    (3, _member_search_index),
+    (4, _member_change_counters),
+    (5, _unique_member_identity),
+    (6, _receipt_change_counters),
+    (7, _receipt_association_index),
+    (8, _keyset_sort_indexes),
+    (9, _export_job_owner),
+]
+
+def run_migrations(conn: sqlite3.Connection):
+    """Veritabanı sürümünden (PRAGMA user_version) sonraki geçişleri uygula"""
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # Geçişleri kendi transaction'ımızla yönet
+
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target_version, migration in MIGRATIONS:
+            if target_version <= version:
+                continue
+
+            conn.execute('BEGIN')
+            try:
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {target_version}')
+                conn.execute('COMMIT')
+                print(f"Migration {target_version} applied: {migration.__doc__}")
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    finally:
+        conn.isolation_level = isolation_level
@@ -0,0 +1,80 @@
+import time
+import threading
+import logging
+from concurrent.futures import Future, TimeoutError
+from typing import Dict, Any, Optional
+from app.services.icisleri_async import driver
+from app.services.icisleri_bot import fetch_member_info_from_icisleri_async
+
+logger = logging.getLogger(__name__)
+
+# Önceden çekilen bilginin saklanma süresi (saniye)
+PREFETCH_TTL = 300
+
+class _PrefetchSlot:
+    """Bir oturum için önceden başlatılmış kimlik sorgusu"""
+
+    def __init__(self, identity_number: str, future: Future):
+        self.identity_number = identity_number
+        self.future = future
+        self.created_at = time.monotonic()
+
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.created_at > PREFETCH_TTL
+
+# Oturum anahtarı -> slot (her oturumun tek bir slotu vardır)
+_slots: Dict[str, _PrefetchSlot] = {}
+_slots_lock = threading.Lock()
+
+def is_prefetchable(identity_number: str, valid_lengths) -> bool:
+    """Numara ön sorgu başlatmaya uygun mu (yalnızca rakam ve geçerli uzunlukta)"""
+    return bool(identity_number) and identity_number.isdigit() and len(identity_number) in valid_lengths
+
+def _drop_expired_slots():
+    """Süresi dolan slotları temizle (kilit tutulurken çağrılır)"""
+    for key in [key for key, slot in _slots.items() if slot.is_expired()]:
+        del _slots[key]
+
+def start_prefetch(session_key: str, identity_number: str) -> bool:
+    """Kimlik sorgusunu arka planda başlat. Aynı numara için sorgu zaten varsa False döndür"""
+    with _slots_lock:
+        _drop_expired_slots()
+
+        slot = _slots.get(session_key)
+        if slot and slot.identity_number == identity_number:
+            return False
+
+        # Oturum başka bir numara yazdıysa eski sorgu henüz başlamadıysa iptal edilir
+        if slot:
+            slot.future.cancel()
+
+        logger.info(f"⚡ {identity_number} için ön sorgu başlatılıyor")
+        future = driver.submit(fetch_member_info_from_icisleri_async(identity_number))
+        _slots[session_key] = _PrefetchSlot(identity_number, future)
+        return True
+
+def get_prefetch_status(session_key: str, identity_number: str) -> Optional[str]:
+    """Ön sorgu durumu: 'ready', 'running' veya yoksa None"""
+    with _slots_lock:
+        slot = _slots.get(session_key)
+        if not slot or slot.identity_number != identity_number or slot.is_expired():
+            return None
+        return 'ready' if slot.future.done() else 'running'
+
+def take_prefetched(session_key: str, identity_number: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+    """Ön sorgu sonucunu al ve slotu boşalt. Devam ediyorsa normal akış süresi kadar bekle, ön sorgu yoksa None döndür"""
+    with _slots_lock:
+        slot = _slots.get(session_key)
+        if not slot or slot.identity_number != identity_number or slot.is_expired():
+            return None
+        del _slots[session_key]
+
+    # Çalışan sorgu iptal edilemez; ikinci bir oturum açmak yerine aynı sorgu beklenir
+    try:
+        return driver.wait(slot.future, timeout)
+    except TimeoutError:
+        logger.warning(f"⚠️ {identity_number} ön sorgusu zamanında bitmedi")
+        return {"error": "İçişleri Bakanlığı sistemi zamanında yanıt vermedi, lütfen tekrar deneyin"}
+    except Exception as e:
+        logger.warning(f"⚠️ Ön sorgu sonucu alınamadı: {e}")
+        return {"error": f"İşlem hatası: {str(e)}", "transient": True}
@@ -0,0 +1,83 @@
+import os
+import time
+import logging
+import tempfile
+from typing import Iterator
+from flask import current_app, Response, stream_with_context, get_flashed_messages
+from jinja2 import FileSystemBytecodeCache
+from jinja2.exceptions import TemplateError
+
+logger = logging.getLogger(__name__)
+
+# Akış sırasında istemciye gönderilecek en küçük parça (byte); layout ilk parçada gider
+STREAM_CHUNK_SIZE = 8 * 1024
+
+def _buffered(chunks: Iterator[str], size: int) -> Iterator[str]:
+    """Jinja'nın ürettiği küçük metin parçalarını `size` byte'lık parçalar halinde birleştir"""
+    buffer, buffered = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def stream_template(template_name: str, **context) -> Response:
+    """Şablonu tek bir metne çevirmeden, üretildikçe gönderen yanıt döndür
+
+    Büyük listelerde layout ve ilk satırlar sorgunun geri kalanı beklenmeden gider. Satırlar
+    üreteçlerden (ör. StreamedPage.rows) okunduğu için sayfanın tamamı bellekte tutulmaz.
+    """
+    app = current_app._get_current_object()
+    app.update_template_context(context)
+    template = app.jinja_env.get_or_select_template(template_name)
+
+    # Oturum çerezi gövdeden önce yazılır; flash mesajları akış başlamadan tüketilmeli
+    get_flashed_messages(with_categories=True)
+
+    chunks = _buffered(template.generate(context), STREAM_CHUNK_SIZE)
+    return Response(stream_with_context(chunks), mimetype='text/html')
+
+class AtomicBytecodeCache(FileSystemBytecodeCache):
+    """Dosyayı önce geçici adla yazan bytecode önbelleği
+
+    Worker'lar aynı anda başlarken biri yarım yazılmış bir dosyayı okuyup şablon yükleyemez hale gelmesin.
+    """
+
+    def dump_bytecode(self, bucket):
+        filename = self._get_cache_filename(bucket)
+        fd, partial_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                bucket.write_bytecode(f)
+            os.replace(partial_path, filename)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+def precompile_templates(app) -> int:
+    """Tüm .jinja2 şablonlarını derleyip Jinja'nın bellek önbelleğine al; derlenen şablon sayısını döndür"""
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=['jinja2']):
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except TemplateError as e:
+            # Hatalı şablon uygulamayı durdurmasın; istekte aynı hata yeniden görünür
+            logger.warning(f"⚠️ Şablon derlenemedi: {name} ({e})")
+    return compiled
+
+def init_templates(app):
+    """Şablon bytecode önbelleğini kur ve şablonları önceden derle (filtreler kaydedildikten sonra çağrılır)"""
+    cache_dir = app.config.get('JINJA_CACHE_DIR')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = AtomicBytecodeCache(cache_dir)
+
+    if app.config.get('PRECOMPILE_TEMPLATES', True):
+        started = time.perf_counter()
+        compiled = precompile_templates(app)
+        logger.info(f"🧩 {compiled} şablon önceden derlendi ({(time.perf_counter() - started) * 1000:.0f} ms)")
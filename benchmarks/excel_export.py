@@ -0,0 +1,153 @@
+"""Üye Excel dışa aktarımı karşılaştırması
+
+Geçici bir SQLite dosyasına tek derneğe ait sahte üyeler yazar ve
+- eski yol: get_members_by_association + pandas DataFrame + ExcelWriter(BytesIO)
+- yeni yol: cursor + openpyxl write-only + SpooledTemporaryFile
+ile Excel dosyası üretip süreyi ve en yüksek RSS'i raporlar. Her ölçüm ayrı bir
+süreçte yapılır, böylece bir yolun bellek kullanımı diğerini etkilemez.
+
+Kullanım: python benchmarks/excel_export.py [üye_sayısı ...]  (varsayılan: 1000 10000 100000)
+"""
+import io
+import os
+import sys
+import time
+import json
+import sqlite3
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Member
+
+ASSOCIATION_ID = 'association-1'
+
+def create_database(path: str, count: int):
+    """Sahte üyelerle veritabanı dosyası oluştur"""
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE members ({', '.join(Member.COLUMNS)})")
+
+    rows = []
+    for i in range(count):
+        row = {name: f"{name}-{i}" for name in Member.COLUMNS}
+        row['gsmCountryCode'] = "+90"
+        row['gsmOperatorCode'] = "533"
+        row['gsmNumber'] = f"{i:07d}"
+        row['association'] = ASSOCIATION_ID
+        row['membershipYear'] = "2025"
+        row['status'] = "pending"
+        rows.append(tuple(row[name] for name in Member.COLUMNS))
+
+    placeholders = ', '.join('?' for _ in Member.COLUMNS)
+    conn.executemany(f"INSERT INTO members VALUES ({placeholders})", rows)
+    conn.commit()
+    conn.close()
+
+def export_pandas() -> int:
+    """Önceki export_excel gövdesi"""
+    import pandas as pd
+    from app.services.db import get_members_by_association
+
+    members = get_members_by_association(ASSOCIATION_ID)
+    data = []
+    for member in members:
+        data.append({
+            'Kimlik No': member.identityNumber,
+            'Ad': member.firstName,
+            'Soyad': member.lastName,
+            'İkinci Ad': member.middleName,
+            'Doğum Soyadı': member.birthSurname,
+            'Cinsiyet': member.gender,
+            'Doğum Yeri': member.birthPlace,
+            'Anne Adı': member.motherName,
+            'Doğum Tarihi': member.birthDate,
+            'Baba Adı': member.fatherName,
+            'İlçe': member.district,
+            'Mahalle': member.neighborhood,
+            'Cadde/Sokak': member.street,
+            'Bina': member.buildingNameOrNumber,
+            'Dış Kapı No': member.doorNumber,
+            'İç Kapı No': member.apartmentNumber,
+            'Telefon': member.phoneNumber,
+            'GSM': f"{member.gsm['countryCode']}{member.gsm['operatorCode']}{member.gsm['number']}",
+            'Üyelik Yılı': member.membershipYear
+        })
+
+    df = pd.DataFrame(data)
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='Üyeler')
+    return len(output.getvalue())
+
+def export_write_only() -> int:
+    """Yeni export_excel yolu"""
+    from app.services.member_export import write_members_xlsx
+
+    output, _ = write_members_xlsx(ASSOCIATION_ID)
+    size = output.seek(0, os.SEEK_END)
+    output.close()
+    return size
+
+EXPORTS = {
+    'pandas': export_pandas,
+    'write-only': export_write_only,
+}
+
+def current_rss_mb() -> float:
+    """Sürecin şu anki RSS'i (MB)"""
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def run_child(name: str, database_path: str):
+    """Tek bir dışa aktarımı ölç ve sonucu JSON olarak yaz (alt süreçte çalışır)"""
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.config['DATABASE_PATH'] = database_path
+    export = EXPORTS[name]
+
+    with app.app_context():
+        # Modül importlarının maliyeti ölçüme katılmasın
+        if name == 'pandas':
+            import pandas  # noqa: F401
+            import openpyxl  # noqa: F401
+        else:
+            import app.services.member_export  # noqa: F401
+
+        baseline_rss = current_rss_mb()
+        started = time.perf_counter()
+        size = export()
+        elapsed = time.perf_counter() - started
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'elapsed': elapsed, 'peak_rss': peak_rss, 'baseline_rss': baseline_rss, 'size': size}))
+
+def measure(name: str, database_path: str) -> dict:
+    output = subprocess.run([sys.executable, __file__, '--child', name, database_path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+
+    print(f"{'üye':>8} {'yol':<11} {'süre (s)':>9} {'en yüksek RSS (MB)':>19} {'artış (MB)':>11} {'dosya (KB)':>11}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            database_path = os.path.join(directory, 'members.db')
+            create_database(database_path, count)
+
+            for name in EXPORTS:
+                result = measure(name, database_path)
+                print(f"{count:>8} {name:<11} {result['elapsed']:>9.2f} {result['peak_rss']:>19.1f} "
+                      f"{result['peak_rss'] - result['baseline_rss']:>11.1f} {result['size'] / 1024:>11.0f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+    else:
+        main()
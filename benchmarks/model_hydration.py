@@ -0,0 +1,93 @@
+"""Üye modeli yükleme (hydration) karşılaştırması
+
+Bellekteki bir SQLite veritabanına sahte üyeler yazar ve aynı satırları
+- eski yol: dict(row) + Member.from_dict
+- yeni yol: Member.from_row
+- karşılaştırma: from_row ile __dict__ taşıyan (slot'suz) bir alt sınıf
+ile nesneye çevirip süreyi ve tutulan belleği raporlar.
+
+Kullanım: python benchmarks/model_hydration.py [üye_sayısı]
+"""
+import os
+import sys
+import time
+import sqlite3
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Member
+
+class DictMember(Member):
+    """Karşılaştırma için __dict__ taşıyan (slot'suz) üye"""
+
+def create_database(count: int) -> sqlite3.Connection:
+    """Sahte üyelerle bellekte veritabanı oluştur"""
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"CREATE TABLE members ({', '.join(Member.COLUMNS)})")
+
+    rows = []
+    for i in range(count):
+        row = {name: f"{name}-{i}" for name in Member.COLUMNS}
+        row['gsmCountryCode'] = "+90"
+        row['gsmOperatorCode'] = "533"
+        row['gsmNumber'] = f"{i:07d}"
+        row['association'] = f"association-{i % 50}"
+        row['membershipYear'] = "2025"
+        row['status'] = "pending"
+        rows.append(tuple(row[name] for name in Member.COLUMNS))
+
+    placeholders = ', '.join('?' for _ in Member.COLUMNS)
+    conn.executemany(f"INSERT INTO members VALUES ({placeholders})", rows)
+    conn.commit()
+    return conn
+
+def hydrate_from_dict(rows):
+    members = []
+    for row in rows:
+        member_dict = dict(row)
+        member_dict['gsm'] = {"countryCode": row['gsmCountryCode'], "operatorCode": row['gsmOperatorCode'],
+                              "number": row['gsmNumber']}
+        members.append(Member.from_dict(member_dict))
+    return members
+
+def hydrate_from_row(rows):
+    return [Member.from_row(row) for row in rows]
+
+def hydrate_dict_backed(rows):
+    return [DictMember.from_row(row) for row in rows]
+
+def measure(name: str, hydrate, rows):
+    """Süreyi ve oluşan nesnelerin tuttuğu belleği ölç
+
+    tracemalloc süreyi bozduğu için süre ve bellek ayrı çalıştırmalarda ölçülür.
+    """
+    start = time.perf_counter()
+    members = hydrate(rows)
+    elapsed = time.perf_counter() - start
+    del members
+
+    tracemalloc.start()
+    members = hydrate(rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<28} {elapsed:8.3f} sn {retained / 1024 / 1024:10.1f} MB "
+          f"{retained / len(members):8.0f} B/üye")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    conn = create_database(count)
+    rows = conn.execute(f"SELECT {', '.join(Member.COLUMNS)} FROM members").fetchall()
+    conn.close()
+
+    print(f"{count} üye yükleniyor\n")
+    print(f"{'Yöntem':<28} {'Süre':>11} {'Bellek':>13} {'Üye başı':>10}")
+    for name, hydrate in [("dict(row) + from_dict", hydrate_from_dict),
+                          ("from_row (__slots__)", hydrate_from_row),
+                          ("from_row (__dict__ ile)", hydrate_dict_backed)]:
+        measure(name, hydrate, rows)
+
+if __name__ == '__main__':
+    main()
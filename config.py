@@ -12,11 +12,28 @@ ICISLERI_CONFIG = {
 BOT_CONFIG = {
     'headless': True,  # Headless mod (True/False) - Production için True
     'wait_timeout': 10,  # Saniye cinsinden bekleme süresi
+    'flow_timeout': 180,  # Tek bir arama/gönderim akışının slot aldıktan sonraki en fazla süresi (saniye)
     'implicit_wait': 5,  # Saniye cinsinden implicit bekleme
     'window_size': '1920,1080',  # Pencere boyutu
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+# İçişleri oturum sınırlayıcı ve devre kesici konfigürasyonu
+GOVERNOR_CONFIG = {
+    'max_sessions': 2,  # Aynı anda açık olabilecek en fazla Chrome oturumu
+    'queue_timeout': 60,  # Boş oturum için en fazla bekleme süresi (saniye)
+    'max_waiting': 8,  # Slot için sırada bekleyebilecek en fazla akış, fazlası beklemeden reddedilir
+    'failure_threshold': 3,  # Devreyi açan ardışık giriş/sayfa hatası sayısı
+    'recovery_timeout': 120,  # Devre açıkken yarı açık denemeye kadar geçen süre (saniye)
+    'half_open_max_probes': 1  # Yarı açık durumda izin verilen deneme isteği sayısı
+}
+
+# Son giriş zamanı yazma tamponu konfigürasyonu
+LOGIN_BUFFER_CONFIG = {
+    'flush_interval': 5,  # Tamponun veritabanına yazılma aralığı (saniye)
+    'max_pending': 100  # Bu kadar giriş birikince beklemeden yazılır
+}
+
 # Log Konfigürasyonu
 LOG_CONFIG = {
     'log_directory': './logs',
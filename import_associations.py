@@ -1,98 +1,236 @@
 #!/usr/bin/env python3
+"""associations.json dosyasındaki dernekleri veritabanına toplu olarak işle
+
+Flask uygulaması başlatılmaz; JSON akış olarak okunur, kayıtlar governmentId'ye göre
+tek transaction içinde eklenir/güncellenir. Aynı dosya tekrar işlendiğinde hiçbir şey
+değişmez (kullanıcı adı ve şifreler korunur).
+
+Kullanım: python import_associations.py [--dry-run] [--json db/associations.json] [--db db/dernekkapi.db]
+"""
+import os
 import json
+import time
+import uuid
 import random
 import string
-import sys
-import os
-
-# Flask app context'i için
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from app import create_app
-from app.services.db import create_association, get_all_associations
-from app.models.schema import Association
-
-def generate_username():
-    """6 haneli rastgele username oluştur"""
-    return ''.join(random.choices(string.digits, k=6))
-
-def generate_password():
+import sqlite3
+import argparse
+from typing import Dict, Any, Iterator, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JSON_PATH = os.path.join(BASE_DIR, 'db', 'associations.json')
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, 'db', 'dernekkapi.db')
+CREDENTIALS_PATH = os.path.join(BASE_DIR, 'association_credentials.md')
+
+# JSON alanı -> associations sütunu (governmentId eşleştirme anahtarıdır)
+JSON_FIELDS = {
+    'ID': 'governmentId',
+    'ISIM': 'name',
+    'TUZEL_TUR_KOD': 'typeCode',
+    'TUZEL_TUR_KOD_TANIM': 'typeCodeDescription',
+    'TUZEL_TIP_KOD': 'subTypeCode',
+    'TUZEL_TIP_KOD_TANIM': 'subTypeCodeDescription',
+    'ESKI_TUZEL_NUMARASI': 'oldLegalEntityNumber',
+    'E_TUZEL_NUMARASI': 'newLegalEntityNumber',
+}
+
+# Güncellemede JSON'dan yeniden yazılan sütunlar (id, kullanıcı adı ve şifre korunur)
+UPDATE_COLUMNS = ('name', 'typeCode', 'typeCodeDescription', 'subTypeCode',
+                  'subTypeCodeDescription', 'oldLegalEntityNumber', 'newLegalEntityNumber')
+
+USERNAME_DIGITS = 6
+PASSWORD_LENGTH = 12
+JSON_CHUNK_SIZE = 64 * 1024
+
+_random = random.SystemRandom()
+
+def iter_json_array(path: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Üst düzeyi dizi olan JSON dosyasının elemanlarını tüm dosyayı belleğe almadan sırayla ver"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path}: JSON dizisi bekleniyordu")
+        buffer = buffer[1:]
+
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Eleman parçanın sonunda yarım kalmış olabilir; sonraki parçayla tekrar dene
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer += chunk
+                continue
+            yield item
+            buffer = buffer[end:]
+
+def generate_usernames(count: int, taken: set) -> List[str]:
+    """Mevcut kullanıcı adlarıyla çakışmayan, birbirinden farklı 6 haneli kullanıcı adları üret"""
+    capacity = 10 ** USERNAME_DIGITS
+    if count > capacity - len(taken):
+        raise ValueError("Boş 6 haneli kullanıcı adı kalmadı")
+
+    # Tek örneklemede tekrar olmaz; alınmış olanları ayıklamak için yeterince fazla çek
+    candidates = _random.sample(range(capacity), min(capacity, count + len(taken)))
+    usernames = []
+    for number in candidates:
+        username = f"{number:0{USERNAME_DIGITS}d}"
+        if username not in taken:
+            usernames.append(username)
+            if len(usernames) == count:
+                break
+    return usernames
+
+def generate_password() -> str:
     """12 haneli rastgele şifre oluştur (harf ve rakam karışık)"""
     characters = string.ascii_letters + string.digits
-    return ''.join(random.choices(characters, k=12))
-
-def import_associations():
+    return ''.join(_random.choices(characters, k=PASSWORD_LENGTH))
+
+def read_associations(path: str) -> Dict[str, Dict[str, str]]:
+    """JSON kayıtlarını governmentId -> sütun değerleri olarak oku (tekrar edenlerde sonuncusu geçerli)"""
+    records = {}
+    for item in iter_json_array(path):
+        record = {column: str(item.get(field) or '') for field, column in JSON_FIELDS.items()}
+        if not record['governmentId'] or not record['name']:
+            print(f"⚠️ ID veya ISIM eksik, atlandı: {item}")
+            continue
+        records[record['governmentId']] = record
+    return records
+
+def plan_import(conn: sqlite3.Connection, records: Dict[str, Dict[str, str]]) -> Tuple[list, list, int]:
+    """Veritabanıyla karşılaştır; (eklenecekler, güncellenecekler, değişmeyen sayısı) döndür"""
+    existing = {
+        row['governmentId']: row
+        for row in conn.execute(f"SELECT id, governmentId, {', '.join(UPDATE_COLUMNS)} FROM associations")
+    }
+
+    inserts, updates, unchanged = [], [], 0
+    for government_id, record in records.items():
+        row = existing.get(government_id)
+        if row is None:
+            inserts.append(record)
+            continue
+
+        changes = {column: (row[column] or '', record[column])
+                   for column in UPDATE_COLUMNS if (row[column] or '') != record[column]}
+        if changes:
+            updates.append((row['id'], record, changes))
+        else:
+            unchanged += 1
+
+    return inserts, updates, unchanged
+
+def apply_import(conn: sqlite3.Connection, inserts: list, updates: list):
+    """Eklemeleri ve güncellemeleri executemany ile yaz (transaction çağıran tarafından yönetilir)"""
+    if inserts:
+        taken = {row[0] for row in conn.execute('SELECT username FROM associations')}
+        usernames = generate_usernames(len(inserts), taken)
+        last_login = int(time.time())  # Association modelindeki gibi oluşturma anı
+        conn.executemany('''
+            INSERT INTO associations
+            (id, governmentId, name, username, password, last_login, typeCode, typeCodeDescription,
+             subTypeCode, subTypeCodeDescription, oldLegalEntityNumber, newLegalEntityNumber)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (str(uuid.uuid4()), record['governmentId'], record['name'], username, generate_password(),
+             last_login, *(record[column] for column in UPDATE_COLUMNS[1:]))
+            for record, username in zip(inserts, usernames)
+        ])
+
+    if updates:
+        assignments = ', '.join(f'{column} = ?' for column in UPDATE_COLUMNS)
+        conn.executemany(f'UPDATE associations SET {assignments} WHERE id = ?', [
+            (*(record[column] for column in UPDATE_COLUMNS), association_id)
+            for association_id, record, _ in updates
+        ])
+
+    if inserts or updates:
+        # Çalışan uygulamadaki dernek önbelleğini geçersiz kıl (tablo uygulama ilk açılışta da oluşturulur)
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        conn.execute('''
+            INSERT INTO cache_versions (name, version) VALUES ('associations', 1)
+            ON CONFLICT(name) DO UPDATE SET version = version + 1
+        ''')
+
+def print_diff(inserts: list, updates: list, unchanged: int, missing: int):
+    """Yapılacak değişiklikleri yazdır"""
+    for record in inserts:
+        print(f"+ {record['name'][:60]:<60} | {record['governmentId']}")
+    for _, record, changes in updates:
+        print(f"~ {record['name'][:60]:<60} | {record['governmentId']}")
+        for column, (old, new) in changes.items():
+            print(f"    {column}: {old!r} -> {new!r}")
+
+    print(f"\nEklenecek: {len(inserts)} | Güncellenecek: {len(updates)} | Değişmeyen: {unchanged}")
+    if missing:
+        print(f"JSON'da bulunmayan {missing} dernek veritabanında bırakıldı")
+
+def write_credentials(conn: sqlite3.Connection):
+    """Tüm derneklerin kullanıcı adı ve şifrelerini markdown dosyasına kaydet"""
+    rows = conn.execute('''
+        SELECT name, username, password, oldLegalEntityNumber, newLegalEntityNumber
+        FROM associations ORDER BY name
+    ''').fetchall()
+
+    with open(CREDENTIALS_PATH, 'w', encoding='utf-8') as f:
+        f.write("# DERNEK KULLANICI ADI VE ŞİFRELERİ\n\n")
+        f.write("| Sıra | Dernek Adı | Username | Şifre | Eski Tüzel No | Yeni Tüzel No |\n")
+        f.write("|------|------------|----------|-------|----------------|---------------|\n")
+        for i, row in enumerate(rows, 1):
+            f.write(f"| {i:3d} | {row['name']} | {row['username']} | {row['password']} | "
+                    f"{row['oldLegalEntityNumber']} | {row['newLegalEntityNumber']} |\n")
+
+def import_associations(json_path: str, db_path: str, dry_run: bool = False):
     """associations.json dosyasından verileri okuyup veritabanına işle"""
-
-    # Flask app context'i oluştur
-    app = create_app()
-
-    with app.app_context():
-        # Mevcut dernekleri kontrol et
-        existing_associations = get_all_associations()
-        existing_usernames = {assoc.username for assoc in existing_associations}
-
-        print(f"Mevcut dernek sayısı: {len(existing_associations)}")
-
-        # associations.json dosyasını oku
-        with open('db/associations.json', 'r', encoding='utf-8') as f:
-            associations_data = json.load(f)
-
-        print(f"JSON dosyasındaki dernek sayısı: {len(associations_data)}")
-
-        # Benzersiz username'ler oluştur
-        used_usernames = set()
-
-        for i, assoc_data in enumerate(associations_data):
-            # Benzersiz 6 haneli username oluştur
-            while True:
-                username = generate_username()
-                if username not in existing_usernames and username not in used_usernames:
-                    used_usernames.add(username)
-                    break
-
-            # 12 haneli şifre oluştur
-            password = generate_password()
-
-            # Association objesi oluştur
-            association = Association(
-                government_id=assoc_data['ID'],
-                name=assoc_data['ISIM'],
-                username=username,
-                password=password
-            )
-
-            # Ek bilgileri doldur
-            association.typeCode = assoc_data.get('TUZEL_TUR_KOD', '')
-            association.typeCodeDescription = assoc_data.get('TUZEL_TUR_KOD_TANIM', '')
-            association.subTypeCode = assoc_data.get('TUZEL_TIP_KOD', '')
-            association.subTypeCodeDescription = assoc_data.get('TUZEL_TIP_KOD_TANIM', '')
-            association.oldLegalEntityNumber = assoc_data.get('ESKI_TUZEL_NUMARASI', '')
-            association.newLegalEntityNumber = assoc_data.get('E_TUZEL_NUMARASI', '')
-
-            # Veritabanına kaydet
-            success = create_association(association)
-
-            if success:
-                print(f"[{i+1:3d}/{len(associations_data)}] ✅ {assoc_data['ISIM'][:50]:<50} | Username: {username} | Şifre: {password}")
-            else:
-                print(f"[{i+1:3d}/{len(associations_data)}] ❌ {assoc_data['ISIM'][:50]:<50} | HATA!")
-
-        # Son durumu kontrol et
-        final_associations = get_all_associations()
-        print(f"\n✅ İşlem tamamlandı!")
-        print(f"Toplam dernek sayısı: {len(final_associations)}")
-
-                # Username ve şifre listesini markdown dosyasına kaydet
-        with open('association_credentials.md', 'w', encoding='utf-8') as f:
-            f.write("# DERNEK KULLANICI ADI VE ŞİFRELERİ\n\n")
-            f.write("| Sıra | Dernek Adı | Username | Şifre | Eski Tüzel No | Yeni Tüzel No |\n")
-            f.write("|------|------------|----------|-------|----------------|---------------|\n")
-
-            for i, assoc in enumerate(final_associations, 1):
-                f.write(f"| {i:3d} | {assoc.name} | {assoc.username} | {assoc.password} | {assoc.oldLegalEntityNumber} | {assoc.newLegalEntityNumber} |\n")
-
-        print(f"Kullanıcı adı ve şifreler 'association_credentials.md' dosyasına kaydedildi.")
+    started = time.perf_counter()
+    records = read_associations(json_path)
+    print(f"JSON dosyasındaki dernek sayısı: {len(records)}")
+
+    if not os.path.exists(db_path):
+        raise SystemExit(f"❌ Veritabanı bulunamadı: {db_path} (önce uygulamayı bir kez başlatın)")
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        # Okuma ve yazma aynı kilit altında; arada başka bir süreç dernek ekleyemez
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            inserts, updates, unchanged = plan_import(conn, records)
+            total = conn.execute('SELECT COUNT(*) FROM associations').fetchone()[0]
+            print_diff(inserts, updates, unchanged, total - len(updates) - unchanged)
+
+            if dry_run:
+                conn.execute('ROLLBACK')
+                print("🔎 Deneme modu: veritabanına yazılmadı")
+                return
+
+            apply_import(conn, inserts, updates)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        if inserts or updates:
+            write_credentials(conn)
+            print(f"Kullanıcı adı ve şifreler '{os.path.basename(CREDENTIALS_PATH)}' dosyasına kaydedildi.")
+    finally:
+        conn.close()
+
+    print(f"✅ İşlem tamamlandı ({time.perf_counter() - started:.2f} sn)")
+
+def main():
+    parser = argparse.ArgumentParser(description="associations.json dosyasındaki dernekleri içe aktar")
+    parser.add_argument('--json', default=DEFAULT_JSON_PATH, help="Dernek JSON dosyası")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite veritabanı dosyası")
+    parser.add_argument('--dry-run', action='store_true', help="Yalnızca farkları göster, veritabanına yazma")
+    args = parser.parse_args()
+
+    import_associations(args.json, args.db, dry_run=args.dry_run)
 
 if __name__ == "__main__":
-    import_associations()
+    main()